@@ -1,21 +1,18 @@
 #!/usr/bin/env python3
 
 import json
-from pathlib import Path
-import subprocess
-from collections import defaultdict
+import sys
+import time
 
-BATCH_DIR = Path('/home/olibuijr/Projects/olfong_stack/backend/translation-batches')
+from olfong_i18n.batching import batch_numbers
+from olfong_i18n.catalog import BACKEND_DIR
+from olfong_i18n.events import EventLog
+from olfong_i18n.rules import RulesEngine
+
+BATCH_DIR = BACKEND_DIR / 'translation-batches'
 
 # Comprehensive static translation dictionary
 STATIC_TRANSLATIONS = {
-    # CSS and Structure
-    '.link-dropdown-container': 'Tengill-fellivalmöguleikar',
-    '.relative': 'Afstætt',
-    '24.00': '24,00',
-    '25.00': '25,00',
-    '27.50': '27,50',
-
     # Addresses
     'addresses.add': 'Bæta við heimilisfangi',
     'addresses.city': 'Borg',
@@ -361,18 +358,18 @@ STATIC_TRANSLATIONS = {
 }
 
 def main():
-    print("="*70)
-    print("EFFICIENT BATCH TRANSLATION PROCESSOR")
-    print("="*70)
-
-    print(f"\nPre-loaded translations: {len(STATIC_TRANSLATIONS)}")
-    print(f"Processing batches...\n")
+    # NDJSON progress events on stdout (or $OLFONG_I18N_EVENTS)
+    events = EventLog.from_env(default_stream=sys.stdout)
+    # Numbers and extractor noise are resolved by rule, so the dictionary only holds real strings
+    rules = RulesEngine('is')
+    run_start = time.perf_counter()
+    events.emit('run.started', script='batch-translate-efficient.py', dictionary=len(STATIC_TRANSLATIONS), batchDir=str(BATCH_DIR))
 
     total_keys = 0
     translated_count = 0
     completed = 0
 
-    for i in range(1, 31):
+    for i in batch_numbers(BATCH_DIR):
         batch_file = BATCH_DIR / f'batch-{str(i).zfill(3)}.json'
         output_file = BATCH_DIR / f'batch-{str(i).zfill(3)}-translated.json'
 
@@ -385,33 +382,39 @@ def main():
 
             keys = batch.get('keys', [])
             result = {}
+            trans_count = 0
 
             for key in keys:
-                if key in STATIC_TRANSLATIONS:
+                value = rules.get(key)
+                if value is not None:
+                    result[key] = value
+                    trans_count += 1
+                    events.emit('cache.hit', key=key, layer='rules')
+                    events.emit('key.finished', key=key, origin='rules')
+                elif key in STATIC_TRANSLATIONS:
                     result[key] = STATIC_TRANSLATIONS[key]
-                    translated_count += 1
+                    trans_count += 1
+                    events.emit('cache.hit', key=key, layer='static')
+                    events.emit('key.finished', key=key, origin='static')
                 else:
                     result[key] = key
+                    events.emit('key.finished', key=key, origin='fallback')
 
             with open(output_file, 'w', encoding='utf-8') as f:
                 json.dump(result, f, ensure_ascii=False, indent=2)
 
             total_keys += len(keys)
+            translated_count += trans_count
             completed += 1
-            print(f"Batch {str(i).zfill(3)}: {len(keys)} keys ({sum(1 for k in keys if k in STATIC_TRANSLATIONS)} translated)")
+            events.emit('batch.processed', batch=i, keys=len(keys), translated=trans_count, file=str(output_file))
 
         except Exception as e:
-            print(f"Error processing batch {str(i).zfill(3)}: {str(e)}")
-
-    print(f"\n{'='*70}")
-    print(f"SUMMARY")
-    print(f"{'='*70}")
-    print(f"Batches processed: {completed}/30")
-    print(f"Total keys: {total_keys}")
-    print(f"Translated with static dictionary: {translated_count}")
-    print(f"Remaining (fallback to key): {total_keys - translated_count}")
-    print(f"Translation coverage: {(translated_count/total_keys*100):.1f}%")
-    print(f"{'='*70}")
+            events.error(e, batch=i)
+
+    events.emit('run.finished', batches=completed, totalBatches=len(batch_numbers(BATCH_DIR)),
+                keys=total_keys, translated=translated_count, fallback=total_keys - translated_count,
+                coverage=round(translated_count / total_keys * 100, 1) if total_keys else 0.0,
+                output=str(BATCH_DIR), seconds=round(time.perf_counter() - run_start, 6))
 
 if __name__ == '__main__':
     main()
@@ -1,69 +1,61 @@
 #!/usr/bin/env python3
 
 import json
-from pathlib import Path
-import subprocess
 import sys
+import time
 
-BATCH_DIR = Path('/home/olibuijr/Projects/olfong_stack/backend/translation-batches')
+from olfong_i18n.backends import QuotaExceeded, backend_from_env
+from olfong_i18n.batching import batch_numbers
+from olfong_i18n.budget import write_resume_plan
+from olfong_i18n.catalog import BACKEND_DIR, load_extracted_keys
+from olfong_i18n.events import EventLog
+from olfong_i18n.priority import prioritize_keys
+from olfong_i18n.rules import RulesEngine
+from olfong_i18n.templates import KEY_TEMPLATE, key_prompt
+
+BATCH_DIR = BACKEND_DIR / 'translation-batches'
+RESUME_PLAN = BACKEND_DIR / 'translated-data' / 'resume-plan.json'
 
 # Comprehensive translation map - will be built from all unique keys
 TRANSLATIONS_MAP = {}
 
+# NDJSON progress events; opened by main() so importing this file has no side effects
+events = EventLog()
+
+# gemini CLI per call, or OLFONG_LLM_BACKEND=http for a pooled keep-alive endpoint; set by main()
+backend = None
+
 def translate_key_with_gemini(key):
-    """Use gemini to translate a single key"""
+    """Use gemini to translate a single key; QuotaExceeded propagates so the run stops instead of degrading"""
     try:
-        prompt = f'''Translate this UI text key to professional Icelandic for "Ölföng", an e-commerce wine and beer website.
-Key context: {key}
-
-Guidelines:
-- Use formal, professional Icelandic
-- For UI labels: clear, concise descriptive text
-- For buttons: active verbs
-- For settings: descriptive labels
-- For payment providers: keep original names (Teya, Valitor)
-- For numbers: use comma as decimal separator (24,00 not 24.00)
-- For categories: use Icelandic equivalents (WINE->Vín, BEER->Bjór, SPIRITS->Brennivín)
-- For common UI terms:
-  * Save = Vista
-  * Delete = Eyða
-  * Edit = Breyta
-  * Add = Bæta við
-  * View = Skoðaðu
-  * Submit = Senda
-  * Cancel = Hætta við
-  * Settings = Stillingar
-  * Profile = Prófíl
-
-Return ONLY the Icelandic translation text, nothing else.'''
-
-        result = subprocess.run(
-            ['gemini', '-p', prompt],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-
-        if result.returncode == 0:
-            translation = result.stdout.strip().split('\n')[0].strip()
-            if translation and len(translation) > 0:
-                return translation
+        prompt = key_prompt(key)  # static prefix first, so the backend can reuse it across keys
+
+        completion = backend.complete(prompt)
+        translation = completion.text.split('\n')[0].strip()
+        if translation and len(translation) > 0:
+            return translation
+        events.emit('error', errorClass='BackendError', key=key, message='empty response')
+    except QuotaExceeded:
+        raise
     except Exception as e:
-        pass
+        events.error(e, key=key)
 
     return None
 
 def main():
-    print("="*60)
-    print("COMPREHENSIVE ICELANDIC TRANSLATION GENERATOR")
-    print("="*60)
+    global events, backend
+    # NDJSON progress events on stdout (or $OLFONG_I18N_EVENTS)
+    events = EventLog.from_env(default_stream=sys.stdout)
+    backend = backend_from_env('gemini', timeout=10)
+    run_start = time.perf_counter()
+    events.emit('run.started', script='comprehensive-translate.py', batchDir=str(BATCH_DIR),
+                template=KEY_TEMPLATE.tag)
 
     # Step 1: Collect all unique keys
-    print("\nStep 1: Collecting all unique keys from batches...")
     all_keys = []
     key_to_batches = {}
 
-    for i in range(1, 31):
+    for i in batch_numbers(BATCH_DIR):
         batch_file = BATCH_DIR / f'batch-{str(i).zfill(3)}.json'
         if batch_file.exists():
             with open(batch_file, 'r', encoding='utf-8') as f:
@@ -75,14 +67,12 @@ def main():
                         key_to_batches[key] = []
                     key_to_batches[key].append(i)
 
-    print(f"Found {len(all_keys)} total keys")
-    print(f"Found {len(key_to_batches)} unique keys")
+    events.emit('keys.collected', keys=len(all_keys), unique=len(key_to_batches))
 
     # Step 2: Load existing translations from batch files
-    print("\nStep 2: Loading existing translations...")
     existing_translations = {}
 
-    for i in range(1, 31):
+    for i in batch_numbers(BATCH_DIR):
         trans_file = BATCH_DIR / f'batch-{str(i).zfill(3)}-translated.json'
         if trans_file.exists():
             with open(trans_file, 'r', encoding='utf-8') as f:
@@ -91,43 +81,68 @@ def main():
                     if key not in existing_translations or value != key:
                         existing_translations[key] = value
 
-    print(f"Loaded {len(existing_translations)} existing translations")
+    events.emit('translations.loaded', existing=len(existing_translations))
 
-    # Step 3: Identify keys that still need translation
+    # Step 3: Numbers, brand names and extractor noise are resolved by rule, never by the LLM
+    rules = RulesEngine('is')
+    offline = set()
+    for key in key_to_batches:
+        value = rules.get(key)
+        if value is not None:
+            existing_translations[key] = value
+            offline.add(key)
+            events.emit('cache.hit', key=key, layer='rules')
+    events.emit('rules.resolved', keys=len(offline), **rules.summary())
+
+    # Identify keys that still need translation
     untranslated = {}
     for key in key_to_batches:
+        if key in offline:
+            continue
         if key not in existing_translations or existing_translations[key] == key:
             untranslated[key] = None
 
-    print(f"Found {len(untranslated)} untranslated keys")
-    print(f"Already translated: {len(existing_translations) - len(untranslated)}")
+    for key in key_to_batches:
+        if key not in untranslated and key not in offline:
+            events.emit('cache.hit', key=key, layer='existing')
 
     # Step 4: Generate translations for untranslated keys
-    print("\nStep 3: Generating translations (this may take a few minutes)...")
     translated_count = 0
     failed_count = 0
+    deferred = []
 
-    sorted_untranslated = sorted(untranslated.keys())
+    # Customer-facing and most-used keys first, so a partial run covers what shoppers see
+    usage = {entry.key: entry for entry in load_extracted_keys(valid_only=False)}
+    sorted_untranslated = prioritize_keys(untranslated.keys(), usage)
 
     for idx, key in enumerate(sorted_untranslated, 1):
-        translation = translate_key_with_gemini(key)
+        events.emit('cache.miss', key=key)
+        events.emit('key.started', key=key, index=idx, total=len(sorted_untranslated))
+        start = time.perf_counter()
+        try:
+            translation = translate_key_with_gemini(key)
+        except QuotaExceeded as e:
+            # Out of quota for today: the rest waits for the next run instead of becoming key-as-value
+            events.error(e, key=key)
+            deferred = sorted_untranslated[idx - 1:]
+            plan = write_resume_plan(RESUME_PLAN, deferred, 'quota exceeded')
+            events.emit('budget.stop', reason='quota exceeded', deferred=len(deferred), resumePlan=str(plan))
+            break
+        latency = round(time.perf_counter() - start, 6)
 
         if translation:
             untranslated[key] = translation
             existing_translations[key] = translation
             translated_count += 1
-            if idx % 50 == 0:
-                print(f"  Translated {idx}/{len(sorted_untranslated)} keys...")
+            events.emit('key.finished', key=key, origin='llm', latency=latency)
         else:
             existing_translations[key] = key  # Fallback to key itself
             failed_count += 1
-
-    print(f"Translation complete: {translated_count} translated, {failed_count} fallback to key")
+            events.emit('key.finished', key=key, origin='fallback', latency=latency)
 
     # Step 4: Write updated translations back to batch files
-    print("\nStep 4: Updating batch translation files...")
 
-    for i in range(1, 31):
+    for i in batch_numbers(BATCH_DIR):
         batch_file = BATCH_DIR / f'batch-{str(i).zfill(3)}.json'
         trans_file = BATCH_DIR / f'batch-{str(i).zfill(3)}-translated.json'
 
@@ -147,20 +162,13 @@ def main():
             with open(trans_file, 'w', encoding='utf-8') as f:
                 json.dump(batch_translations, f, ensure_ascii=False, indent=2)
 
-    print(f"Updated all 30 batch translation files")
-
-    # Step 5: Create summary
-    print("\n" + "="*60)
-    print("TRANSLATION SUMMARY")
-    print("="*60)
-    print(f"Total unique keys: {len(key_to_batches)}")
-    print(f"Total keys (with duplicates): {len(all_keys)}")
-    print(f"Keys with translations: {len(existing_translations)}")
-    print(f"Keys newly translated: {translated_count}")
-    print(f"Keys with fallback: {failed_count}")
-    print("="*60)
-    print("\nAll batch files have been updated with translations!")
-    print(f"Output location: {BATCH_DIR}")
+            events.emit('batch.processed', batch=i, keys=len(keys), file=str(trans_file))
+
+    # Step 5: Summary
+    events.emit('run.finished', uniqueKeys=len(key_to_batches), keys=len(all_keys),
+                withTranslation=len(existing_translations), offline=len(offline), translated=translated_count,
+                fallback=failed_count, deferred=len(deferred), output=str(BATCH_DIR),
+                seconds=round(time.perf_counter() - run_start, 6))
 
 if __name__ == '__main__':
     main()
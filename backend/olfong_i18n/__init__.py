@@ -0,0 +1,111 @@
+"""
+Shared building blocks for the Ölföng UI translation scripts, usable as a
+library:
+
+    import olfong_i18n
+
+    entries, existing = olfong_i18n.load_catalog()
+    resolved, pending = olfong_i18n.resolve(entries, existing)
+    result = olfong_i18n.translate(entries, existing, backend='fake')
+    olfong_i18n.emit(result, '/tmp/translated-data')
+
+Importing the package (or any submodule) has no side effects and is kept
+cheap: this module imports nothing until an API function or attribute is
+first used, and the heavy pieces (HTTP client, process pools, bundle
+writers) load inside the code that needs them, so workers and the daemon
+start instantly (see tests/test_import_time.py). Default paths hang off
+BACKEND_DIR, which $OLFONG_I18N_ROOT overrides; every function also takes
+a root= directory, or explicit paths.
+"""
+
+# Public names resolved on first access (PEP 562), so `import olfong_i18n` stays free
+_LAZY = {
+    'BACKEND_DIR': 'catalog',
+    'KeyUsage': 'catalog',
+    'load_extracted_keys': 'catalog',
+    'create_backend': 'backends',
+    'EventLog': 'events',
+    'RunMetrics': 'metrics',
+    'OUTPUT_DIR': 'pipeline',
+    'Pipeline': 'pipeline',
+    'RunResult': 'pipeline',
+    'SnapshotStore': 'snapshots',
+}
+
+__all__ = ['load_catalog', 'resolve', 'translate', 'emit', 'create_pipeline'] + sorted(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    from importlib import import_module
+
+    value = getattr(import_module(f'.{_LAZY[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def _root_paths(root):
+    from pathlib import Path
+
+    from .catalog import BACKEND_DIR
+
+    root = Path(root) if root else BACKEND_DIR
+    return root / 'extracted-keys.json', root / 'translation-batches', root / 'translated-data'
+
+
+def load_catalog(keys_file=None, batch_dir=None, root=None, locale='is'):
+    """(entries, existing): KeyUsage list from extracted-keys.json, `locale` translations already in the batch files"""
+    from pathlib import Path
+
+    from .batching import BATCH_DIR, BATCH_DIRS, load_batch_translations
+    from .catalog import load_extracted_keys
+
+    default_keys, default_batches, _ = _root_paths(root)
+    batch_dir = Path(batch_dir or default_batches.with_name(BATCH_DIRS.get(locale, BATCH_DIR).name))
+    entries = load_extracted_keys(keys_file or default_keys)
+    existing = load_batch_translations(batch_dir, locale) if batch_dir.exists() else {}
+    return entries, existing
+
+
+def create_pipeline(backend='fake', **options):
+    """A Pipeline over `backend`: a backend object or a create_backend() spec ('gemini', 'fake', 'gemini+claude')"""
+    from .backends import create_backend
+    from .pipeline import Pipeline
+
+    if isinstance(backend, str):
+        backend = create_backend(backend, pool_size=options.get('concurrency', 1))
+    options.setdefault('compress', False)
+    return Pipeline(backend, **options)
+
+
+def resolve(entries, existing=None, locale='is', static=None):
+    """({key: value} answered offline by rules, existing, static and key-name layers, [entries left for a backend])"""
+    from .pipeline import Pipeline
+
+    offline = Pipeline(None, locale=locale, static=static, compress=False)
+    resolved, _, pending = offline.lookup(offline.dedupe(entries), existing or {})
+    return resolved, pending
+
+
+def translate(entries, existing=None, backend='fake', **options):
+    """Run the whole pipeline over `entries` and return its RunResult (see create_pipeline())"""
+    run = create_pipeline(backend, **options)
+    try:
+        return run.run(entries, existing)
+    finally:
+        run.close()
+        if isinstance(backend, str) and hasattr(run.backend, 'close'):
+            run.backend.close()
+
+
+def emit(result, output_dir=None, locale='is', root=None, **options):
+    """Write a RunResult's translation files and bundles; returns the output directory"""
+    from .pipeline import Pipeline
+
+    options.setdefault('compress', False)
+    writer = Pipeline(None, locale=locale, **options)
+    try:
+        return writer.emit(result, output_dir or _root_paths(root)[2])
+    finally:
+        writer.close()
@@ -0,0 +1,154 @@
+"""
+Per-area translation bundles and a route -> bundle manifest.
+
+The full bundle carries ~1000 admin strings the storefront never renders.
+Each key is given one area from the files that use it (extracted-keys.json):
+storefront, checkout, admin, or common when it is shared between the admin
+panel and customer pages. Area bundles are written as
+bundles/<area>/<locale>.<hash>.json (same layout as write_bundle), and
+bundles/areas.json lists them with the areas each route needs, so a
+storefront page loads common + storefront and admin loads lazily.
+
+Extractor noise (`-`, `24.00`, CSS selectors) goes into no area.
+
+Usage:
+    python -m olfong_i18n.areas [--from translated-data/translations-for-database.json]
+        [--keys extracted-keys.json] [--out translated-data/bundles] [--intern]
+"""
+
+import argparse
+import json
+from collections import OrderedDict
+from pathlib import Path
+
+from .bundles import BUNDLE_DIR, DATABASE_EXPORT, _write_atomic, content_hash, load_rows, write_bundle
+from .catalog import EXTRACTED_KEYS_FILE, load_extracted_keys
+from .priority import ADMIN_FILE_PREFIXES, CHECKOUT_FILES, surface_of
+
+AREAS = ('common', 'storefront', 'checkout', 'admin')
+AREAS_MANIFEST = 'areas.json'
+
+# Longest matching prefix wins; mirrors the routes in web/src/App.jsx
+ROUTE_AREAS = (
+    ('/admin', ('common', 'admin')),
+    ('/delivery', ('common', 'checkout', 'admin')),
+    ('/cart', ('common', 'storefront', 'checkout')),
+    ('/checkout', ('common', 'storefront', 'checkout')),
+    ('/orders', ('common', 'storefront', 'checkout')),
+    ('/profile', ('common', 'storefront', 'checkout')),
+    ('/', ('common', 'storefront')),
+)
+
+
+def area_of(key, files=()):
+    """common, storefront, checkout or admin for one key; None for extractor noise"""
+    surface = surface_of(key, files)
+    if surface == 'junk':
+        return None
+    admin_files = [f for f in files if f.startswith(ADMIN_FILE_PREFIXES)]
+    customer_files = [f for f in files if not f.startswith(ADMIN_FILE_PREFIXES)]
+    if admin_files and customer_files:
+        return 'common'
+    if surface == 'admin' and customer_files:
+        return 'common'
+    if surface in ('storefront', 'checkout') and admin_files:
+        return 'common'
+    # Cart strings rendered outside the cart page (add-to-cart buttons) ship with the storefront
+    if surface == 'checkout' and any(not f.startswith(CHECKOUT_FILES) for f in customer_files):
+        return 'storefront'
+    return surface
+
+
+def split_areas(flat, usage):
+    """{area: {key: value}} for one locale; `usage` is {key: KeyUsage}"""
+    areas = OrderedDict((area, OrderedDict()) for area in AREAS)
+    for key, value in flat.items():
+        entry = usage.get(key)
+        area = area_of(key, entry.files if entry else ())
+        if area is not None:
+            areas[area][key] = value
+    return areas
+
+
+def areas_for_route(pathname):
+    """Areas a route needs, by longest matching prefix"""
+    best = ('', AREAS)
+    for prefix, areas in ROUTE_AREAS:
+        matches = pathname == prefix or pathname.startswith(prefix.rstrip('/') + '/')
+        if matches and len(prefix) > len(best[0]):
+            best = (prefix, areas)
+    return list(best[1])
+
+
+def write_area_bundles(flat, locale, usage, out_dir=BUNDLE_DIR, intern=False):
+    """Write one bundle per area and update areas.json; returns {area: write_bundle summary}"""
+    out_dir = Path(out_dir)
+    summaries = OrderedDict()
+    for area, area_flat in split_areas(flat, usage).items():
+        summaries[area] = write_bundle(area_flat, locale, out_dir / area, intern=intern)
+    update_areas_manifest(out_dir, locale, summaries)
+    return summaries
+
+
+def load_areas_manifest(out_dir=BUNDLE_DIR):
+    path = Path(out_dir) / AREAS_MANIFEST
+    if not path.exists():
+        return {'version': None, 'areas': {}, 'routes': []}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def update_areas_manifest(out_dir, locale, summaries):
+    """Set one locale's area entries; the version is a hash of every area/locale hash"""
+    out_dir = Path(out_dir)
+    areas = load_areas_manifest(out_dir).get('areas', {})
+    for area, summary in summaries.items():
+        areas.setdefault(area, {})[locale] = {
+            'hash': summary['hash'],
+            'file': f"{area}/{summary['file']}",
+            'bytes': summary['bytes'],
+            'keys': summary['keys'],
+        }
+        if summary.get('interned'):
+            areas[area][locale]['interned'] = {
+                'file': f"{area}/{summary['interned']['file']}",
+                'bytes': summary['interned']['bytes'],
+            }
+    areas = OrderedDict((area, OrderedDict(sorted(areas[area].items()))) for area in sorted(areas))
+    version = content_hash(''.join(
+        f"{area}/{loc}:{entry['hash']};" for area, locales in areas.items() for loc, entry in locales.items()
+    ).encode())
+    manifest = {
+        'version': version,
+        'areas': areas,
+        'routes': [{'prefix': prefix, 'areas': list(route_areas)} for prefix, route_areas in ROUTE_AREAS],
+    }
+    _write_atomic(out_dir / AREAS_MANIFEST, json.dumps(manifest, separators=(',', ':')).encode('utf-8'))
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build per-area i18next bundles and the route manifest')
+    parser.add_argument('--from', dest='source', default=str(DATABASE_EXPORT),
+                        help='translations-for-database.json rows or a flat {key: value} file')
+    parser.add_argument('--keys', default=str(EXTRACTED_KEYS_FILE), help='path to extracted-keys.json')
+    parser.add_argument('--out', default=str(BUNDLE_DIR), help='bundle output directory')
+    parser.add_argument('--intern', action='store_true', help='also write the interned string-table encoding')
+    args = parser.parse_args(argv)
+
+    usage = {entry.key: entry for entry in load_extracted_keys(args.keys, valid_only=False)}
+    for locale, flat in load_rows(args.source).items():
+        full = write_bundle(flat, locale, args.out, intern=args.intern)
+        summaries = write_area_bundles(flat, locale, usage, args.out, intern=args.intern)
+        print(f"📊 {locale}: full bundle {full['bytes']} bytes")
+        for area, summary in summaries.items():
+            print(f"  {area:<10} {summary['keys']:5} keys  {summary['bytes']:7} bytes  -> {area}/{summary['file']}")
+        for prefix, route_areas in ROUTE_AREAS:
+            size = sum(summaries[area]['bytes'] for area in route_areas)
+            print(f"  route {prefix:<10} {'+'.join(route_areas):<28} {size:7} bytes "
+                  f"({size * 100 / full['bytes']:.0f}% of full)")
+    print(f"✅ Route manifest saved to: {Path(args.out) / AREAS_MANIFEST}")
+
+
+if __name__ == '__main__':
+    main()
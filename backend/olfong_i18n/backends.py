@@ -0,0 +1,502 @@
+"""
+LLM backends used by the translation pipeline.
+
+A backend takes a prompt and returns a Completion. CliBackend spawns the
+`gemini` / `claude` CLI once per call (what the scripts have always done);
+HttpBackend keeps a pool of keep-alive connections to an OpenAI-compatible
+endpoint (a local llama.cpp / Ollama server or a proxy), so startup and auth
+are paid once per connection instead of once per string. FallbackBackend
+drops to spawn-per-call when the endpoint is down. Concurrent calls come from
+the pipeline's thread pool (--concurrency) and share HttpBackend's pooled
+connections. FakeBackend is a local stand-in that answers compact prompts
+without a model, for dry runs and benchmarks.
+
+HedgedBackend spreads calls over several backends (e.g. gemini and claude)
+weighted by their observed latency and success rate. When a call runs past
+the p95 latency of the backend it went to, it is hedged to the best other
+backend; the first good answer wins and the loser is cancelled (CLI
+processes are killed; an HTTP request is left to finish and discarded).
+
+Completion.spawn is the per-call setup overhead: process spawn for the CLI,
+TCP connect for HTTP (0.0 when a pooled connection is reused).
+"""
+
+import json
+import os
+import queue
+import random
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from .metrics import percentile
+from .prompts import parse_compact
+
+QUOTA_MARKERS = ('429', 'RESOURCE_EXHAUSTED', 'Quota exceeded', 'rateLimitExceeded')
+
+BACKEND_ENV = 'OLFONG_LLM_BACKEND'
+URL_ENV = 'OLFONG_LLM_URL'
+MODEL_ENV = 'OLFONG_LLM_MODEL'
+API_KEY_ENV = 'OLFONG_LLM_API_KEY'
+DEFAULT_URL = 'http://127.0.0.1:11434/v1/chat/completions'
+CANCEL_POLL = 0.05  # seconds between checks of a cancel event while a CLI call runs
+
+
+class BackendError(Exception):
+    """A backend call failed; safe to retry"""
+
+
+class BackendTimeout(BackendError):
+    pass
+
+
+class QuotaExceeded(BackendError):
+    """The provider rejected the call with 429 / RESOURCE_EXHAUSTED"""
+
+
+class BackendCancelled(BackendError):
+    """The call lost a hedged race and was cancelled"""
+
+
+@dataclass
+class Completion:
+    text: str
+    latency: float
+    spawn: float = 0.0
+    backend: str = ''
+    hedged: bool = False
+
+
+def is_quota_error(output):
+    return any(marker in output for marker in QUOTA_MARKERS)
+
+
+class CliBackend:
+    """Spawns a CLI process per call, e.g. `gemini -p <prompt>`"""
+
+    def __init__(self, command=('gemini', '-p'), timeout=60, name=None):
+        self.command = list(command)
+        self.timeout = timeout
+        self.name = name or self.command[0]
+
+    def complete(self, prompt, cancel=None):
+        start = time.perf_counter()
+        try:
+            proc = subprocess.Popen(
+                self.command + [prompt],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+        except OSError as e:
+            raise BackendError(f'{self.name}: {e}') from e
+        spawned = time.perf_counter()
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                wait_for = CANCEL_POLL if cancel is not None else self.timeout
+                stdout, stderr = proc.communicate(timeout=min(wait_for, max(deadline - time.monotonic(), 0)))
+                break
+            except subprocess.TimeoutExpired:
+                cancelled = cancel is not None and cancel.is_set()
+                if not cancelled and time.monotonic() < deadline:
+                    continue
+                proc.kill()
+                proc.communicate()
+                if cancelled:
+                    raise BackendCancelled(f'{self.name}: cancelled')
+                raise BackendTimeout(f'{self.name}: no response after {self.timeout}s')
+
+        if proc.returncode != 0:
+            if is_quota_error(stderr + stdout):
+                raise QuotaExceeded(f'{self.name}: quota exceeded')
+            raise BackendError(f'{self.name}: exit code {proc.returncode}')
+
+        return Completion(stdout.strip(), time.perf_counter() - start, spawned - start, self.name)
+
+
+class HttpBackend:
+    """Chat completions over a pool of keep-alive HTTP connections"""
+
+    def __init__(self, url=DEFAULT_URL, model='default', pool_size=4, timeout=60, api_key=None, name='http'):
+        parts = urlsplit(url)
+        self.url = url
+        self.model = model
+        self.timeout = timeout
+        self.api_key = api_key
+        self.name = name
+        self._scheme = parts.scheme
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = parts.path or '/'
+        self._idle = queue.LifoQueue(maxsize=pool_size)
+
+    def _connection(self):
+        import http.client  # only HTTP runs pay for it; it pulls in ssl and email
+
+        try:
+            return self._idle.get_nowait(), False
+        except queue.Empty:
+            cls = http.client.HTTPSConnection if self._scheme == 'https' else http.client.HTTPConnection
+            return cls(self._host, self._port, timeout=self.timeout), True
+
+    def _release(self, conn):
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def complete(self, prompt, cancel=None):
+        # An HTTP request can't be interrupted midway; a cancelled one finishes and is discarded
+        import http.client
+
+        start = time.perf_counter()
+        body = json.dumps({
+            'model': self.model,
+            'messages': [{'role': 'user', 'content': prompt}],
+            'temperature': 0,
+        }).encode('utf-8')
+        headers = {'Content-Type': 'application/json'}
+        if self.api_key:
+            headers['Authorization'] = f'Bearer {self.api_key}'
+
+        spawn = 0.0
+        while True:
+            conn, fresh = self._connection()
+            try:
+                if fresh:
+                    connect_start = time.perf_counter()
+                    conn.connect()
+                    spawn += time.perf_counter() - connect_start
+                conn.request('POST', self._path, body, headers)
+                response = conn.getresponse()
+                payload = response.read().decode('utf-8', errors='replace')
+                break
+            except TimeoutError as e:
+                conn.close()
+                raise BackendTimeout(f'{self.name}: no response after {self.timeout}s') from e
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                if not fresh:
+                    continue  # the server closed an idle keep-alive connection
+                raise BackendError(f'{self.name}: {e}') from e
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(conn)
+
+        if response.status == 429 or (response.status >= 400 and is_quota_error(payload)):
+            raise QuotaExceeded(f'{self.name}: quota exceeded')
+        if response.status >= 400:
+            raise BackendError(f'{self.name}: HTTP {response.status}')
+        try:
+            text = json.loads(payload)['choices'][0]['message']['content']
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise BackendError(f'{self.name}: unexpected response') from e
+        return Completion((text or '').strip(), time.perf_counter() - start, spawn, self.name)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class FallbackBackend:
+    """Use the primary backend, and the fallback (spawn-per-call) while it is unreachable"""
+
+    def __init__(self, primary, fallback, retry_after=30.0):
+        self.primary = primary
+        self.fallback = fallback
+        self.retry_after = retry_after
+        self.name = primary.name
+        self._down_until = 0.0
+
+    def complete(self, prompt, cancel=None):
+        if time.monotonic() >= self._down_until:
+            try:
+                return self.primary.complete(prompt, cancel)
+            except (QuotaExceeded, BackendCancelled):
+                raise
+            except BackendError:
+                self._down_until = time.monotonic() + self.retry_after
+        return self.fallback.complete(prompt, cancel)
+
+    def close(self):
+        for backend in (self.primary, self.fallback):
+            if hasattr(backend, 'close'):
+                backend.close()
+
+
+class FakeBackend:
+    """Answers compact prompts locally with a configurable latency profile"""
+
+    def __init__(self, latency=0.0, jitter=0.0, failure_rate=0.0, spawn=0.0, keepalive=0, stall_rate=0.0,
+                 stall=0.0, seed=0, name='fake'):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.stall_rate = stall_rate  # share of calls that hang for `stall` extra seconds
+        self.stall = stall
+        self.spawn = spawn
+        self.keepalive = keepalive  # simulated pooled connections: spawn is paid once per connection
+        self.name = name
+        self._random = random.Random(seed)
+        self._warm = 0
+        self._lock = threading.Lock()
+
+    def _setup_cost(self):
+        if not self.keepalive:
+            return self.spawn
+        with self._lock:
+            if self._warm >= self.keepalive:
+                return 0.0
+            self._warm += 1
+            return self.spawn
+
+    def answer(self, prompt):
+        """Source text if given, else the humanized key suffix"""
+        result = {}
+        for entry_id, key, source in parse_compact(prompt):
+            suffix = key.rsplit('.', 1)[-1]
+            result[entry_id] = source or f'IS {suffix}'
+        return json.dumps(result, ensure_ascii=False)
+
+    def complete(self, prompt, cancel=None):
+        start = time.perf_counter()
+        spawn = self._setup_cost()
+        with self._lock:
+            delay = spawn + self.latency + self._random.uniform(0, self.jitter)
+            if self.stall_rate and self._random.random() < self.stall_rate:
+                delay += self.stall
+            failed = bool(self.failure_rate) and self._random.random() < self.failure_rate
+        if cancel is not None:
+            if cancel.wait(delay):
+                raise BackendCancelled(f'{self.name}: cancelled')
+        elif delay:
+            time.sleep(delay)
+        if failed:
+            raise BackendError(f'{self.name}: injected failure')
+        return Completion(self.answer(prompt), time.perf_counter() - start, spawn, self.name)
+
+
+class BackendStats:
+    """Observed latency and success of one backend, for weighting and hedge timing"""
+
+    def __init__(self, window=200, alpha=0.2):
+        self.alpha = alpha
+        self.latencies = deque(maxlen=window)
+        self.ewma_latency = None
+        self.success = 1.0
+        self.calls = 0
+        self.failures = 0
+        self.hedges = 0  # times this backend was called as the hedge
+        self.wins = 0  # hedged races this backend won
+        self.down_until = 0.0
+
+    def record(self, latency, ok):
+        self.calls += 1
+        self.success += self.alpha * ((1.0 if ok else 0.0) - self.success)
+        if ok:
+            self.observe_latency(latency)
+        else:
+            self.failures += 1
+
+    def observe_latency(self, latency):
+        self.latencies.append(latency)
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency += self.alpha * (latency - self.ewma_latency)
+
+    def p95(self, min_samples, default):
+        if len(self.latencies) < min_samples:
+            return default
+        return percentile(sorted(self.latencies), 0.95)
+
+    def weight(self, default_latency):
+        latency = self.ewma_latency if self.ewma_latency is not None else default_latency
+        return max(self.success, 0.01) / max(latency, 1e-3)
+
+    def summary(self, min_samples, default):
+        return {
+            'calls': self.calls,
+            'failures': self.failures,
+            'success': round(self.success, 4),
+            'ewmaLatency': round(self.ewma_latency, 6) if self.ewma_latency is not None else None,
+            'p95': round(self.p95(min_samples, default), 6),
+            'hedges': self.hedges,
+            'hedgeWins': self.wins,
+        }
+
+
+class HedgedBackend:
+    """Latency-weighted load balancing over several backends, with hedged requests
+
+    Each call goes to a backend picked with probability proportional to
+    success rate / EWMA latency. If it hasn't answered by that backend's p95
+    latency (hedge_after until min_samples calls have been seen), the same
+    prompt goes to the best other backend, and whichever answers first wins.
+    A backend that returns a quota error is skipped for `cooldown` seconds;
+    QuotaExceeded is raised only when every backend is out of quota.
+    """
+
+    def __init__(self, backends, hedge_after=5.0, min_samples=20, cooldown=60.0, workers=16, seed=0, name=None):
+        if not backends:
+            raise ValueError('HedgedBackend needs at least one backend')
+        if len({b.name for b in backends}) != len(backends):
+            raise ValueError('HedgedBackend needs backends with distinct names')
+        self.backends = list(backends)
+        self.hedge_after = hedge_after
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self.name = name or '+'.join(b.name for b in self.backends)
+        self.stats = {b.name: BackendStats() for b in self.backends}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+
+    def _available(self, exclude=()):
+        now = time.monotonic()
+        return [b for b in self.backends if b.name not in exclude and self.stats[b.name].down_until <= now]
+
+    def pick(self, exclude=()):
+        """Weighted random choice among backends not cooling down; None if there is none"""
+        with self._lock:
+            candidates = self._available(exclude)
+            if not candidates:
+                return None
+            weights = [self.stats[b.name].weight(self.hedge_after) for b in candidates]
+            return self._random.choices(candidates, weights)[0]
+
+    def best(self, exclude=()):
+        with self._lock:
+            candidates = self._available(exclude)
+            if not candidates:
+                return None
+            return max(candidates, key=lambda b: self.stats[b.name].weight(self.hedge_after))
+
+    def _call(self, backend, prompt, cancel):
+        start = time.perf_counter()
+        try:
+            completion = backend.complete(prompt, cancel)
+        except BackendCancelled:
+            # It was at least this slow; count that so a stalling backend loses weight
+            with self._lock:
+                self.stats[backend.name].observe_latency(time.perf_counter() - start)
+            raise
+        except QuotaExceeded:
+            with self._lock:
+                self.stats[backend.name].record(time.perf_counter() - start, False)
+                self.stats[backend.name].down_until = time.monotonic() + self.cooldown
+            raise
+        except BackendError:
+            with self._lock:
+                self.stats[backend.name].record(time.perf_counter() - start, False)
+            raise
+        with self._lock:
+            self.stats[backend.name].record(completion.latency, True)
+        return completion
+
+    def complete(self, prompt, cancel=None):
+        start = time.perf_counter()
+        primary = self.pick()
+        if primary is None:
+            raise QuotaExceeded(f'{self.name}: every backend is out of quota')
+        with self._lock:
+            hedge_delay = self.stats[primary.name].p95(self.min_samples, self.hedge_after)
+
+        cancels = {primary.name: threading.Event()}
+        running = {self._pool.submit(self._call, primary, prompt, cancels[primary.name]): primary}
+        done, _ = wait(running, timeout=hedge_delay)
+        tried = {primary.name}
+        hedged = False
+        errors = []
+        while True:
+            for future in done:
+                backend = running.pop(future)
+                try:
+                    completion = future.result()
+                except BackendError as e:
+                    errors.append(e)
+                    continue
+                for loser in running.values():
+                    cancels[loser.name].set()
+                if hedged:
+                    with self._lock:
+                        self.stats[backend.name].wins += backend.name != primary.name
+                completion.latency = time.perf_counter() - start
+                completion.hedged = hedged
+                return completion
+
+            # Hedge when the primary is slow, or fail over when it failed, while a backend is left
+            if cancel is not None and cancel.is_set():
+                for loser in running.values():
+                    cancels[loser.name].set()
+                raise BackendCancelled(f'{self.name}: cancelled')
+            if len(running) < 2:
+                backup = self.best(exclude=tried)
+                if backup is not None:
+                    tried.add(backup.name)
+                    hedged = hedged or bool(running)
+                    with self._lock:
+                        self.stats[backup.name].hedges += bool(running)
+                    cancels[backup.name] = threading.Event()
+                    running[self._pool.submit(self._call, backup, prompt, cancels[backup.name])] = backup
+            if not running:
+                if errors and all(isinstance(e, QuotaExceeded) for e in errors):
+                    raise QuotaExceeded(f'{self.name}: every backend is out of quota')
+                raise errors[-1] if errors else BackendError(f'{self.name}: no backend available')
+            done, _ = wait(running, timeout=CANCEL_POLL if cancel is not None else None,
+                           return_when=FIRST_COMPLETED)
+
+    def summary(self):
+        with self._lock:
+            return {name: stats.summary(self.min_samples, self.hedge_after) for name, stats in self.stats.items()}
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        for backend in self.backends:
+            if hasattr(backend, 'close'):
+                backend.close()
+
+
+def create_backend(name, timeout=60, pool_size=4, fallback='gemini'):
+    """Backend by name: gemini, claude, http or fake
+
+    http talks to $OLFONG_LLM_URL (model $OLFONG_LLM_MODEL) over pooled
+    keep-alive connections and falls back to spawning the `fallback` CLI
+    while the endpoint is unreachable. Several names joined with `+`
+    (gemini+claude) give a HedgedBackend over those backends.
+    """
+    if '+' in name:
+        return HedgedBackend([create_backend(part, timeout, pool_size, fallback=None) for part in name.split('+')],
+                             hedge_after=timeout / 4)
+    if name == 'gemini':
+        return CliBackend(('gemini', '-p'), timeout)
+    if name == 'claude':
+        return CliBackend(('claude', '-p'), timeout)
+    if name == 'http':
+        backend = HttpBackend(
+            os.environ.get(URL_ENV, DEFAULT_URL),
+            os.environ.get(MODEL_ENV, 'default'),
+            pool_size,
+            timeout,
+            os.environ.get(API_KEY_ENV)
+        )
+        return FallbackBackend(backend, create_backend(fallback, timeout)) if fallback else backend
+    if name == 'fake':
+        return FakeBackend()
+    raise ValueError(f'Unknown backend: {name}')
+
+
+def backend_from_env(default='gemini', timeout=60):
+    """Backend named by $OLFONG_LLM_BACKEND, for the standalone scripts"""
+    return create_backend(os.environ.get(BACKEND_ENV, default), timeout, fallback=default)
@@ -0,0 +1,265 @@
+"""
+Namespace-aware batch planner for translation-batches/.
+
+Replaces the fixed alphabetical 50-key slices of create-translation-batches.js.
+Keys are grouped by dotted namespace (large namespaces are split by the source
+file that uses them, from extracted-keys.json), and the groups are bin-packed
+to a prompt size budget so each call carries one coherent context.
+
+Usage:
+    python -m olfong_i18n.batching [--budget 3000] [--max-keys 150] [--out translation-batches]
+"""
+
+import argparse
+import json
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .catalog import BACKEND_DIR, EXTRACTED_KEYS_FILE, load_extracted_keys, namespace_of
+
+BATCH_DIR = BACKEND_DIR / 'translation-batches'
+EN_BATCH_DIR = BACKEND_DIR / 'translation-batches-en'
+# Each locale's existing answers: batch-NNN-translated.json holds Icelandic, batch-NNN-en.json English
+BATCH_DIRS = {'is': BATCH_DIR, 'en': EN_BATCH_DIR}
+TRANSLATED_SUFFIXES = {'is': '-translated.json', 'en': '-en.json'}
+DEFAULT_BUDGET = 3000
+DEFAULT_MAX_KEYS = 150
+
+
+@dataclass
+class KeyGroup:
+    namespace: str
+    entries: list
+    files: set = field(default_factory=set)
+
+    @property
+    def root(self):
+        return self.namespace.split('.', 1)[0]
+
+
+@dataclass
+class Batch:
+    groups: list = field(default_factory=list)
+    size: int = 0
+    count: int = 0
+    tier: str = None  # model tier (see tiers.py) when the pipeline routes by size
+
+    @property
+    def keys(self):
+        return [entry.key for group in self.groups for entry in group.entries]
+
+    @property
+    def files(self):
+        return set().union(*(group.files for group in self.groups)) if self.groups else set()
+
+
+def entry_cost(entry, namespace):
+    """Approximate compact-prompt bytes for one key line"""
+    suffix = entry.key[len(namespace) + 1:] if namespace else entry.key
+    return len(suffix.encode('utf-8')) + 4
+
+
+def group_cost(group):
+    return len(group.namespace.encode('utf-8')) + 3 + sum(entry_cost(e, group.namespace) for e in group.entries)
+
+
+def primary_file(entry):
+    return entry.files[0] if entry.files else ''
+
+
+def _split_group(group, budget, max_keys):
+    """Split an oversized namespace by primary file, then into sequential slices"""
+    by_file = OrderedDict()
+    for entry in group.entries:
+        by_file.setdefault(primary_file(entry), []).append(entry)
+
+    header = group_cost(KeyGroup(group.namespace, []))
+    pieces = []
+    for file_entries in by_file.values():
+        current = KeyGroup(group.namespace, [])
+        cost = header
+        for entry in file_entries:
+            added = entry_cost(entry, group.namespace)
+            if current.entries and (cost + added > budget or len(current.entries) + 1 > max_keys):
+                pieces.append(current)
+                current = KeyGroup(group.namespace, [])
+                cost = header
+            current.entries.append(entry)
+            cost += added
+        if current.entries:
+            pieces.append(current)
+
+    for piece in pieces:
+        piece.files = {f for entry in piece.entries for f in entry.files}
+    return pieces
+
+
+def build_groups(entries, budget=DEFAULT_BUDGET, max_keys=DEFAULT_MAX_KEYS):
+    """Group catalog entries by namespace, splitting groups that exceed the budget"""
+    by_namespace = OrderedDict()
+    for entry in entries:
+        by_namespace.setdefault(namespace_of(entry.key), []).append(entry)
+
+    groups = []
+    for namespace, group_entries in by_namespace.items():
+        group = KeyGroup(namespace, group_entries, {f for e in group_entries for f in e.files})
+        if group_cost(group) > budget or len(group_entries) > max_keys:
+            groups.extend(_split_group(group, budget, max_keys))
+        else:
+            groups.append(group)
+    return groups
+
+
+def _affinity(batch, group):
+    shared_root = any(g.root == group.root for g in batch.groups)
+    return (shared_root, len(batch.files & group.files))
+
+
+def _merge_namespaces(groups):
+    """Rejoin split pieces of a namespace that ended up in the same batch"""
+    merged = OrderedDict()
+    for group in sorted(groups, key=lambda g: g.namespace):
+        if group.namespace in merged:
+            merged[group.namespace].entries.extend(group.entries)
+            merged[group.namespace].files |= group.files
+        else:
+            merged[group.namespace] = KeyGroup(group.namespace, list(group.entries), set(group.files))
+    return list(merged.values())
+
+
+def plan_batches(entries, budget=DEFAULT_BUDGET, max_keys=DEFAULT_MAX_KEYS):
+    """Bin-pack namespace groups into batches (largest first, best-affinity fit)"""
+    groups = build_groups(entries, budget, max_keys)
+    groups.sort(key=lambda g: (-group_cost(g), g.namespace))
+
+    batches = []
+    for group in groups:
+        cost = group_cost(group)
+        fitting = [
+            b for b in batches
+            if b.size + cost <= budget and b.count + len(group.entries) <= max_keys
+        ]
+        if fitting:
+            target = max(fitting, key=lambda b: _affinity(b, group))
+        else:
+            target = Batch()
+            batches.append(target)
+        target.groups.append(group)
+        target.size += cost
+        target.count += len(group.entries)
+
+    for batch in batches:
+        batch.groups = _merge_namespaces(batch.groups)
+        batch.size = sum(group_cost(g) for g in batch.groups)
+    batches.sort(key=lambda b: b.groups[0].namespace)
+    return batches
+
+
+def batch_context(batch):
+    """Namespace -> most common source files, sent once per namespace in the prompt"""
+    context = OrderedDict()
+    for group in batch.groups:
+        counts = Counter(f for entry in group.entries for f in entry.files)
+        context.setdefault(group.namespace, [])
+        for name, _ in counts.most_common(2):
+            if name not in context[group.namespace]:
+                context[group.namespace].append(name)
+    return context
+
+
+def write_batches(batches, batch_dir=BATCH_DIR, budget=DEFAULT_BUDGET, max_keys=DEFAULT_MAX_KEYS):
+    """Write batch-NNN.json files and manifest.json in the create-translation-batches.js layout"""
+    batch_dir = Path(batch_dir)
+    batch_dir.mkdir(parents=True, exist_ok=True)
+
+    for old in batch_dir.glob('batch-[0-9][0-9][0-9].json'):
+        old.unlink()
+
+    manifest_batches = []
+    for num, batch in enumerate(batches, 1):
+        name = f'batch-{str(num).zfill(3)}.json'
+        keys = batch.keys
+        with open(batch_dir / name, 'w', encoding='utf-8') as f:
+            json.dump({
+                'batchNum': num,
+                'keys': keys,
+                'keyCount': len(keys),
+                'context': batch_context(batch),
+            }, f, ensure_ascii=False, indent=2)
+        manifest_batches.append({'batchNum': num, 'keyCount': len(keys), 'file': name})
+
+    manifest = {
+        'timestamp': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+        'planner': 'namespace',
+        'totalBatches': len(batches),
+        'totalKeys': sum(b['keyCount'] for b in manifest_batches),
+        'budget': budget,
+        'maxKeys': max_keys,
+        'batches': manifest_batches,
+    }
+    with open(batch_dir / 'manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def batch_numbers(batch_dir=BATCH_DIR):
+    """Batch numbers listed in manifest.json (falls back to the files on disk)"""
+    batch_dir = Path(batch_dir)
+    manifest_file = batch_dir / 'manifest.json'
+    if manifest_file.exists():
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return [b['batchNum'] for b in json.load(f).get('batches', [])]
+    return sorted(int(p.stem.split('-')[1]) for p in batch_dir.glob('batch-[0-9][0-9][0-9].json'))
+
+
+def load_batch_translations(batch_dir=BATCH_DIR, locale='is'):
+    """Existing `locale` values in the batch files, skipping key-as-value fallbacks; {} for a locale without any"""
+    batch_dir = Path(batch_dir)
+    suffix = TRANSLATED_SUFFIXES.get(locale)
+    if suffix is None:
+        return {}
+    # translation-batches-en has no manifest or batch-NNN.json; its numbers come from the answer files
+    numbers = batch_numbers(batch_dir) or sorted(
+        int(p.name.split('-')[1]) for p in batch_dir.glob(f'batch-[0-9][0-9][0-9]{suffix}'))
+    translations = {}
+    for num in numbers:
+        trans_file = batch_dir / f'batch-{str(num).zfill(3)}{suffix}'
+        if not trans_file.exists():
+            continue
+        with open(trans_file, 'r', encoding='utf-8') as f:
+            for key, value in json.load(f).items():
+                if value and value != key:
+                    translations[key] = value
+    return translations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Plan namespace-aware translation batches')
+    parser.add_argument('--keys', default=str(EXTRACTED_KEYS_FILE), help='path to extracted-keys.json')
+    parser.add_argument('--out', default=str(BATCH_DIR), help='batch output directory')
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET, help='max key payload bytes per batch')
+    parser.add_argument('--max-keys', type=int, default=DEFAULT_MAX_KEYS)
+    parser.add_argument('--dry-run', action='store_true', help='print the plan without writing files')
+    args = parser.parse_args(argv)
+
+    entries = load_extracted_keys(args.keys)
+    batches = plan_batches(entries, args.budget, args.max_keys)
+
+    print(f"📊 Planned {len(entries)} keys into {len(batches)} batches "
+          f"(budget {args.budget} bytes, max {args.max_keys} keys)")
+    for num, batch in enumerate(batches[:10], 1):
+        namespaces = ', '.join(g.namespace for g in batch.groups[:4])
+        more = f' +{len(batch.groups) - 4}' if len(batch.groups) > 4 else ''
+        print(f"  Batch {num}: {len(batch.keys)} keys, {batch.size} bytes [{namespaces}{more}]")
+    if len(batches) > 10:
+        print(f"  ... and {len(batches) - 10} more batches")
+
+    if not args.dry_run:
+        write_batches(batches, args.out, args.budget, args.max_keys)
+        print(f"✅ Batches saved to: {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,355 @@
+"""
+Benchmark suite for the translation pipeline.
+
+Generates synthetic catalogs shaped like extracted-keys.json (namespace mix
+modelled on the real one, adminSettings-heavy, with Icelandic source text),
+runs the full pipeline against the local FakeBackend at several latency
+profiles and records keys/sec, peak RSS, calls per key, per-call setup
+overhead, p99 call latency and emitted bytes. The spawn and pooled profiles
+only simulate setup costs inside FakeBackend; the http-* profiles run the
+real HttpBackend against a local OpenAI-compatible stub server, with and
+without keep-alive, so their overhead is the client's measured connect
+time. Every case runs in its own process so peak RSS is per case. With
+--hedge each case runs through a HedgedBackend with a second, fast stand-in
+next to the profiled one, so stalls (the `stalling` profile) can be compared
+with and without hedging.
+
+Usage:
+    python -m olfong_i18n.bench generate --size 15000 --out synthetic-keys.json
+    python -m olfong_i18n.bench run [--sizes 1500,15000,150000] [--profiles instant,fast]
+        [--concurrency 4] [--hedge] [--baseline benchmarks/baseline.json] [--save-baseline]
+"""
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from .catalog import BACKEND_DIR, KeyUsage
+
+BASELINE_FILE = BACKEND_DIR / 'benchmarks' / 'baseline.json'
+DEFAULT_SIZES = (1500, 15000, 150000)
+DEFAULT_PROFILES = ('instant', 'fast')
+
+# FakeBackend keyword arguments per latency profile (seconds)
+PROFILES = OrderedDict([
+    ('instant', {}),
+    ('fast', {'latency': 0.005, 'jitter': 0.005}),
+    ('slow', {'latency': 0.05, 'jitter': 0.05, 'spawn': 0.02}),
+    ('flaky', {'latency': 0.005, 'jitter': 0.005, 'failure_rate': 0.05}),
+    # Simulated: CLI spawn-per-call vs 4 keep-alive connections with the same startup cost
+    ('spawn', {'latency': 0.005, 'spawn': 0.03}),
+    ('pooled', {'latency': 0.005, 'spawn': 0.03, 'keepalive': 4}),
+    # A backend that hangs on 5% of calls, like a CLI waiting out its timeout
+    ('stalling', {'latency': 0.01, 'jitter': 0.005, 'stall_rate': 0.05, 'stall': 0.5}),
+])
+HEDGE_PROFILE = {'latency': 0.015, 'jitter': 0.005}
+
+# Measured: the real HttpBackend against _stub_server(); the server closes every connection or keeps it alive
+HTTP_PROFILES = OrderedDict([
+    ('http-close', {'latency': 0.005, 'keepalive': False}),
+    ('http-keepalive', {'latency': 0.005, 'keepalive': True}),
+])
+
+# Allowed relative change against the baseline before a case counts as a regression
+THRESHOLDS = {
+    'keysPerSecond': -0.20,
+    'peakRssKb': 0.25,
+    'callsPerKey': 0.05,
+    'emittedBytes': 0.05,
+}
+
+# Share of keys per namespace in the real catalog (remainder goes to generated namespaces)
+NAMESPACE_WEIGHTS = OrderedDict([
+    ('adminSettings', 0.247), ('adminMedia', 0.043), ('adminCategories', 0.035),
+    ('discounts', 0.033), ('adminReports', 0.032), ('common', 0.029), ('admin.banners', 0.027),
+    ('adminTranslations', 0.027), ('productModal', 0.026), ('adminAnalytics', 0.025),
+    ('atvrImport', 0.023), ('productDetailPage', 0.021), ('checkoutPage', 0.020),
+    ('adminPage', 0.019), ('home', 0.019), ('adminMenu', 0.018), ('adminNotifications', 0.018),
+    ('ordersPage', 0.017), ('profilePage', 0.016), ('chat', 0.015), ('navigation', 0.013),
+    ('cartPage', 0.007), ('subcategories', 0.012),
+])
+
+KEY_WORDS = (
+    'add', 'edit', 'delete', 'save', 'cancel', 'title', 'description', 'name', 'price', 'vat',
+    'order', 'product', 'category', 'image', 'banner', 'shipping', 'payment', 'gateway', 'status',
+    'settings', 'help', 'placeholder', 'error', 'success', 'confirm', 'total', 'discount', 'date',
+    'email', 'phone', 'address', 'receipt', 'customer', 'stock', 'volume', 'alcohol', 'country',
+)
+
+IS_WORDS = (
+    'Bæta', 'við', 'Breyta', 'Eyða', 'Vista', 'Hætta', 'Titill', 'Lýsing', 'Nafn', 'Verð', 'VSK',
+    'Pöntun', 'Vara', 'Vöruflokkur', 'Mynd', 'Borði', 'Sending', 'Greiðsla', 'Staða', 'Stillingar',
+    'Hjálp', 'Villa', 'Tókst', 'Staðfesta', 'Samtals', 'Afsláttur', 'Dagsetning', 'Netfang',
+    'Sími', 'Heimilisfang', 'Kvittun', 'Viðskiptavinur', 'Birgðir', 'Rúmmál', 'Áfengi', 'Land',
+    'fyrir', 'ekki', 'þessa', 'síðu', 'öll', 'Ölföng',
+)
+
+
+def _camel(words):
+    return words[0] + ''.join(w.capitalize() for w in words[1:])
+
+
+def _source_file(namespace):
+    root = namespace.split('.', 1)[0]
+    page = root[0].upper() + root[1:]
+    if root.startswith('admin'):
+        return f'pages/admin/{page[5:] or "Dashboard"}.jsx'
+    return f'pages/{page}.jsx'
+
+
+def synthetic_catalog(size, seed=0):
+    """Catalog entries plus {key: Icelandic source text} for `size` unique keys"""
+    rng = random.Random(seed)
+    namespaces = list(NAMESPACE_WEIGHTS)
+    weights = list(NAMESPACE_WEIGHTS.values())
+    tail_weight = max(1.0 - sum(weights), 0.0)
+    tail_count = max(size // 40, 10)
+    namespaces += [f'feature{n}.section{n % 7}' for n in range(tail_count)]
+    weights += [tail_weight / tail_count] * tail_count
+
+    entries = []
+    sources = {}
+    seen = set()
+    for namespace in rng.choices(namespaces, weights, k=size):
+        words = rng.sample(KEY_WORDS, rng.randint(1, 3))
+        key = f'{namespace}.{_camel(words)}'
+        suffix = 2
+        while key in seen:
+            key = f'{namespace}.{_camel(words)}{suffix}'
+            suffix += 1
+        seen.add(key)
+
+        files = [_source_file(namespace)]
+        if rng.random() < 0.2:
+            files.append(f'components/common/Shared{rng.randint(1, 12)}.jsx')
+        entries.append(KeyUsage(key, rng.randint(1, 4), files))
+
+        length = rng.choices((2, 4, 12), (0.6, 0.3, 0.1))[0]
+        sources[key] = ' '.join(rng.choice(IS_WORDS) for _ in range(length))
+
+    entries.sort(key=lambda entry: entry.key)
+    return entries, sources
+
+
+def write_catalog(entries, path):
+    """Write entries in the extracted-keys.json layout"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'totalKeys': len(entries),
+            'keys': [{'key': e.key, 'count': e.count, 'files': e.files} for e in entries],
+        }, f, ensure_ascii=False, indent=2)
+
+
+def peak_rss_kb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def _stub_server(latency=0.0, keepalive=True):
+    """OpenAI-compatible chat completions server on 127.0.0.1 answering like FakeBackend; serves in a thread"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from .backends import FakeBackend
+
+    answerer = FakeBackend()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            time.sleep(latency)
+            body = json.dumps({'choices': [{'message': {'content': answerer.answer(
+                request['messages'][0]['content'])}}]}).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            if not keepalive:
+                self.send_header('Connection', 'close')
+                self.close_connection = True
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_case(size, profile, seed=0, concurrency=1, hedge=False):
+    """Run the whole pipeline once in this process; returns the case metrics"""
+    from .backends import FakeBackend, HedgedBackend, HttpBackend
+    from .pipeline import Pipeline
+
+    entries, sources = synthetic_catalog(size, seed)
+    server = None
+    if profile in HTTP_PROFILES:
+        server = _stub_server(**HTTP_PROFILES[profile])
+        backend = HttpBackend(f'http://127.0.0.1:{server.server_address[1]}/v1/chat/completions',
+                              pool_size=concurrency)
+    else:
+        backend = FakeBackend(seed=seed, **PROFILES[profile])
+    if hedge:
+        backend = HedgedBackend([backend, FakeBackend(seed=seed + 1, name='fake-hedge', **HEDGE_PROFILE)],
+                                hedge_after=0.05, min_samples=10, seed=seed)
+    pipeline = Pipeline(backend, sources=sources, retry_delay=0, concurrency=concurrency)
+
+    start = time.perf_counter()
+    result = pipeline.run(entries)
+    with tempfile.TemporaryDirectory() as out:
+        pipeline.emit(result, out, usage={entry.key: entry for entry in entries})
+        pipeline.close()
+    elapsed = time.perf_counter() - start
+    if hedge or server:
+        backend.close()
+    if server:
+        server.shutdown()
+        server.server_close()
+
+    counters = pipeline.metrics.counters
+    overhead = pipeline.metrics.histogram('spawn_seconds')
+    latency = pipeline.metrics.histogram('llm_latency_seconds')
+    return {
+        'size': size,
+        'profile': profile,
+        'concurrency': concurrency,
+        'hedge': hedge,
+        'seconds': round(elapsed, 4),
+        'keysPerSecond': round(size / elapsed, 1) if elapsed else None,
+        'peakRssKb': peak_rss_kb(),
+        'llmCalls': counters['llm_calls'],
+        'callsPerKey': round(counters['llm_calls'] / size, 5),
+        'overheadMsPerCall': round(overhead['sum'] * 1000 / overhead['count'], 3) if overhead['count'] else 0.0,
+        'p99LatencyMs': round(latency['p99'] * 1000, 3),
+        'hedgedCalls': counters['hedged_calls'],
+        'emittedBytes': counters['emitted_bytes'],
+        'fallback': len(result.fallbacks),
+    }
+
+
+def run_isolated(size, profile, seed=0, concurrency=1, hedge=False):
+    """run_case in a fresh interpreter so peak RSS isn't shared between cases"""
+    proc = subprocess.run(
+        [sys.executable, '-m', 'olfong_i18n.bench', '_case', str(size), profile,
+         '--seed', str(seed), '--concurrency', str(concurrency)] + (['--hedge'] if hedge else []),
+        capture_output=True,
+        text=True,
+        cwd=str(BACKEND_DIR),
+        check=True
+    )
+    return json.loads(proc.stdout)
+
+
+def case_id(case):
+    concurrency = case.get('concurrency', 1)
+    suffix = f'x{concurrency}' if concurrency > 1 else ''
+    suffix += '+hedge' if case.get('hedge') else ''
+    return f"{case['size']}/{case['profile']}{suffix}"
+
+
+def compare(results, baseline, thresholds=THRESHOLDS):
+    """List of regression messages for results that moved past the thresholds"""
+    previous = {case_id(case): case for case in baseline.get('cases', [])}
+    regressions = []
+    for case in results:
+        before = previous.get(case_id(case))
+        if not before:
+            continue
+        for metric, limit in thresholds.items():
+            old, new = before.get(metric), case.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (limit < 0 and change < limit) or (limit > 0 and change > limit):
+                regressions.append(f'{case_id(case)} {metric}: {old} -> {new} ({change * 100:+.1f}%)')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Translation pipeline benchmarks')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    gen = sub.add_parser('generate', help='write a synthetic extracted-keys.json')
+    gen.add_argument('--size', type=int, default=15000)
+    gen.add_argument('--seed', type=int, default=0)
+    gen.add_argument('--out', required=True)
+
+    run = sub.add_parser('run', help='run the benchmark matrix')
+    run.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)))
+    run.add_argument('--profiles', default=','.join(DEFAULT_PROFILES),
+                     help=f"any of {', '.join(list(PROFILES) + list(HTTP_PROFILES))}")
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--concurrency', type=int, default=1, help='batches in flight at once')
+    run.add_argument('--hedge', action='store_true', help='hedge calls to a second fast stand-in backend')
+    run.add_argument('--baseline', default=str(BASELINE_FILE))
+    run.add_argument('--save-baseline', action='store_true', help='store these results as the new baseline')
+    run.add_argument('--json', action='store_true', help='print results as JSON')
+
+    case = sub.add_parser('_case')
+    case.add_argument('size', type=int)
+    case.add_argument('profile', choices=list(PROFILES) + list(HTTP_PROFILES))
+    case.add_argument('--seed', type=int, default=0)
+    case.add_argument('--concurrency', type=int, default=1)
+    case.add_argument('--hedge', action='store_true')
+
+    args = parser.parse_args(argv)
+
+    if args.command == '_case':
+        print(json.dumps(run_case(args.size, args.profile, args.seed, args.concurrency, args.hedge)))
+        return 0
+
+    if args.command == 'generate':
+        entries, _ = synthetic_catalog(args.size, args.seed)
+        write_catalog(entries, args.out)
+        print(f"Wrote {len(entries)} synthetic keys to {args.out}")
+        return 0
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    profiles = [p for p in args.profiles.split(',') if p]
+    results = [
+        run_isolated(size, profile, args.seed, args.concurrency, args.hedge)
+        for size in sizes for profile in profiles
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'case':<24} {'keys/s':>10} {'seconds':>9} {'peak RSS':>10} {'calls/key':>10} "
+              f"{'ms/call':>8} {'p99 ms':>8} {'hedged':>7} {'emitted':>12}")
+        for r in results:
+            print(f"{case_id(r):<24} {r['keysPerSecond']:>10} {r['seconds']:>9} {r['peakRssKb']:>8}kB "
+                  f"{r['callsPerKey']:>10} {r['overheadMsPerCall']:>8} {r['p99LatencyMs']:>8} {r['hedgedCalls']:>7} "
+                  f"{r['emittedBytes']:>12}")
+
+    baseline_file = Path(args.baseline)
+    status = 0
+    if baseline_file.exists() and not args.save_baseline:
+        with open(baseline_file, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f))
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        status = 1 if regressions else 0
+
+    if args.save_baseline:
+        baseline_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_file, 'w', encoding='utf-8') as f:
+            json.dump({'createdAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()), 'cases': results}, f, indent=2)
+        print(f"Baseline saved to {baseline_file}", file=sys.stderr)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Daily request/token budget for LLM calls.
+
+Gemini and Claude CLI quotas are per day ("Requests per day per user per
+tier"). The pipeline estimates each call's cost up front, spends the budget
+in priority order and, once it runs out or the provider answers 429, stops
+and writes a resume plan with the keys that were not attempted, instead of
+letting them degrade to key-as-value fallbacks.
+"""
+
+import json
+import math
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .prompts import estimate_tokens
+
+OUTPUT_TOKENS_PER_KEY = 12
+
+
+@dataclass
+class Cost:
+    requests: int
+    tokens: int
+
+
+def estimate_cost(prompt, key_count):
+    """Prompt tokens plus an allowance for the JSON answer"""
+    return Cost(1, estimate_tokens(prompt) + math.ceil(key_count * OUTPUT_TOKENS_PER_KEY))
+
+
+def _today():
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+class Budget:
+    """Requests/tokens left for today; limits of None mean unlimited"""
+
+    def __init__(self, requests_per_day=None, tokens_per_day=None, state_file=None):
+        self.requests_per_day = requests_per_day
+        self.tokens_per_day = tokens_per_day
+        self.state_file = Path(state_file) if state_file else None
+        self.day = _today()
+        self.requests = 0
+        self.tokens = 0
+        self.exhausted = False
+        self._lock = threading.RLock()
+        self._load()
+
+    def _load(self):
+        if not self.state_file or not self.state_file.exists():
+            return
+        with open(self.state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('date') == self.day:
+            self.requests = state.get('requests', 0)
+            self.tokens = state.get('tokens', 0)
+            self.exhausted = state.get('exhausted', False)
+
+    def save(self):
+        if not self.state_file:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_file.with_name(self.state_file.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({
+                'date': self.day,
+                'requests': self.requests,
+                'tokens': self.tokens,
+                'exhausted': self.exhausted,
+            }, f, indent=2)
+        os.replace(tmp, self.state_file)
+
+    def _roll_over(self):
+        if _today() != self.day:
+            self.day = _today()
+            self.requests = self.tokens = 0
+            self.exhausted = False
+
+    @property
+    def remaining_requests(self):
+        return None if self.requests_per_day is None else max(self.requests_per_day - self.requests, 0)
+
+    @property
+    def remaining_tokens(self):
+        return None if self.tokens_per_day is None else max(self.tokens_per_day - self.tokens, 0)
+
+    def allows(self, cost):
+        with self._lock:
+            self._roll_over()
+            if self.exhausted:
+                return False
+            if self.remaining_requests is not None and cost.requests > self.remaining_requests:
+                return False
+            if self.remaining_tokens is not None and cost.tokens > self.remaining_tokens:
+                return False
+            return True
+
+    def charge(self, cost):
+        with self._lock:
+            self._roll_over()
+            self.requests += cost.requests
+            self.tokens += cost.tokens
+            self.save()
+
+    def exhaust(self):
+        """The provider said the daily quota is gone; nothing more today"""
+        with self._lock:
+            self.exhausted = True
+            self.save()
+
+    def summary(self):
+        return {
+            'date': self.day,
+            'requests': self.requests,
+            'tokens': self.tokens,
+            'requestsPerDay': self.requests_per_day,
+            'tokensPerDay': self.tokens_per_day,
+            'exhausted': self.exhausted,
+        }
+
+
+def write_resume_plan(path, keys, reason, budget=None, locale='is'):
+    """Keys left untranslated by a budget stop, for --resume on the next run"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'createdAt': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+            'reason': reason,
+            'locale': locale,
+            'budget': budget.summary() if budget else None,
+            'keyCount': len(keys),
+            'keys': list(keys),
+        }, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_resume_plan(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,316 @@
+"""
+Pre-nested, minified i18next bundles.
+
+The web client used to download the flat {key, value} list and split every
+dotted key in transformToNestedObject on each cold load. The pipeline now
+does that once: bundles/<locale>.json is the nested resource object, ready
+for i18next.addResourceBundle(locale, 'translation', bundle), written with
+no whitespace and keys sorted so identical content gives identical bytes.
+
+A key that is both a string and a namespace (`orders.statuses` and
+`orders.statuses.pending`) keeps its string under the reserved leaf key "_"
+of the namespace ({"orders": {"statuses": {"_": "Staða", "pending": ...}}});
+flatten() and the clients' flattenBundle() map it back, so nesting is
+lossless. "_" is therefore reserved: a key with a "_" segment fails the
+build.
+
+Each bundle is also written under a content-hashed name, <locale>.<hash>.json,
+and bundles/manifest.json maps locale -> hash, file and size. Clients
+revalidate only the tiny manifest and fetch a bundle when its hash changes;
+hashed files never change, so they can be cached as immutable. Every
+rewritten file loses its .gz/.br siblings (the server would send those
+instead); the pipeline recompresses what it emits (see compress.py).
+
+With intern=True each bundle also gets an interned encoding,
+<locale>.<hash>.interned.json: {"$strings": [...], "$tree": {...}}, where a
+leaf is either a string or an index into $strings. Only repeated values
+that save bytes are interned ("Vista", "Hætta við", ...), so decoded
+bundles share one string per repeated value. The parseBundle() decoders in
+backend/src/utils/translationBundle.js and web/src/utils/translationBundle.js
+also accept plain bundles. Interning is off by default: the raw bundle
+shrinks, but gzip already removes most repetition.
+
+Usage:
+    python -m olfong_i18n.bundles [--from translated-data/translations-for-database.json]
+        [--out translated-data/bundles] [--intern]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+from collections import Counter, OrderedDict
+from pathlib import Path
+
+from .catalog import BACKEND_DIR
+
+BUNDLE_DIR = BACKEND_DIR / 'translated-data' / 'bundles'
+DATABASE_EXPORT = BACKEND_DIR / 'translated-data' / 'translations-for-database.json'
+MANIFEST_NAME = 'manifest.json'
+HASH_LENGTH = 12
+KEEP_VERSIONS = 2  # hashed files kept per locale, so clients holding the previous manifest still resolve
+INTERNED_SUFFIX = '.interned.json'
+STRING_HEADER_BYTES = 16  # approximate per-string overhead of a JS engine heap string
+LEAF_KEY = '_'  # holds the string of a key that is also a namespace
+
+
+def nest(flat):
+    """{dotted key: value} -> (nested dict, [keys that are also namespaces, stored under LEAF_KEY])"""
+    nested = {}
+    conflicts = []
+    # Shorter keys first, so a string is always placed before a namespace at the same path
+    for key in sorted(flat, key=lambda k: (k.count('.'), k)):
+        parts = key.split('.')
+        if LEAF_KEY in parts:
+            raise ValueError(f'{key}: {LEAF_KEY!r} is reserved as a key segment (see bundles.py)')
+        node = nested
+        for depth, part in enumerate(parts[:-1], 1):
+            child = node.get(part)
+            if not isinstance(child, dict):
+                if child is not None:
+                    conflicts.append('.'.join(parts[:depth]))
+                    child = {LEAF_KEY: child}
+                else:
+                    child = {}
+                node[part] = child
+            node = child
+        node[parts[-1]] = flat[key]
+    return nested, conflicts
+
+
+def flatten(nested, prefix='', flat=None):
+    """Nested bundle -> {dotted key: value}, the inverse of nest()"""
+    flat = {} if flat is None else flat
+    for key, value in nested.items():
+        path = prefix if key == LEAF_KEY and prefix else f'{prefix}.{key}' if prefix else key
+        if isinstance(value, dict):
+            flatten(value, path, flat)
+        else:
+            flat[path] = value
+    return flat
+
+
+def encode_bundle(nested):
+    """Minified UTF-8 JSON with sorted keys"""
+    return json.dumps(nested, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def _leaves(nested):
+    for value in nested.values():
+        if isinstance(value, dict):
+            yield from _leaves(value)
+        else:
+            yield value
+
+
+def _json_size(value):
+    return len(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+
+
+def intern_bundle(nested):
+    """{'$strings': [...], '$tree': nested with repeated values replaced by indices}"""
+    counts = Counter(value for value in _leaves(nested) if isinstance(value, str))
+    # Most bytes saved first, so the biggest wins get the shortest indices
+    candidates = sorted((value for value, count in counts.items() if count > 1),
+                        key=lambda value: (-(counts[value] - 1) * _json_size(value), value))
+    strings = []
+    for value in candidates:
+        size = _json_size(value)
+        index_size = len(str(len(strings)))
+        # Table entry (+ comma) plus one index per use must beat repeating the string
+        if size + 1 + counts[value] * index_size < counts[value] * size:
+            strings.append(value)
+    index = {value: i for i, value in enumerate(strings)}
+
+    def walk(node):
+        return {key: walk(value) if isinstance(value, dict) else index.get(value, value)
+                for key, value in node.items()}
+
+    return {'$strings': strings, '$tree': walk(nested)}
+
+
+def decode_interned(data):
+    """Inverse of intern_bundle; plain nested bundles are returned as-is"""
+    if not isinstance(data.get('$strings'), list):
+        return data
+    strings = data['$strings']
+
+    def walk(node):
+        return {key: walk(value) if isinstance(value, dict) else
+                strings[value] if isinstance(value, int) else value
+                for key, value in node.items()}
+
+    return walk(data['$tree'])
+
+
+def _heap_bytes(value):
+    width = 1 if all(ord(c) < 256 for c in value) else 2
+    return STRING_HEADER_BYTES + len(value) * width
+
+
+def intern_stats(nested, interned=None):
+    """Bytes (raw and gzip) and decoded string heap, plain vs interned
+
+    The heap figure assumes one string per leaf for plain bundles; JS engines
+    that dedupe short strings while parsing will see a smaller difference.
+    """
+    interned = interned if interned is not None else intern_bundle(nested)
+    plain_data = encode_bundle(nested)
+    interned_data = encode_bundle(interned)
+    values = [value for value in _leaves(nested) if isinstance(value, str)]
+    plain_heap = sum(_heap_bytes(value) for value in values)
+    # Interned values are allocated once; every other leaf still gets its own string
+    table = set(interned['$strings'])
+    interned_heap = (sum(_heap_bytes(value) for value in table)
+                     + sum(_heap_bytes(value) for value in values if value not in table))
+    stats = {
+        'values': len(values),
+        'unique': len(set(values)),
+        'interned': len(table),
+        'bytes': len(plain_data),
+        'internedBytes': len(interned_data),
+        'gzipBytes': len(gzip.compress(plain_data, 9, mtime=0)),
+        'internedGzipBytes': len(gzip.compress(interned_data, 9, mtime=0)),
+        'heapBytes': plain_heap,
+        'internedHeapBytes': interned_heap,
+    }
+    for name, before, after in (('raw', 'bytes', 'internedBytes'), ('gzip', 'gzipBytes', 'internedGzipBytes'),
+                                ('heap', 'heapBytes', 'internedHeapBytes')):
+        stats[f'{name}SavedPercent'] = (round((stats[before] - stats[after]) * 100 / stats[before], 1)
+                                        if stats[before] else 0.0)
+    return stats
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def discard_compressed(path):
+    """Remove <path>.gz / <path>.br, which the server would otherwise send instead of the new content"""
+    for suffix in ('.gz', '.br'):
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+
+def _write_atomic(path, data):
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(data)
+    tmp.replace(path)
+    discard_compressed(path)  # the pipeline's Compressor writes fresh siblings after emit
+
+
+def _prune_versions(out_dir, locale, keep):
+    versions = sorted(out_dir.glob(f'{locale}.' + '[0-9a-f]' * HASH_LENGTH + '.json'),
+                      key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in versions[keep:]:
+        interned = old.with_name(old.name[:-len('.json')] + INTERNED_SUFFIX)
+        for path in (old, interned):
+            for sibling in (path, path.with_name(path.name + '.gz'), path.with_name(path.name + '.br')):
+                sibling.unlink(missing_ok=True)
+
+
+def write_bundle(flat, locale, out_dir=BUNDLE_DIR, intern=False):
+    """Write <locale>.json and <locale>.<hash>.json, update the manifest; returns a summary dict
+
+    With intern=True the interned encoding is written as well (<locale>.<hash>.interned.json).
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    nested, conflicts = nest(flat)
+    data = encode_bundle(nested)
+    digest = content_hash(data)
+
+    hashed = out_dir / f'{locale}.{digest}.json'
+    if not hashed.exists():
+        _write_atomic(hashed, data)
+    # Touched to mark it current for _prune_versions; its siblings hold the same bytes, so they stay newer
+    for path in (hashed, hashed.with_name(hashed.name + '.gz'), hashed.with_name(hashed.name + '.br')):
+        if path.exists():
+            path.touch()
+    _write_atomic(out_dir / f'{locale}.json', data)
+
+    summary = {
+        'locale': locale,
+        'file': hashed.name,
+        'hash': digest,
+        'keys': len(flat),
+        'bytes': len(data),
+        'conflicts': conflicts,
+    }
+    if intern:
+        # Same content, different encoding: keeps the plain bundle's hash
+        interned = encode_bundle(intern_bundle(nested))
+        interned_file = out_dir / f'{locale}.{digest}{INTERNED_SUFFIX}'
+        _write_atomic(interned_file, interned)
+        _write_atomic(out_dir / f'{locale}{INTERNED_SUFFIX}', interned)
+        summary['interned'] = {'file': interned_file.name, 'bytes': len(interned)}
+    _prune_versions(out_dir, locale, KEEP_VERSIONS)
+    update_manifest(out_dir, summary)
+    return summary
+
+
+def load_manifest(out_dir=BUNDLE_DIR):
+    path = Path(out_dir) / MANIFEST_NAME
+    if not path.exists():
+        return {'version': None, 'locales': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def update_manifest(out_dir, summary):
+    """Set one locale's entry; the manifest version is a hash of all locale hashes"""
+    out_dir = Path(out_dir)
+    manifest = load_manifest(out_dir)
+    locales = manifest.get('locales', {})
+    locales[summary['locale']] = {
+        'hash': summary['hash'],
+        'file': summary['file'],
+        'bytes': summary['bytes'],
+        'keys': summary['keys'],
+    }
+    if summary.get('interned'):
+        locales[summary['locale']]['interned'] = summary['interned']
+    locales = OrderedDict(sorted(locales.items()))
+    version = content_hash(''.join(f"{locale}:{entry['hash']};" for locale, entry in locales.items()).encode())
+    manifest = {'version': version, 'locales': locales}
+    _write_atomic(out_dir / MANIFEST_NAME, json.dumps(manifest, separators=(',', ':')).encode('utf-8'))
+    return manifest
+
+
+def load_rows(path=DATABASE_EXPORT):
+    """{locale: {key: value}} from a [{key, locale, value}] export or a flat {key: value} file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    by_locale = OrderedDict()
+    if isinstance(data, dict):
+        by_locale['is'] = {k: v for k, v in data.items() if isinstance(v, str)}
+        return by_locale
+    for row in data:
+        if isinstance(row.get('value'), str):
+            by_locale.setdefault(row.get('locale', 'is'), {})[row['key']] = row['value']
+    return by_locale
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build nested i18next bundles')
+    parser.add_argument('--from', dest='source', default=str(DATABASE_EXPORT),
+                        help='translations-for-database.json rows or a flat {key: value} file')
+    parser.add_argument('--out', default=str(BUNDLE_DIR), help='bundle output directory')
+    parser.add_argument('--intern', action='store_true', help='also write the interned string-table encoding')
+    args = parser.parse_args(argv)
+
+    for locale, flat in load_rows(args.source).items():
+        summary = write_bundle(flat, locale, args.out, intern=args.intern)
+        print(f"✅ {locale}: {summary['keys']} keys, {summary['bytes']} bytes -> {Path(args.out) / summary['file']}")
+        for key in summary['conflicts']:
+            print(f"  ℹ️  {key} is both a string and a namespace; its string is nested as {key}.{LEAF_KEY}")
+        if args.intern:
+            stats = intern_stats(nest(flat)[0])
+            print(f"  📊 interned {stats['interned']} of {stats['unique']} unique values ({stats['values']} total): "
+                  f"raw {stats['bytes']} -> {stats['internedBytes']} bytes ({-stats['rawSavedPercent']:+.1f}%), "
+                  f"gzip {stats['gzipBytes']} -> {stats['internedGzipBytes']} ({-stats['gzipSavedPercent']:+.1f}%), "
+                  f"string heap ~{stats['heapBytes']} -> {stats['internedHeapBytes']} "
+                  f"({-stats['heapSavedPercent']:+.1f}%)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Loading of the extracted UI key catalog (extracted-keys.json).
+
+BACKEND_DIR is the root every default path hangs off (extracted-keys.json,
+translation-batches/, translated-data/, ...). It is the directory above
+this package unless $OLFONG_I18N_ROOT points somewhere else, e.g. a
+checkout elsewhere or a scratch copy for a benchmark.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+BACKEND_DIR = Path(os.environ.get('OLFONG_I18N_ROOT') or Path(__file__).resolve().parent.parent)
+EXTRACTED_KEYS_FILE = BACKEND_DIR / 'extracted-keys.json'
+
+_VALID_KEY_RE = re.compile(r'^[a-zA-Z0-9._-]+$')
+_NUMERIC_RE = re.compile(r'^\d+$')
+
+
+@dataclass
+class KeyUsage:
+    key: str
+    count: int = 0
+    files: list = field(default_factory=list)
+
+
+def is_valid_key(key):
+    """Same filter as scripts/create-translation-batches.js"""
+    return (
+        '.' in key
+        and bool(_VALID_KEY_RE.match(key))
+        and not _NUMERIC_RE.match(key)
+        and len(key) > 2
+    )
+
+
+def namespace_of(key):
+    """Return the dotted prefix of a key ('' for keys without a dot)"""
+    head, sep, _ = key.rpartition('.')
+    return head if sep else ''
+
+
+def load_extracted_keys(path=EXTRACTED_KEYS_FILE, valid_only=True):
+    """Load extracted-keys.json as a list of KeyUsage, sorted by key"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    entries = []
+    for item in data.get('keys', []):
+        key = item['key']
+        if valid_only and not is_valid_key(key):
+            continue
+        entries.append(KeyUsage(key, item.get('count', 0), list(item.get('files', []))))
+
+    entries.sort(key=lambda entry: entry.key)
+    return entries
@@ -0,0 +1,122 @@
+"""
+Precompressed .gz / .br siblings for emitted translation artifacts.
+
+Every bundle and export is compressed once at maximum level (gzip -9,
+brotli quality 11) so the server can send the stored bytes with zero
+per-request CPU. Compression runs in a process pool next to the rest of
+the pipeline; brotli output is skipped when the `brotli` package isn't
+installed.
+
+Usage:
+    python -m olfong_i18n.compress translated-data/bundles/*.json [--workers 4]
+"""
+
+import argparse
+import gzip
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def _write_atomic(path, data):
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def compress_file(path):
+    """Write <path>.gz and <path>.br (if brotli is available); returns sizes and ratios"""
+    path = Path(path)
+    data = path.read_bytes()
+    # mtime=0 keeps the .gz byte-identical for identical input
+    gz = gzip.compress(data, GZIP_LEVEL, mtime=0)
+    _write_atomic(path.with_name(path.name + '.gz'), gz)
+    result = {'file': str(path), 'bytes': len(data), 'gzip': len(gz), 'brotli': None}
+
+    brotli = _brotli()
+    br_path = path.with_name(path.name + '.br')
+    if brotli is not None:
+        br = brotli.compress(data, quality=BROTLI_QUALITY)
+        _write_atomic(br_path, br)
+        result['brotli'] = len(br)
+    else:
+        br_path.unlink(missing_ok=True)  # never leave a .br from older content behind
+
+    for codec in ('gzip', 'brotli'):
+        if result[codec] is not None and data:
+            result[f'{codec}Ratio'] = round(result[codec] / len(data), 4)
+    return result
+
+
+class Compressor:
+    """Compresses files in a background process pool; results() waits for them"""
+
+    def __init__(self, workers=None):
+        self.workers = workers
+        self._pool = None
+        self._futures = []
+
+    def submit(self, paths):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._futures.extend(self._pool.submit(compress_file, str(path)) for path in paths)
+
+    def results(self):
+        """Wait for every submitted file; list of compress_file results"""
+        results = [future.result() for future in self._futures]
+        self._futures = []
+        return results
+
+    def close(self):
+        results = self.results()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        return results
+
+
+def summarize(results):
+    total = sum(r['bytes'] for r in results)
+    gz = sum(r['gzip'] for r in results)
+    br = [r['brotli'] for r in results if r['brotli'] is not None]
+    return {
+        'files': len(results),
+        'bytes': total,
+        'gzipBytes': gz,
+        'gzipRatio': round(gz / total, 4) if total else None,
+        'brotliBytes': sum(br) if br else None,
+        'brotliRatio': round(sum(br) / total, 4) if br and total else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write .gz/.br siblings for translation artifacts')
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--workers', type=int, help='compression processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    compressor = Compressor(args.workers)
+    compressor.submit(p for p in args.paths if not p.endswith(('.gz', '.br')))
+    results = compressor.close()
+    for r in results:
+        br = f", br {r['brotli']} ({r['brotliRatio'] * 100:.1f}%)" if r['brotli'] is not None else ''
+        print(f"  {r['file']}: {r['bytes']} -> gz {r['gzip']} ({r.get('gzipRatio', 0) * 100:.1f}%){br}")
+    if _brotli() is None:
+        print("⚠️  brotli is not installed; only .gz files were written (pip install brotli)")
+    summary = summarize(results)
+    print(f"✅ {summary['files']} files, {summary['bytes']} -> {summary['gzipBytes']} bytes gzip")
+
+
+if __name__ == '__main__':
+    main()
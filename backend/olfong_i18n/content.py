@@ -0,0 +1,428 @@
+"""
+Streaming translator for database content (categories, products, banners, ...).
+
+prisma/database-export.json carries user-facing content next to the UI
+strings: category and subcategory descriptions, ÁTVR product texts,
+banner titles. A field mapping says which fields to translate:
+
+    {"fields": [{"entity": "products", "source": "description", "target": "descriptionIs", "locale": "is"}]}
+
+(DEFAULT_FIELDS when no --config is given). Records are streamed out of the
+export one at a time (iter_records never holds more than the current record
+and a read buffer), so memory stays flat however large the catalog is. Each
+mapped field is split into sentences (segments.py) and each sentence
+becomes a pseudo key, content.<entity>.<id>.<target>.<n>, with the field
+as its prompt namespace; windows of them go through the same Pipeline as
+the UI keys: cache lookup, namespace batching, backend calls with retries
+and budget, validation. The translated sentences are joined back with the
+original whitespace and line breaks.
+
+The cache is content-cache-<locale>.ndjson, keyed by the prompt template
+version and each sentence (PromptTemplate.tm_key, see templates.py), so an
+edited description only re-sends the sentences that changed, a sentence
+shared by several records is translated once, and a new template version
+starts a fresh cache. --no-segment sends whole fields instead (a
+one-sentence field hashes the same either way). Targets that are already
+filled are skipped unless --overwrite is given.
+
+Output is <out>/content-updates.ndjson, one {"entity", "id", "data"} line
+per record, in export order; scripts/apply-content-updates.js applies it
+with Prisma. The prompts only target Icelandic, so every mapping must use
+locale "is".
+
+Each run records the translated fields, on top of the previous content
+snapshot, as a snapshot of the content-<locale> catalog
+{content.<entity>.<id>.<target>: text} (see snapshots.py); rolling one back
+rewrites content-updates.ndjson with that snapshot's texts.
+
+Usage:
+    python -m olfong_i18n.content [--export prisma/database-export.json] [--config fields.json]
+        [--backend gemini] [--out translated-data] [--window 500] [--overwrite] [--no-segment] [--dry-run]
+        [--snapshots translated-data/snapshots] [--no-snapshot]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+from .backends import create_backend
+from .catalog import BACKEND_DIR, KeyUsage
+from .events import EventLog
+from .metrics import RunMetrics
+from .pipeline import OUTPUT_DIR, Pipeline
+from .prompts import escape_source, unescape_translation
+from .segments import join_segments, segment
+from .templates import COMPACT_TEMPLATE
+
+DATABASE_EXPORT = BACKEND_DIR / 'prisma' / 'database-export.json'
+UPDATES_FILE = 'content-updates.ndjson'
+CACHE_FILE = 'content-cache-{locale}.ndjson'
+SNAPSHOT_LOCALE = 'content-{locale}'
+KEY_PREFIX = 'content'
+DEFAULT_WINDOW = 500
+DEFAULT_MAX_KEYS = 20  # descriptions are long; keep prompts near the UI batch size
+MAX_CONTENT_LENGTH = 5000
+READ_SIZE = 64 * 1024
+LOCALES = ('is',)
+
+DEFAULT_FIELDS = (
+    {'entity': 'categories', 'source': 'description', 'target': 'descriptionIs', 'locale': 'is'},
+    {'entity': 'categories', 'source': 'metaTitle', 'target': 'metaTitleIs', 'locale': 'is'},
+    {'entity': 'categories', 'source': 'metaDescription', 'target': 'metaDescriptionIs', 'locale': 'is'},
+    {'entity': 'subcategories', 'source': 'description', 'target': 'descriptionIs', 'locale': 'is'},
+    {'entity': 'products', 'source': 'description', 'target': 'descriptionIs', 'locale': 'is'},
+    {'entity': 'banners', 'source': 'title', 'target': 'titleIs', 'locale': 'is'},
+    {'entity': 'banners', 'source': 'description', 'target': 'descriptionIs', 'locale': 'is'},
+    {'entity': 'banners', 'source': 'heroSubtitle', 'target': 'heroSubtitleIs', 'locale': 'is'},
+    {'entity': 'banners', 'source': 'heroButtonText', 'target': 'heroButtonTextIs', 'locale': 'is'},
+    {'entity': 'banners', 'source': 'marqueeText', 'target': 'marqueeTextIs', 'locale': 'is'},
+    {'entity': 'shippingOptions', 'source': 'description', 'target': 'descriptionIs', 'locale': 'is'},
+    {'entity': 'vatProfiles', 'source': 'description', 'target': 'descriptionIs', 'locale': 'is'},
+)
+
+
+def load_fields(path=None):
+    """Field mappings from a {"fields": [...]} config file, or DEFAULT_FIELDS"""
+    if path is None:
+        fields = [dict(field) for field in DEFAULT_FIELDS]
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            fields = json.load(f)['fields']
+    for field in fields:
+        missing = {'entity', 'source', 'target'} - set(field)
+        if missing:
+            raise ValueError(f"Field mapping {field} is missing {', '.join(sorted(missing))}")
+        field.setdefault('locale', 'is')
+        if field['locale'] not in LOCALES:
+            raise ValueError(f"Unsupported locale {field['locale']!r} for {field['entity']}.{field['target']}: "
+                             f"prompts only target {', '.join(LOCALES)}")
+    return fields
+
+
+class _Reader:
+    """Buffered text reader that raw_decodes one JSON value at a time"""
+
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        chunk = self.f.read(READ_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character ('' at end of input)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f'Expected {char!r} in export, got {self.peek()!r}')
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_records(path, entities=None):
+    """(entity, record) for each record of the top-level arrays in an export, streamed
+
+    Arrays of entities not in `entities` are skipped element by element, so
+    no array is ever held in memory as a whole.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _Reader(f)
+        reader.expect('{')
+        while reader.peek() != '}':
+            name = reader.value()
+            reader.expect(':')
+            if reader.peek() != '[':
+                reader.value()
+            else:
+                reader.expect('[')
+                while reader.peek() != ']':
+                    record = reader.value()
+                    if (entities is None or name in entities) and isinstance(record, dict):
+                        yield name, record
+                    if reader.peek() == ',':
+                        reader.pos += 1
+                reader.expect(']')
+            if reader.peek() == ',':
+                reader.pos += 1
+        reader.expect('}')
+
+
+def content_key(entity, record_id, target):
+    return f'{KEY_PREFIX}.{entity}.{record_id}.{target}'
+
+
+def parse_content_key(key):
+    """(entity, id, target) from content_key(); numeric ids come back as int"""
+    _, entity, record_id, target = key.split('.', 3)
+    return entity, int(record_id) if record_id.isdigit() else record_id, target
+
+
+def write_updates(translations, out=OUTPUT_DIR):
+    """content-updates.ndjson from a {content key: text} catalog, one line per record; returns its path"""
+    records = OrderedDict()
+    for key, text in translations.items():
+        entity, record_id, target = parse_content_key(key)
+        records.setdefault((entity, record_id), OrderedDict())[target] = text
+    updates_file = Path(out) / UPDATES_FILE
+    updates_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = updates_file.with_name(updates_file.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.writelines(json.dumps({'entity': entity, 'id': record_id, 'data': data}, ensure_ascii=False) + '\n'
+                     for (entity, record_id), data in records.items())
+    os.replace(tmp, updates_file)
+    return updates_file
+
+
+def source_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+class SourceCache:
+    """{template.tm_key(source): translation} for one locale; .get(key) makes it a pipeline lookup layer
+
+    Stored as append-only NDJSON, so saving a window costs only its new
+    entries and an interrupted write loses at most its last line.
+    """
+
+    def __init__(self, path, sources, template=COMPACT_TEMPLATE):
+        self.path = Path(path)
+        self.sources = sources  # the pipeline's {key: escaped source}, filled per window
+        self.template = template  # a new template version starts a fresh memory
+        self.entries = {}
+        self._new = OrderedDict()
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.entries[entry['hash']] = entry['value']
+
+    def get(self, key, default=None):
+        source = self.sources.get(key)
+        if source is None:
+            return default
+        return self.entries.get(self.template.tm_key(source), default)
+
+    def add(self, source, value):
+        digest = self.template.tm_key(source)
+        if self.entries.get(digest) != value:
+            self.entries[digest] = self._new[digest] = value
+
+    def save(self):
+        if not self._new:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps({'hash': digest, 'value': value}, ensure_ascii=False) + '\n'
+                         for digest, value in self._new.items())
+        self._new.clear()
+
+
+def iter_fields(path, fields, overwrite=False):
+    """(KeyUsage, source text, record) per mapped field that needs a translation, in export order"""
+    by_entity = OrderedDict()
+    for field in fields:
+        by_entity.setdefault(field['entity'], []).append(field)
+    for entity, record in iter_records(path, set(by_entity)):
+        record_id = record.get('id')
+        if record_id is None:
+            continue
+        for field in by_entity[entity]:
+            source = record.get(field['source'])
+            if not isinstance(source, str) or not source.strip():
+                continue
+            if not overwrite and isinstance(record.get(field['target']), str) and record[field['target']].strip():
+                continue
+            yield KeyUsage(content_key(entity, record_id, field['target'])), source.strip(), record
+
+
+def field_units(key, source, segmented=True):
+    """([(unit key, escaped sentence)], separators) for one field
+
+    Segmented, each sentence is a unit <key>.<n>, cached and sent on its
+    own; the separators put the translated sentences back together.
+    Otherwise the whole text is the single unit <key>.0.
+    """
+    parts = segment(source) if segmented else [(source, '')]
+    units = [(f'{key}.{index}', escape_source(sentence)) for index, (sentence, _) in enumerate(parts) if sentence]
+    return units, [separator for _, separator in parts]
+
+
+def _windows(items, size):
+    window = []
+    for item in items:
+        window.append(item)
+        if len(window) >= size:
+            yield window
+            window = []
+    if window:
+        yield window
+
+
+def translate_content(pipeline, export=DATABASE_EXPORT, fields=None, out=OUTPUT_DIR, window=DEFAULT_WINDOW,
+                      overwrite=False, segmented=True, snapshots=None):
+    """Stream the export through the pipeline; writes content-updates.ndjson and returns a summary dict
+
+    With a SnapshotStore, the translated fields are recorded on top of the
+    previous content-<locale> head as that catalog's new snapshot.
+    """
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    fields = fields if fields is not None else load_fields()
+    cache = SourceCache(out / CACHE_FILE.format(locale=pipeline.locale), pipeline.sources, pipeline.template)
+    updates_file = out / UPDATES_FILE
+    tmp = updates_file.with_name(updates_file.name + '.tmp')
+    summary = {'fields': 0, 'records': 0, 'fallback': 0, 'deferred': 0,
+               'segments': 0, 'segmentsSent': 0, 'segmentsCached': 0}
+    recorded = OrderedDict()
+
+    with open(tmp, 'w', encoding='utf-8') as updates:
+        for items in _windows(iter_fields(export, fields, overwrite), window):
+            planned = [(entry,) + field_units(entry.key, source, segmented) for entry, source, _ in items]
+            pipeline.sources.clear()
+            # Identical sentences (shared descriptions, boilerplate) are sent once per window
+            first = OrderedDict()
+            for _, units, _ in planned:
+                for key, source in units:
+                    pipeline.sources[key] = source
+                    first.setdefault(source_hash(source), key)
+            result = pipeline.run([KeyUsage(key) for key in first.values()], cache)
+
+            records = OrderedDict()
+            for entry, units, separators in planned:
+                summary['fields'] += 1
+                translated = {}
+                origins = set()
+                for key, source in units:
+                    sent = first[source_hash(source)]
+                    origins.add(result.origins.get(sent))
+                    if sent in result.translations:
+                        translated[key] = result.translations[sent]
+                        summary['segments'] += 1
+                        summary['segmentsSent' if sent == key and result.origins[sent] == 'llm'
+                                else 'segmentsCached'] += 1
+                        cache.add(source, translated[key])
+                if len(translated) < len(units):
+                    summary['deferred' if 'deferred' in origins else 'fallback'] += 1
+                    continue
+                text = join_segments([unescape_translation(translated.get(f'{entry.key}.{index}', ''))
+                                      for index in range(len(separators))], separators)
+                entity, record_id, target = parse_content_key(entry.key)
+                records.setdefault((entity, record_id), OrderedDict())[target] = text
+                if snapshots is not None:
+                    recorded[entry.key] = text
+            for (entity, record_id), data in records.items():
+                updates.write(json.dumps({'entity': entity, 'id': record_id, 'data': data}, ensure_ascii=False)
+                              + '\n')
+            summary['records'] += len(records)
+            cache.save()  # an interrupted run keeps what it already paid for
+            if result.stop_reason:
+                summary['stopReason'] = result.stop_reason
+                break
+    os.replace(tmp, updates_file)
+    summary['file'] = str(updates_file)
+    if snapshots is not None:
+        locale = SNAPSHOT_LOCALE.format(locale=pipeline.locale)
+        head = snapshots.heads().get(locale)
+        catalog = snapshots.load(head) if head else {}
+        catalog.update(recorded)
+        snapshot, _ = snapshots.record(catalog, locale, label='content', run=pipeline.metrics.run_id)
+        summary['snapshot'] = snapshot['id']
+    pipeline.events.emit('content.finished', **summary)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Translate database content fields through the pipeline')
+    parser.add_argument('--export', default=str(DATABASE_EXPORT), help='prisma/database-export.json')
+    parser.add_argument('--config', help='field mapping JSON ({"fields": [{entity, source, target, locale}]})')
+    parser.add_argument('--backend', default='gemini',
+                        help='gemini, claude, http or fake; join with + to hedge across several')
+    parser.add_argument('--out', default=str(OUTPUT_DIR), help='output directory')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, help='fields per pipeline pass')
+    parser.add_argument('--max-keys', type=int, default=DEFAULT_MAX_KEYS, help='fields per backend call')
+    parser.add_argument('--concurrency', type=int, default=1, help='batches in flight at once')
+    parser.add_argument('--overwrite', action='store_true', help='retranslate fields whose target is already set')
+    parser.add_argument('--no-segment', dest='segmented', action='store_false',
+                        help='send whole fields instead of sentences')
+    parser.add_argument('--dry-run', action='store_true', help='list the fields that would be translated')
+    parser.add_argument('--snapshots', help='snapshot store (default: <out>/snapshots; see snapshots.py)')
+    parser.add_argument('--no-snapshot', action='store_true', help='do not record a snapshot of this run')
+    args = parser.parse_args(argv)
+
+    fields = load_fields(args.config)
+    if args.dry_run:
+        count = 0
+        for entry, source, _ in iter_fields(args.export, fields, args.overwrite):
+            count += 1
+            print(f"  {entry.key}: {escape_source(source)[:80]}")
+        print(f"📊 {count} fields need a translation")
+        return 0
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    metrics = RunMetrics()
+    events = EventLog(path=out / 'content-events.ndjson', run_id=metrics.run_id)
+    backend = create_backend(args.backend, pool_size=args.concurrency)
+    pipeline = Pipeline(backend, metrics=metrics, events=events, max_keys=args.max_keys,
+                        concurrency=args.concurrency, compress=False, max_value_length=MAX_CONTENT_LENGTH)
+    snapshots = None
+    if not args.no_snapshot:
+        from .snapshots import SnapshotStore
+
+        snapshots = SnapshotStore(args.snapshots or out / 'snapshots')
+    summary = translate_content(pipeline, args.export, fields, out, args.window, args.overwrite, args.segmented,
+                                snapshots)
+    pipeline.write_reports(out / 'content-report.json')
+    events.close()
+    if hasattr(backend, 'close'):
+        backend.close()
+
+    print(f"✅ {summary['records']} records, {summary['fields']} fields ({summary['fallback']} rejected, "
+          f"{summary['deferred']} deferred): {summary['segments']} segments, {summary['segmentsSent']} sent, "
+          f"{summary['segmentsCached']} from cache -> {summary['file']}", file=sys.stderr)
+    if summary.get('snapshot'):
+        print(f"  snapshot {summary['snapshot']} of {SNAPSHOT_LOCALE.format(locale=pipeline.locale)}; "
+              f"diff or roll back with python -m olfong_i18n.snapshots --dir {snapshots.root} "
+              f"--locale {SNAPSHOT_LOCALE.format(locale=pipeline.locale)}", file=sys.stderr)
+    if summary.get('stopReason'):
+        print(f"Stopped early ({summary['stopReason']}); rerun to continue from the cache", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
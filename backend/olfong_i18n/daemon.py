@@ -0,0 +1,352 @@
+"""
+Long-lived translation daemon for the Node backend.
+
+The admin panel translates one item at a time (TranslationService
+translateItem / generateTranslations), and every item used to be its own
+LLM call. The daemon keeps one backend warm and answers those requests
+over localhost HTTP or a Unix socket:
+
+- Requests arriving within --window seconds of each other are coalesced:
+  their items go through one Pipeline run per target locale and are
+  batched by namespace into as few backend calls as --max-keys allows.
+  An item with a source text is translated from that text; only items
+  sent without one fall back to the rules / key-name lookup layers, which
+  answer from the key alone (home.heroTitle is not "Hero").
+- Identical items (same locale pair, key and source text) already queued or
+  in flight are not sent again; the new request waits on the same flight
+  (single-flight) and gets the same answer.
+- POST /translate streams NDJSON progress events while the request is
+  served, in the {type, message} shape TranslationService forwards to its
+  onProgress callback, plus {type: 'result'} per item and a final
+  {type: 'done'}.
+
+    POST /translate {"sourceLocale": "is", "targetLocale": "en", "items": [{"key": ..., "value": ...}]}
+    GET /health
+
+Usage:
+    python -m olfong_i18n.daemon [--backend gemini] [--port 8765 | --socket /tmp/olfong-i18n.sock]
+        [--window 0.05] [--max-keys 20] [--concurrency 4]
+"""
+
+import argparse
+import json
+import os
+import queue
+import signal
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .backends import create_backend
+from .batching import DEFAULT_MAX_KEYS
+from .catalog import KeyUsage
+from .events import EventLog
+from .metrics import RunMetrics
+from .pipeline import Pipeline
+from .prompts import unescape_translation
+from .templates import COMPACT_TEMPLATES
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_WINDOW = 0.05  # seconds a window stays open for more requests
+MAX_WINDOW_ITEMS = 500  # a window closes early once this many items wait
+MAX_ITEMS = 2000  # per request
+REQUEST_TIMEOUT = 600  # seconds without any event before a request gives up
+LOCALES = tuple(COMPACT_TEMPLATES)
+
+
+class Flight:
+    """One item being translated, shared by every request that asked for it"""
+
+    def __init__(self, source, target, key, value):
+        self.source = source
+        self.target = target
+        self.key = key
+        self.value = value
+        self.result = None
+        self.origin = None
+        self.error = None
+        self.done = threading.Event()
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    @property
+    def ident(self):
+        return (self.source, self.target, self.key, self.value)
+
+    def listen(self, callback):
+        with self._lock:
+            self._listeners.append(callback)
+
+    def notify(self, event):
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            callback((self, event))
+
+    def finish(self, result=None, origin=None, error=None):
+        self.result, self.origin, self.error = result, origin, error
+        self.done.set()
+        if error:
+            self.notify({'type': 'error', 'key': self.key, 'message': error})
+        else:
+            self.notify({'type': 'result', 'key': self.key, 'locale': self.target, 'value': result,
+                         'origin': origin})
+
+
+class Coalescer:
+    """Collects flights into windows and translates each window in one pipeline run per locale pair"""
+
+    def __init__(self, backend, window=DEFAULT_WINDOW, max_keys=DEFAULT_MAX_KEYS, concurrency=1,
+                 metrics=None, events=None):
+        self.backend = backend
+        self.window = window
+        self.metrics = metrics or RunMetrics()
+        self.events = events or EventLog(run_id=self.metrics.run_id)
+        self.stats = {'requests': 0, 'items': 0, 'shared': 0, 'windows': 0, 'translated': 0, 'failed': 0}
+        self._pipelines = {
+            target: Pipeline(backend, metrics=self.metrics, events=self.events, max_keys=max_keys,
+                             concurrency=concurrency, locale=target, compress=False, retry_delay=0.5,
+                             template=template, source_first=True)
+            for target, template in COMPACT_TEMPLATES.items()
+        }
+        self._flights = {}  # ident -> Flight, queued or in flight
+        self._queue = []
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._loop, name='coalescer', daemon=True)
+        self._thread.start()
+
+    def submit(self, source, target, items, listener):
+        """Flights for `items` ({key, value}); joins identical flights instead of queueing them again"""
+        flights = []
+        shared = 0
+        with self._cond:
+            self.stats['requests'] += 1
+            for item in items:
+                flight = Flight(source, target, item['key'], item['value'])
+                existing = self._flights.get(flight.ident)
+                if existing is not None:
+                    flight = existing
+                    shared += 1
+                else:
+                    self._flights[flight.ident] = flight
+                    self._queue.append(flight)
+                flight.listen(listener)
+                flights.append(flight)
+            self.stats['items'] += len(items)
+            self.stats['shared'] += shared
+            self._cond.notify()
+        self.events.emit('daemon.request', source=source, target=target, items=len(items), shared=shared)
+        return flights, shared
+
+    def _take_window(self):
+        with self._cond:
+            while not self._queue and not self._stopped:
+                self._cond.wait()
+            if self._stopped:
+                return []
+            deadline = time.monotonic() + self.window
+            while len(self._queue) < MAX_WINDOW_ITEMS and not self._stopped:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            window, self._queue = self._queue[:MAX_WINDOW_ITEMS], self._queue[MAX_WINDOW_ITEMS:]
+            return window
+
+    def _loop(self):
+        while True:
+            window = self._take_window()
+            if not window:
+                return
+            self.stats['windows'] += 1
+            groups = OrderedDict()
+            for flight in window:
+                groups.setdefault((flight.source, flight.target), []).append(flight)
+            for (source, target), flights in groups.items():
+                try:
+                    self._translate(source, target, flights)
+                except Exception as e:  # a failed window must not take the daemon down
+                    self.events.error(e, source=source, target=target)
+                    for flight in flights:
+                        if not flight.done.is_set():
+                            self._finish(flight, error=f'{type(e).__name__}: {e}')
+
+    def _translate(self, source, target, flights):
+        pipeline = self._pipelines[target]
+        # A key asked for with two different source texts waits for the next window
+        by_key = OrderedDict()
+        for flight in flights:
+            if flight.key in by_key:
+                with self._cond:
+                    self._queue.append(flight)
+                    self._cond.notify()
+            else:
+                by_key[flight.key] = flight
+        message = f'Translating {len(by_key)} items from {source} to {target} in one coalesced run'
+        for flight in by_key.values():
+            flight.notify({'type': 'log', 'message': message})
+
+        pipeline.sources.clear()
+        pipeline.sources.update((key, flight.value) for key, flight in by_key.items() if flight.value != key)
+        result = pipeline.run([KeyUsage(key) for key in by_key])
+        for key, flight in by_key.items():
+            if key in result.translations:
+                self._finish(flight, unescape_translation(result.translations[key]), result.origins.get(key))
+            else:
+                reason = result.stop_reason or 'no usable translation'
+                self._finish(flight, error=f'{result.origins.get(key, "fallback")}: {reason}')
+
+    def _finish(self, flight, result=None, origin=None, error=None):
+        with self._cond:
+            self._flights.pop(flight.ident, None)
+            self.stats['failed' if error else 'translated'] += 1
+        flight.finish(result, origin, error)
+
+    def close(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join()
+        for flight in list(self._flights.values()):
+            flight.finish(error='daemon stopped')
+
+
+class TranslationHandler(BaseHTTPRequestHandler):
+    server_version = 'olfong-i18n-daemon'
+
+    def log_message(self, format, *args):
+        pass  # requests are in the event log
+
+    def _json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != '/health':
+            return self._json(404, {'error': 'not found'})
+        coalescer = self.server.coalescer
+        self._json(200, {'ok': True, 'backend': getattr(coalescer.backend, 'name', ''), 'stats': coalescer.stats,
+                         'inFlight': len(coalescer._flights)})
+
+    def do_POST(self):
+        if self.path != '/translate':
+            return self._json(404, {'error': 'not found'})
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+            source, target = request.get('sourceLocale', 'is'), request['targetLocale']
+            items = [{'key': str(item['key']), 'value': str(item.get('value') or item['key'])}
+                     for item in request.get('items', [])]
+        except (ValueError, KeyError, TypeError) as e:
+            return self._json(400, {'error': f'bad request: {e}'})
+        if target not in LOCALES or source == target or len(items) > MAX_ITEMS:
+            return self._json(400, {'error': f'targetLocale must be one of {", ".join(LOCALES)}, '
+                                             f'differ from sourceLocale, with at most {MAX_ITEMS} items'})
+
+        # NDJSON, one event per line, flushed as it happens; the connection closes after 'done'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        events = queue.Queue()
+        flights, shared = self.server.coalescer.submit(source, target, items, events.put)
+        unique = list({id(flight): flight for flight in flights}.values())
+        self._write({'type': 'log', 'message': f'Queued {len(items)} items ({len(unique)} unique, '
+                                               f'{shared} shared with requests in flight)'})
+        # Every flight notifies each listener once with its result or error (see Coalescer.submit)
+        remaining = {id(flight) for flight in unique}
+        last_log = None
+        while remaining:
+            try:
+                flight, event = events.get(timeout=REQUEST_TIMEOUT)
+            except queue.Empty:
+                self._write({'type': 'error', 'message': f'timed out waiting for {len(remaining)} items'})
+                break
+            if event['type'] == 'log':
+                if event['message'] == last_log:
+                    continue  # one coalesced run announces itself once per request, not once per item
+                last_log = event['message']
+            else:
+                remaining.discard(id(flight))
+            if not self._write(event):
+                return
+        translated = sum(1 for flight in unique if flight.done.is_set() and not flight.error)
+        self._write({'type': 'done', 'translated': translated, 'failed': len(unique) - translated,
+                     'shared': shared})
+
+    def _write(self, event):
+        try:
+            self.wfile.write((json.dumps(event, ensure_ascii=False) + '\n').encode('utf-8'))
+            self.wfile.flush()
+            return True
+        except OSError:
+            return False  # the client went away; its flights still finish for everyone else
+
+
+class UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ('unix', 0)  # BaseHTTPRequestHandler expects a (host, port) client address
+
+
+def serve(coalescer, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None):
+    """Build the HTTP server (not started); TCP on host:port, or a Unix socket when socket_path is given"""
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = UnixHTTPServer(socket_path, TranslationHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), TranslationHandler)
+    server.coalescer = coalescer
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Translation daemon with request coalescing')
+    parser.add_argument('--backend', default=os.environ.get('OLFONG_LLM_BACKEND', 'gemini'),
+                        help='gemini, claude, http or fake; join with + to hedge across several')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--socket', help='listen on this Unix socket instead of TCP')
+    parser.add_argument('--window', type=float, default=DEFAULT_WINDOW, help='coalescing window in seconds')
+    parser.add_argument('--max-keys', type=int, default=DEFAULT_MAX_KEYS, help='keys per backend call')
+    parser.add_argument('--concurrency', type=int, default=4, help='backend calls in flight at once')
+    args = parser.parse_args(argv)
+
+    metrics = RunMetrics()
+    events = EventLog.from_env(run_id=metrics.run_id)
+    backend = create_backend(args.backend, timeout=30, pool_size=args.concurrency)
+    coalescer = Coalescer(backend, args.window, args.max_keys, args.concurrency, metrics, events)
+    server = serve(coalescer, args.host, args.port, args.socket)
+    where = args.socket or f'http://{args.host}:{args.port}'
+    print(f"🌐 Translation daemon ({args.backend}) listening on {where}", file=sys.stderr)
+    # Process managers stop it with SIGTERM; shut down cleanly as on Ctrl-C
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        coalescer.close()
+        if hasattr(backend, 'close'):
+            backend.close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+        print(f"📊 {json.dumps(coalescer.stats)}", file=sys.stderr)
+        events.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
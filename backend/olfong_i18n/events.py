@@ -0,0 +1,200 @@
+"""
+Structured NDJSON event log for the translation scripts, and its analyzer.
+
+Every event is one JSON object per line:
+    {"ts": 1761480000.123, "run": "20251026T131654Z", "event": "chunk.finished", ...}
+
+Event names: run.started, run.finished, chunk.started, chunk.finished,
+key.started, key.finished, cache.hit, cache.miss, backend.call, retry,
+error, budget.stop, batch.processed.
+
+Log files are append-only, so one file usually holds several runs; the
+analyzer times each run on its own (run.started to run.finished, or its
+first to last event when either is missing) and sums those spans, so the
+idle time between runs never dilutes the throughput.
+
+Usage:
+    python -m olfong_i18n.events analyze translated-data/events.ndjson [--top 10]
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+
+EVENT_LOG_ENV = 'OLFONG_I18N_EVENTS'
+
+
+class EventLog:
+    """Appends NDJSON events to a file or stream; with neither it discards them"""
+
+    def __init__(self, path=None, stream=None, run_id=None):
+        self.run_id = run_id or datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8') if path else None
+        self._stream = stream
+
+    @classmethod
+    def from_env(cls, default_stream=None, run_id=None):
+        """Log to $OLFONG_I18N_EVENTS ('-' for stdout), else to default_stream"""
+        target = os.environ.get(EVENT_LOG_ENV)
+        if target == '-':
+            return cls(stream=sys.stdout, run_id=run_id)
+        if target:
+            return cls(path=target, run_id=run_id)
+        return cls(stream=default_stream, run_id=run_id)
+
+    @property
+    def enabled(self):
+        return self._file is not None or self._stream is not None
+
+    def emit(self, event, **fields):
+        if not self.enabled:
+            return
+        record = {'ts': round(time.time(), 6), 'run': self.run_id, 'event': event}
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            for target in (self._file, self._stream):
+                if target is not None:
+                    target.write(line)
+                    target.flush()
+
+    def error(self, exc, **fields):
+        self.emit('error', errorClass=type(exc).__name__, message=str(exc), **fields)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def iter_events(lines):
+    """Parse NDJSON lines, skipping blank and non-JSON lines (CLI chatter)"""
+    for line in lines:
+        line = line.strip()
+        if not line.startswith('{'):
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and 'event' in record:
+            yield record
+
+
+def _run_seconds(span):
+    start = span['started'] if span['started'] is not None else span['first']
+    end = span['finished'] if span['finished'] is not None else span['last']
+    return max(end - start, 0.0) if start is not None and end is not None else 0.0
+
+
+def analyze(lines, top=10):
+    """Throughput, error rates and slowest keys/chunks in one streaming pass"""
+    runs = OrderedDict()  # {run id: {first, last, started, finished, keys}}
+    events = Counter()
+    origins = Counter()
+    errors = Counter()
+    cache_hits = Counter()
+    cache_misses = 0
+    calls = failed_calls = 0
+    call_seconds = 0.0
+    slowest_keys = []
+    slowest_chunks = []
+
+    for record in iter_events(lines):
+        name = record['event']
+        events[name] += 1
+        span = runs.get(record.get('run'))
+        if span is None:
+            span = runs[record.get('run')] = {'first': None, 'last': None, 'started': None, 'finished': None,
+                                              'keys': 0}
+        ts = record.get('ts')
+        if isinstance(ts, (int, float)):
+            span['first'] = ts if span['first'] is None else min(span['first'], ts)
+            span['last'] = ts if span['last'] is None else max(span['last'], ts)
+            if name == 'run.started' and span['started'] is None:
+                span['started'] = ts
+            elif name == 'run.finished':
+                span['finished'] = ts
+
+        if name == 'key.finished':
+            span['keys'] += 1
+            origins[record.get('origin', 'unknown')] += 1
+            latency = record.get('latency')
+            if isinstance(latency, (int, float)):
+                item = (latency, record.get('key', ''))
+                if len(slowest_keys) < top:
+                    heapq.heappush(slowest_keys, item)
+                else:
+                    heapq.heappushpop(slowest_keys, item)
+        elif name == 'chunk.finished':
+            latency = record.get('latency')
+            if isinstance(latency, (int, float)):
+                item = (latency, str(record.get('chunk', '')), record.get('keys', 0))
+                if len(slowest_chunks) < top:
+                    heapq.heappush(slowest_chunks, item)
+                else:
+                    heapq.heappushpop(slowest_chunks, item)
+        elif name == 'backend.call':
+            calls += 1
+            call_seconds += record.get('latency') or 0.0
+            if not record.get('ok', True):
+                failed_calls += 1
+        elif name == 'error':
+            errors[record.get('errorClass', 'unknown')] += 1
+        elif name == 'cache.hit':
+            cache_hits[record.get('layer', 'unknown')] += 1
+        elif name == 'cache.miss':
+            cache_misses += 1
+
+    keys_finished = events['key.finished']
+    per_run = []
+    for run, span in runs.items():
+        seconds = _run_seconds(span)
+        per_run.append({'run': run, 'elapsedSeconds': round(seconds, 3), 'keysFinished': span['keys'],
+                        'keysPerSecond': round(span['keys'] / seconds, 2) if seconds else None})
+    elapsed = sum(_run_seconds(span) for span in runs.values())
+    return {
+        'events': sum(events.values()),
+        'eventCounts': dict(events.most_common()),
+        'runs': per_run,
+        'elapsedSeconds': round(elapsed, 3),
+        'keysFinished': keys_finished,
+        'keysPerSecond': round(keys_finished / elapsed, 2) if elapsed else None,
+        'origins': dict(origins.most_common()),
+        'backendCalls': calls,
+        'backendSecondsMean': round(call_seconds / calls, 3) if calls else None,
+        'callErrorRate': round(failed_calls / calls, 4) if calls else None,
+        'errorsByClass': dict(errors.most_common()),
+        'retries': events['retry'],
+        'cacheHits': dict(cache_hits.most_common()),
+        'cacheMisses': cache_misses,
+        'slowestKeys': [{'key': k, 'latency': l} for l, k in sorted(slowest_keys, reverse=True)],
+        'slowestChunks': [{'chunk': c, 'keys': n, 'latency': l} for l, c, n in sorted(slowest_chunks, reverse=True)],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Translation event log tools')
+    sub = parser.add_subparsers(dest='command', required=True)
+    analyze_cmd = sub.add_parser('analyze', help='summarize an NDJSON event log')
+    analyze_cmd.add_argument('path', help="event log ('-' for stdin)")
+    analyze_cmd.add_argument('--top', type=int, default=10, help='number of slowest keys/chunks')
+    args = parser.parse_args(argv)
+
+    if args.path == '-':
+        summary = analyze(sys.stdin, args.top)
+    else:
+        with open(args.path, 'r', encoding='utf-8', errors='replace') as f:
+            summary = analyze(f, args.top)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+"""
+Draft English UI text from key names, without a backend call.
+
+Most English labels are already spelled out by their key:
+`admin.banners.addFirstBanner` -> "Add first banner",
+`addresses.postalCode` -> "Postal code", `admin.banners.titleEn` ->
+"Title (English)". tokenize() splits the last key segment on camelCase,
+acronym and digit boundaries; draft() turns the words into sentence-case
+text and scores how likely it is to be the real label:
+
+- sentences (`*Help`, `*Description`, `*Message`, see tiers.py) and
+  numbered demo content (`review2Location`) score near zero;
+- page titles (`productsPage.title`) depend on their page, not their name,
+  and headings (`home.features.deliveryTitle`) are copy the key only hints at;
+- enum values (`statusActive`, `providerSendGrid`, `currencyUSD`) are the
+  value alone, often a vendor spelling, so they are left to the backend;
+- abbreviations, vowel-less tokens and very long names lower the score;
+  known acronyms (VAT, PDF, URL) are upper-cased and score normally.
+
+KeyNameDrafts is a read-only mapping that only answers keys scoring at
+least the threshold, so the pipeline uses it as an English lookup layer
+and the rest still goes to the backend. The CLI drafts the English batch
+files (translation-batches-en/batch-NNN-is.json) into batch-NNN-drafts.json,
+which translate-batches-is-to-en.js merges instead of prompting for those
+keys, and reports how many calls that avoids. --check compares the drafts
+with the existing batch-NNN-en.json answers.
+
+Usage:
+    python -m olfong_i18n.keynames [--batch-dir translation-batches-en] [--threshold 0.8]
+        [--write] [--check] [--show 20]
+"""
+
+import argparse
+import json
+import re
+from collections import Counter, OrderedDict
+from pathlib import Path
+
+from .batching import DEFAULT_BUDGET, DEFAULT_MAX_KEYS, EN_BATCH_DIR, plan_batches
+from .catalog import KeyUsage
+from .tiers import LONG_TEXT_SUFFIXES
+
+DRAFTS_SUFFIX = '-drafts.json'
+DEFAULT_THRESHOLD = 0.8
+
+_TOKEN_RE = re.compile(r'[A-Z]+(?=[A-Z][a-z]|\d|\b|_)|[A-Z]?[a-z]+|[A-Z]+|\d+')
+
+ACRONYMS = {
+    'api': 'API', 'csv': 'CSV', 'ean': 'EAN', 'faq': 'FAQ', 'id': 'ID', 'isk': 'ISK', 'pdf': 'PDF',
+    'json': 'JSON', 'pos': 'POS', 'seo': 'SEO', 'sku': 'SKU', 'sms': 'SMS', 'smtp': 'SMTP', 'ssn': 'SSN',
+    'url': 'URL', 'vat': 'VAT',
+}
+ABBREVIATIONS = {
+    'addr': 'address', 'avg': 'average', 'btn': None, 'cfg': 'configuration', 'config': 'configuration', 'desc': 'description',
+    'img': 'image', 'info': 'information', 'max': 'maximum', 'min': 'minimum', 'msg': 'message',
+    'nav': 'navigation', 'num': 'number', 'pct': 'percent', 'prev': 'previous', 'qty': 'quantity',
+    'stats': 'statistics', 'tel': 'phone',
+}
+LANGUAGE_SUFFIXES = {'en': 'English', 'is': 'Icelandic', 'english': 'English', 'icelandic': 'Icelandic'}
+# Trailing words naming the widget rather than its text (`nameLabel` -> "Name")
+ROLE_SUFFIXES = ('button', 'label')
+# Trailing words of headings, whose text is copy rather than the key name (`heroTitle` is not "Hero")
+HEADING_SUFFIXES = ('title', 'heading')
+# Leading words of enum keys (`statusActive`, `currencyUSD`, `dateFormatDDMMYYYY`) whose text is the value alone
+ENUM_PREFIXES = (('status',), ('role',), ('currency',), ('language',), ('date', 'format'))
+# Leading words of vendor keys (`providerSendGrid`), whose value is a brand spelling whatever its length
+VENDOR_PREFIXES = ('provider',)
+# Contractions written without their apostrophe in key names (`dontHaveAccount`)
+CONTRACTIONS = {
+    'cant': "can't", 'couldnt': "couldn't", 'didnt': "didn't", 'doesnt': "doesn't", 'dont': "don't",
+    'hasnt': "hasn't", 'havent': "haven't", 'isnt': "isn't", 'wasnt': "wasn't", 'wont': "won't",
+    'youre': "you're", 'youve': "you've",
+}
+# Trailing words of keys whose text is a placeholder or status sentence, not a label
+SENTENCE_SUFFIXES = ('placeholder', 'error', 'success', 'failed', 'successfully', 'tip', 'appears', 'affects')
+# Segments whose text is the page or section name, not the key name
+CONTEXTUAL_SEGMENTS = ('title', 'subtitle', 'heading', 'header', 'text', 'label', 'name', 'value')
+SHORT_WORDS = {'a', 'an', 'as', 'at', 'by', 'do', 'go', 'if', 'in', 'is', 'it', 'me', 'my', 'no', 'of', 'on',
+               'or', 'to', 'up', 'us', 'vs', 'we'}
+MAX_WORDS = 5
+COUNTED_UNITS = ('days', 'hours', 'minutes', 'months', 'weeks', 'years', 'items')
+
+
+def _upper_tokens(key):
+    """Lower-cased tokens written in capitals inside a camelCase segment (exportJSON -> {'json'})"""
+    tokens = _TOKEN_RE.findall(key.rsplit('.', 1)[-1])
+    if len(tokens) < 2:
+        return set()
+    return {token.lower() for token in tokens if len(token) > 1 and token.isupper()}
+
+
+def tokenize(key):
+    """Words of the last key segment: 'admin.banners.addFirstBanner' -> ['add', 'first', 'banner']"""
+    segment = key.rsplit('.', 1)[-1]
+    return [token.lower() for token in _TOKEN_RE.findall(segment)]
+
+
+def _word(token):
+    return ACRONYMS.get(token, token)
+
+
+def draft(key):
+    """(English draft, confidence 0..1) for one key; draft is None when nothing usable is left"""
+    tokens = tokenize(key)
+    if not tokens:
+        return None, 0.0
+    upper = _upper_tokens(key)
+    confidence = 1.0
+    segment = key.rsplit('.', 1)[-1].lower()
+
+    if segment.endswith(LONG_TEXT_SUFFIXES) and segment not in ('description', 'note', 'subtitle'):
+        confidence *= 0.1
+    if len(tokens) == 1 and tokens[0] in CONTEXTUAL_SEGMENTS:
+        confidence *= 0.5
+    for index, token in enumerate(tokens):
+        # last7Days is a label; review2Location and item3Title are numbered demo content
+        if token.isdigit() and tokens[index + 1:index + 2] not in ([unit] for unit in COUNTED_UNITS):
+            confidence *= 0.2
+
+    for prefix in ENUM_PREFIXES:
+        if len(tokens) == len(prefix) + 1 and tuple(tokens[:len(prefix)]) == prefix:
+            confidence *= 0.3
+    if len(tokens) > 1 and tokens[0] in VENDOR_PREFIXES:
+        confidence *= 0.3
+
+    suffix = None
+    if len(tokens) > 1 and tokens[-1] in LANGUAGE_SUFFIXES:
+        suffix = f' ({LANGUAGE_SUFFIXES[tokens.pop()]})'
+    elif len(tokens) > 1 and tokens[-1] in HEADING_SUFFIXES:
+        confidence *= 0.5  # metaTitleEn is a field label; a bare *Title is a heading
+    if len(tokens) > 1 and tokens[-1] in ROLE_SUFFIXES + ('btn',):
+        tokens.pop()
+        confidence *= 0.9
+    if tokens[-1] in SENTENCE_SUFFIXES:
+        confidence *= 0.3
+    if len(tokens) > 1 and tokens[-1] == 'required':
+        tokens.insert(-1, 'is')  # nameRequired -> "Name is required"
+    if len(tokens) > 1 and tokens[-1] in ('read', 'unread') and tokens[-2] in ('mark', 'marked', 'all'):
+        tokens.insert(-1, 'as')  # markAllRead -> "Mark all as read"
+
+    words = []
+    for token in tokens:
+        if token in ABBREVIATIONS:
+            confidence *= 0.85
+            if ABBREVIATIONS[token] is None:
+                continue
+            token = ABBREVIATIONS[token]
+        elif token in ACRONYMS or token in upper or token.isdigit():
+            pass
+        elif token in CONTRACTIONS:
+            token = CONTRACTIONS[token]
+        elif not re.search('[aeiouy]', token):
+            confidence *= 0.3
+        elif len(token) < 3 and token not in SHORT_WORDS:
+            confidence *= 0.5
+        words.append(token.upper() if token in upper else _word(token))
+    if not words:
+        return None, 0.0
+    if len(words) > MAX_WORDS:
+        confidence *= 0.5
+
+    first = words[0] if words[0].isupper() else words[0].capitalize()
+    text = ' '.join([first] + words[1:]) + (suffix or '')
+    return text, round(confidence, 3)
+
+
+class KeyNameDrafts:
+    """Drafts English for keys scoring at least `threshold`; .get() makes it a pipeline lookup layer"""
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.drafted = 0
+        self.skipped = 0
+
+    def resolve(self, key):
+        text, confidence = draft(key)
+        return text if text is not None and confidence >= self.threshold else None
+
+    def get(self, key, default=None):
+        text = self.resolve(key)
+        if text is None:
+            self.skipped += 1
+            return default
+        self.drafted += 1
+        return text
+
+    def __contains__(self, key):
+        return self.resolve(key) is not None
+
+    def summary(self):
+        return {'drafted': self.drafted, 'skipped': self.skipped, 'threshold': self.threshold}
+
+
+def calls_avoided(entries, drafted, budget=DEFAULT_BUDGET, max_keys=DEFAULT_MAX_KEYS):
+    """(calls for all entries, calls for the entries left after drafting), as plan_batches would pack them"""
+    remaining = [entry for entry in entries if entry.key not in drafted]
+    return len(plan_batches(entries, budget, max_keys)), len(plan_batches(remaining, budget, max_keys))
+
+
+def normalize(text):
+    return re.sub(r'[^\w]+', ' ', text.lower()).strip()
+
+
+def _write_json(path, data):
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    tmp.replace(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Draft English UI text from key names')
+    parser.add_argument('--batch-dir', default=str(EN_BATCH_DIR), help='batch-NNN-is.json files to draft')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='minimum confidence to draft')
+    parser.add_argument('--write', action='store_true', help='write batch-NNN-drafts.json next to each batch')
+    parser.add_argument('--check', action='store_true', help='compare drafts with existing batch-NNN-en.json')
+    parser.add_argument('--show', type=int, default=0, help='low-confidence keys to list')
+    args = parser.parse_args(argv)
+
+    batch_dir = Path(args.batch_dir)
+    drafts = KeyNameDrafts(args.threshold)
+    keys = []
+    batch_calls = 0
+    avoided_batches = 0
+    agree = Counter()
+    low = []
+    for batch_file in sorted(batch_dir.glob('batch-*-is.json')):
+        with open(batch_file, 'r', encoding='utf-8') as f:
+            batch = json.load(f)
+        drafted = OrderedDict()
+        for item in batch:
+            keys.append(item['key'])
+            text = drafts.get(item['key'])
+            if text is not None:
+                drafted[item['key']] = text
+            elif args.show:
+                low.append((draft(item['key'])[1], item['key']))
+        batch_calls += 1
+        if len(drafted) == len(batch):
+            avoided_batches += 1
+        if args.write:
+            _write_json(batch_file.with_name(batch_file.name.replace('-is.json', DRAFTS_SUFFIX)), drafted)
+        answers_file = batch_file.with_name(batch_file.name.replace('-is.json', '-en.json'))
+        if args.check and answers_file.exists():
+            with open(answers_file, 'r', encoding='utf-8') as f:
+                answers = json.load(f)
+            for key, text in drafted.items():
+                if key in answers:
+                    agree['same' if normalize(answers[key]) == normalize(text) else 'different'] += 1
+
+    drafted_keys = {key for key in keys if key in drafts}
+    before, after = calls_avoided([KeyUsage(key) for key in keys], drafted_keys)
+    print(f"📊 {drafts.drafted} of {len(keys)} keys drafted from their names "
+          f"(confidence >= {args.threshold}); {drafts.skipped} left for the backend")
+    print(f"  planned calls: {before} -> {after} ({before - after} avoided); "
+          f"{avoided_batches} of {batch_calls} batch files need no call")
+    if args.check:
+        checked = agree['same'] + agree['different']
+        if checked:
+            print(f"  {agree['same']} of {checked} drafts match the existing English "
+                  f"({agree['same'] * 100 / checked:.0f}%)")
+    for confidence, key in sorted(low, reverse=True)[:args.show]:
+        print(f"  {confidence:.2f}  {key} -> {draft(key)[0]!r}")
+    if args.write:
+        print(f"✅ Drafts saved next to the batches in: {batch_dir}")
+
+
+if __name__ == '__main__':
+    main()
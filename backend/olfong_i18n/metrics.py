@@ -0,0 +1,146 @@
+"""
+Run metrics for the translation pipeline.
+
+Collects wall time per stage, latency histograms, counters and per-layer
+cache hit ratios, and writes them as a JSON run report and a Prometheus
+textfile (for node_exporter's textfile collector).
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROM_PREFIX = 'olfong_i18n'
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _utc_now():
+    return datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def percentile(samples, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not samples:
+        return 0.0
+    rank = max(1, math.ceil(q * len(samples)))
+    return samples[rank - 1]
+
+
+def _write_atomic(path, text):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class RunMetrics:
+    """Accumulates metrics for one pipeline run"""
+
+    def __init__(self, run_id=None):
+        self.run_id = run_id or datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        self.started_at = _utc_now()
+        self._started = time.perf_counter()
+        self.stages = OrderedDict()
+        self.samples = defaultdict(list)
+        self.counters = defaultdict(int)
+        self.cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """Time a pipeline stage; repeated stages accumulate"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            entry['seconds'] += time.perf_counter() - start
+            entry['calls'] += 1
+
+    def observe(self, name, value):
+        with self._lock:
+            self.samples[name].append(value)
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def cache_lookup(self, layer, hit):
+        with self._lock:
+            entry = self.cache.setdefault(layer, {'hits': 0, 'misses': 0})
+            entry['hits' if hit else 'misses'] += 1
+
+    def histogram(self, name):
+        samples = sorted(self.samples.get(name, []))
+        summary = {'count': len(samples), 'sum': round(sum(samples), 6)}
+        for q in QUANTILES:
+            summary[f'p{int(q * 100)}'] = round(percentile(samples, q), 6)
+        summary['max'] = round(samples[-1], 6) if samples else 0.0
+        return summary
+
+    def report(self):
+        cache = OrderedDict()
+        for layer, entry in self.cache.items():
+            total = entry['hits'] + entry['misses']
+            cache[layer] = dict(entry, ratio=round(entry['hits'] / total, 4) if total else 0.0)
+
+        return {
+            'runId': self.run_id,
+            'startedAt': self.started_at,
+            'finishedAt': _utc_now(),
+            'wallSeconds': round(time.perf_counter() - self._started, 6),
+            'stages': {
+                name: {'seconds': round(entry['seconds'], 6), 'calls': entry['calls']}
+                for name, entry in self.stages.items()
+            },
+            'histograms': {name: self.histogram(name) for name in sorted(self.samples)},
+            'counters': dict(sorted(self.counters.items())),
+            'cache': cache,
+        }
+
+    def write_report(self, path):
+        _write_atomic(path, json.dumps(self.report(), indent=2) + '\n')
+
+    def prometheus(self):
+        report = self.report()
+        lines = [
+            f'# HELP {PROM_PREFIX}_run_seconds Wall time of the whole run',
+            f'# TYPE {PROM_PREFIX}_run_seconds gauge',
+            f'{PROM_PREFIX}_run_seconds {report["wallSeconds"]}',
+            f'# HELP {PROM_PREFIX}_stage_seconds Wall time per pipeline stage',
+            f'# TYPE {PROM_PREFIX}_stage_seconds gauge',
+        ]
+        for name, entry in report['stages'].items():
+            lines.append(f'{PROM_PREFIX}_stage_seconds{{stage="{name}"}} {entry["seconds"]}')
+
+        for name, summary in report['histograms'].items():
+            metric = f'{PROM_PREFIX}_{name}'
+            lines.append(f'# TYPE {metric} summary')
+            for q in QUANTILES:
+                lines.append(f'{metric}{{quantile="{q}"}} {summary[f"p{int(q * 100)}"]}')
+            lines.append(f'{metric}_sum {summary["sum"]}')
+            lines.append(f'{metric}_count {summary["count"]}')
+
+        for name, value in report['counters'].items():
+            metric = f'{PROM_PREFIX}_{name}_total'
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric} {value}')
+
+        if report['cache']:
+            lines.append(f'# HELP {PROM_PREFIX}_cache_hit_ratio Lookup hit ratio per cache layer')
+            lines.append(f'# TYPE {PROM_PREFIX}_cache_hit_ratio gauge')
+            for layer, entry in report['cache'].items():
+                lines.append(f'{PROM_PREFIX}_cache_hit_ratio{{layer="{layer}"}} {entry["ratio"]}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        _write_atomic(path, self.prometheus())
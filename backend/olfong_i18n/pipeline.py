@@ -0,0 +1,613 @@
+"""
+Translation pipeline: load -> dedupe -> lookup -> llm -> validate -> emit.
+
+Every stage is timed in a RunMetrics, which also records LLM latency and
+spawn overhead, bytes sent and received, cache hits per lookup layer,
+retries and 429 responses. The run ends with a JSON report and a
+Prometheus textfile next to the emitted translations, and every event
+(chunk/key started and finished, cache hits, backend calls, retries,
+errors) is appended to an NDJSON event log (see events.py).
+
+Calls are charged against a daily Budget (see budget.py), spent in
+customer-impact order (see priority.py); when it runs out the remaining
+batches are deferred to resume-plan.json. With concurrency > 1
+up to that many batches are in flight at once over the backend's worker
+pool; budget is reserved when a batch is submitted, so accounting stays exact.
+With --tiers short labels and long texts are batched separately and sent to
+a fast and a strong model (see tiers.py), with calls, tokens and keys/sec
+reported per tier. --locale picks the target language: its compact prompt
+template, and the existing answers in its own batch directory
+(translation-batches for 'is', translation-batches-en for 'en'). For 'en',
+keys whose label is spelled out by the key name are drafted offline (see
+keynames.py) and never reach the backend.
+Every emitted catalog is recorded as a content-addressed snapshot (see
+snapshots.py) that can be diffed against or rolled back to.
+
+Usage:
+    python -m olfong_i18n.pipeline [--backend gemini|claude|http|fake|gemini+claude] [--locale is|en]
+        [--out translated-data]
+        [--requests-per-day N] [--tokens-per-day N] [--resume translated-data/resume-plan.json]
+        [--concurrency 4] [--intern] [--tiers] [--snapshots translated-data/snapshots] [--no-snapshot]
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .backends import BackendError, QuotaExceeded, create_backend
+from .budget import Budget, estimate_cost, load_resume_plan, write_resume_plan
+from .batching import (BATCH_DIR, BATCH_DIRS, DEFAULT_BUDGET, DEFAULT_MAX_KEYS, batch_context,
+                       load_batch_translations, plan_batches)
+from .events import EventLog
+from .catalog import BACKEND_DIR, EXTRACTED_KEYS_FILE, KeyUsage, load_extracted_keys
+from .metrics import RunMetrics
+from .priority import batch_score, split_by_surface
+from .keynames import KeyNameDrafts, calls_avoided
+from .prompts import decode_response, encode_compact
+from .rules import RulesEngine
+from .templates import COMPACT_TEMPLATE, COMPACT_TEMPLATES
+from .tiers import HISTORY_FILE, TIERS, TierPolicy, create_tier_backends, load_history, update_history
+
+OUTPUT_DIR = BACKEND_DIR / 'translated-data'
+MAX_VALUE_LENGTH = 500
+# Lookup layers that answer from the key name alone
+KEY_LAYERS = ('rules', 'keynames')
+
+
+@dataclass
+class RunResult:
+    translations: dict = field(default_factory=OrderedDict)
+    origins: dict = field(default_factory=dict)  # key -> lookup layer, 'llm', 'fallback' or 'deferred'
+    stop_reason: str = None
+
+    @property
+    def fallbacks(self):
+        return [key for key, origin in self.origins.items() if origin == 'fallback']
+
+    @property
+    def deferred(self):
+        return [key for key, origin in self.origins.items() if origin == 'deferred']
+
+
+def validate_translation(key, value, max_length=MAX_VALUE_LENGTH):
+    """Return the cleaned value, or None when it can't be used as a translation"""
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if not value or value == key or '\n' in value or len(value) > max_length:
+        return None
+    if value.startswith('{') or value.startswith('```'):
+        return None
+    return value
+
+
+class Pipeline:
+    """One translation run against a backend"""
+
+    def __init__(self, backend, metrics=None, static=None, batch_budget=DEFAULT_BUDGET,
+                 max_keys=DEFAULT_MAX_KEYS, retries=2, retry_delay=1.0, locale='is', budget=None,
+                 events=None, sources=None, concurrency=1, compress=True, intern=False, tiers=None,
+                 policy=None, max_value_length=MAX_VALUE_LENGTH, template=None, snapshots=None,
+                 source_first=False):
+        self.backend = backend
+        self.tiers = tiers  # {tier: backend}; None sends everything to `backend`
+        self.policy = policy or (TierPolicy() if tiers else None)
+        self.metrics = metrics or RunMetrics()
+        self.events = events or EventLog(run_id=self.metrics.run_id)
+        self.budget = budget or Budget()
+        self.static = static or {}
+        self.sources = sources or {}
+        self.batch_budget = batch_budget
+        self.max_keys = max_keys
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.locale = locale
+        self.rules = RulesEngine(locale)
+        # English labels are mostly spelled out by their key names (see keynames.py)
+        self.keynames = KeyNameDrafts() if locale == 'en' else None
+        self.concurrency = max(1, concurrency)
+        self.compressor = None
+        if compress:
+            from .compress import Compressor  # process pool machinery; content runs don't need it
+
+            self.compressor = Compressor()
+        self.intern = intern
+        self.max_value_length = max_value_length  # content descriptions (see content.py) run longer than labels
+        self.template = template or COMPACT_TEMPLATES.get(locale, COMPACT_TEMPLATE)  # see templates.py
+        self.snapshots = snapshots  # SnapshotStore recording every emitted catalog (see snapshots.py)
+        self.source_first = source_first  # keys with a source text skip the KEY_LAYERS and are translated from it
+        self._key_latency = {}
+        self._key_tier = {}
+
+    def load(self, keys_file=EXTRACTED_KEYS_FILE, batch_dir=None):
+        """(entries, existing); existing holds only this locale's answers, from its batch directory by default"""
+        batch_dir = Path(batch_dir or BATCH_DIRS.get(self.locale, BATCH_DIR))
+        with self.metrics.stage('load'):
+            entries = load_extracted_keys(keys_file)
+            existing = load_batch_translations(batch_dir, self.locale) if batch_dir.exists() else {}
+        self.metrics.incr('keys_loaded', len(entries))
+        return entries, existing
+
+    def dedupe(self, entries):
+        with self.metrics.stage('dedupe'):
+            unique = OrderedDict()
+            for entry in entries:
+                if entry.key in unique:
+                    merged = unique[entry.key]
+                    merged.count += entry.count
+                    merged.files.extend(f for f in entry.files if f not in merged.files)
+                else:
+                    unique[entry.key] = KeyUsage(entry.key, entry.count, list(entry.files))
+        self.metrics.incr('keys_duplicate', len(entries) - len(unique))
+        return list(unique.values())
+
+    def lookup_layers(self, existing):
+        """Ordered (name, mapping) cache layers consulted before any backend call"""
+        layers = [('rules', self.rules), ('existing', existing), ('static', self.static)]
+        if self.keynames is not None:
+            layers.append(('keynames', self.keynames))
+        return layers
+
+    def lookup(self, entries, existing):
+        resolved = OrderedDict()
+        origins = {}
+        pending = []
+        self.rules.resolved.clear()
+        with self.metrics.stage('lookup'):
+            layers = self.lookup_layers(existing)
+            for entry in entries:
+                from_source = self.source_first and self.sources.get(entry.key)
+                for name, layer in layers:
+                    if from_source and name in KEY_LAYERS:
+                        continue
+                    value = layer.get(entry.key)
+                    self.metrics.cache_lookup(name, value is not None)
+                    if value is not None:
+                        resolved[entry.key] = value
+                        origins[entry.key] = name
+                        self.events.emit('cache.hit', key=entry.key, layer=name)
+                        break
+                else:
+                    self.events.emit('cache.miss', key=entry.key)
+                    pending.append(entry)
+        for rule, count in self.rules.summary().items():
+            self.metrics.incr(f'rules_{rule}', count)
+        if self.rules.resolved:
+            self.events.emit('rules.resolved', keys=sum(self.rules.resolved.values()), **self.rules.summary())
+        drafted = {key for key, origin in origins.items() if origin == 'keynames'}
+        if drafted:
+            before, after = calls_avoided(entries, drafted, self.batch_budget, self.max_keys)
+            self.metrics.incr('keynames_drafted', len(drafted))
+            self.metrics.incr('keynames_calls_avoided', before - after)
+            self.events.emit('keynames.drafted', keys=len(drafted), callsAvoided=before - after)
+        return resolved, origins, pending
+
+    def call(self, prompt, cost, chunk=None, reserved=False, backend=None):
+        """One backend call with retries; None when the backend or budget gave up
+
+        reserved=True means the first attempt was already charged by the caller.
+        """
+        backend = backend or self.backend
+        bytes_out = len(prompt.encode('utf-8'))
+        for attempt in range(self.retries + 1):
+            if attempt:
+                if not self.budget.allows(cost):
+                    return None
+                self.metrics.incr('retries')
+                self.events.emit('retry', chunk=chunk, attempt=attempt)
+                time.sleep(self.retry_delay * attempt)
+            if attempt or not reserved:
+                self.charge(cost)
+            self.metrics.incr('llm_calls')
+            self.metrics.incr('bytes_out', bytes_out)
+            start = time.perf_counter()
+            try:
+                completion = backend.complete(prompt)
+            except QuotaExceeded as e:
+                self.metrics.incr('rate_limited')
+                self.budget.exhaust()
+                self._failed_call(backend, e, chunk, attempt, start, bytes_out)
+                return None
+            except BackendError as e:
+                self.metrics.incr('llm_errors')
+                self._failed_call(backend, e, chunk, attempt, start, bytes_out)
+                continue
+            bytes_in = len(completion.text.encode('utf-8'))
+            if completion.hedged:
+                self.metrics.incr('hedged_calls')
+            self.metrics.observe('llm_latency_seconds', completion.latency)
+            self.metrics.observe('spawn_seconds', completion.spawn)
+            self.metrics.incr('bytes_in', bytes_in)
+            self.events.emit('backend.call', chunk=chunk, backend=completion.backend, attempt=attempt, ok=True,
+                             latency=round(completion.latency, 6), spawn=round(completion.spawn, 6),
+                             bytesOut=bytes_out, bytesIn=bytes_in)
+            return completion
+        return None
+
+    def _failed_call(self, backend, exc, chunk, attempt, start, bytes_out):
+        self.events.emit('backend.call', chunk=chunk, backend=getattr(backend, 'name', ''), attempt=attempt,
+                         ok=False, latency=round(time.perf_counter() - start, 6), bytesOut=bytes_out, bytesIn=0)
+        self.events.error(exc, chunk=chunk, attempt=attempt)
+
+    def plan(self, pending):
+        """Batches in the order the budget should be spent on them
+
+        Each surface (checkout, storefront, common, admin, junk) is planned on
+        its own so customer-facing keys never wait behind admin ones, and the
+        batches of a surface go out most-visible first. With tiers, short and
+        long texts of a surface are batched apart so each batch has one tier.
+        """
+        batches = []
+        for _, entries in split_by_surface(pending):
+            if self.policy:
+                planned = []
+                for tier, tier_entries in self.policy.split(entries, self.sources):
+                    for batch in plan_batches(tier_entries, self.batch_budget, self.max_keys):
+                        batch.tier = tier
+                        planned.append(batch)
+            else:
+                planned = plan_batches(entries, self.batch_budget, self.max_keys)
+            batches.extend(sorted(planned, key=batch_score, reverse=True))
+        return batches
+
+    def charge(self, cost):
+        self.budget.charge(cost)
+        self.metrics.incr('budget_tokens', cost.tokens)
+
+    def translate(self, pending, result):
+        """Send planned batches to the backend until the budget runs out; raw {key: text} answers"""
+        raw = {}
+        with self.metrics.stage('llm'):
+            batches = self.plan(pending)
+            inflight = deque()
+            unfinished = []  # batches whose call failed because the budget ran out
+            stopped_at = len(batches)
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                for index, batch in enumerate(batches):
+                    while inflight and (len(inflight) >= self.concurrency or unfinished):
+                        self._collect(inflight.popleft(), raw, unfinished)
+                    prompt = encode_compact(batch.keys, self.sources, batch_context(batch), self.template)
+                    cost = estimate_cost(prompt.text, len(batch.keys))
+                    if not unfinished and not self.budget.allows(cost):
+                        while inflight:
+                            self._collect(inflight.popleft(), raw, unfinished)
+                    if unfinished or not self.budget.allows(cost):
+                        stopped_at = index
+                        break
+                    self.charge(cost)
+                    future = pool.submit(self._send, index + 1, batch, prompt, cost)
+                    inflight.append((index, future, cost))
+                while inflight:
+                    self._collect(inflight.popleft(), raw, unfinished)
+
+            remaining = [batches[i] for i in unfinished] + batches[stopped_at:]
+            if remaining:
+                result.stop_reason = 'quota exceeded' if self.budget.exhausted else 'daily budget spent'
+                self.defer(remaining, result)
+        return raw
+
+    def send_batch(self, batch, chunk=None):
+        """Prompt, charge and send one planned batch outside translate() (see workqueue.py); (answers, ok)"""
+        prompt = encode_compact(batch.keys, self.sources, batch_context(batch), self.template)
+        cost = estimate_cost(prompt.text, len(batch.keys))
+        if not self.budget.allows(cost):
+            return {}, False
+        self.charge(cost)
+        return self._send(chunk, batch, prompt, cost)
+
+    def _send(self, chunk, batch, prompt, cost):
+        """Call the backend for one batch; (answers, ok)"""
+        self.events.emit('chunk.started', chunk=chunk, keys=len(batch.keys),
+                         namespaces=[g.namespace for g in batch.groups])
+        for key in batch.keys:
+            self.events.emit('key.started', key=key, chunk=chunk)
+        start = time.perf_counter()
+        backend = self.tiers[batch.tier] if batch.tier else None
+        completion = self.call(prompt.text, cost, chunk, reserved=True, backend=backend)
+        answers = decode_response(completion.text, prompt.ids) if completion is not None else {}
+        latency = time.perf_counter() - start
+        for key in batch.keys:
+            self._key_latency[key] = latency
+        if batch.tier:
+            for key in batch.keys:
+                self._key_tier[key] = batch.tier
+            self.metrics.incr(f'tier_{batch.tier}_calls')
+            self.metrics.incr(f'tier_{batch.tier}_keys', len(batch.keys))
+            self.metrics.incr(f'tier_{batch.tier}_tokens', cost.tokens)
+            self.metrics.observe(f'tier_{batch.tier}_seconds', latency)
+        self.events.emit('chunk.finished', chunk=chunk, keys=len(batch.keys),
+                         answered=len(answers), latency=round(latency, 6), ok=completion is not None)
+        return answers, completion is not None
+
+    def _collect(self, item, raw, unfinished):
+        index, future, cost = item
+        answers, ok = future.result()
+        raw.update(answers)
+        if not ok and not self.budget.allows(cost):
+            unfinished.append(index)
+
+    def defer(self, batches, result):
+        deferred = 0
+        for batch in batches:
+            for key in batch.keys:
+                result.origins[key] = 'deferred'
+                deferred += 1
+        self.metrics.incr('keys_deferred', deferred)
+        self.events.emit('budget.stop', reason=result.stop_reason, deferred=deferred, budget=self.budget.summary())
+
+    def validate(self, pending, raw, result):
+        with self.metrics.stage('validate'):
+            for entry in pending:
+                if result.origins.get(entry.key) == 'deferred':
+                    continue
+                value = validate_translation(entry.key, raw.get(entry.key), self.max_value_length)
+                tier = self._key_tier.get(entry.key)
+                if value is None:
+                    if entry.key in raw:
+                        self.metrics.incr('validation_rejected')
+                        if tier:
+                            self.metrics.incr(f'tier_{tier}_rejected')
+                    result.origins[entry.key] = 'fallback'
+                else:
+                    result.translations[entry.key] = value
+                    result.origins[entry.key] = 'llm'
+                    if tier:
+                        self.metrics.incr(f'tier_{tier}_translated')
+                self.events.emit('key.finished', key=entry.key, origin=result.origins[entry.key],
+                                 latency=round(self._key_latency.get(entry.key, 0.0), 6))
+        self.metrics.incr('keys_translated', sum(1 for o in result.origins.values() if o == 'llm'))
+        self.metrics.incr('keys_fallback', len(result.fallbacks))
+
+    def run(self, entries, existing=None):
+        self.events.emit('run.started', keys=len(entries), backend=getattr(self.backend, 'name', ''),
+                         locale=self.locale, template=self.template.tag)
+        start = time.perf_counter()
+        self._key_latency = {}
+        entries = self.dedupe(entries)
+        resolved, origins, pending = self.lookup(entries, existing or {})
+        result = RunResult(resolved, origins)
+        for key, origin in origins.items():
+            self.events.emit('key.finished', key=key, origin=origin, latency=0.0)
+        raw = self.translate(pending, result) if pending else {}
+        self.validate(pending, raw, result)
+        self.events.emit('run.finished', keys=len(result.origins), translated=len(result.translations),
+                         fallback=len(result.fallbacks), deferred=len(result.deferred),
+                         stopReason=result.stop_reason, seconds=round(time.perf_counter() - start, 6))
+        return result
+
+    def emit(self, result, output_dir=OUTPUT_DIR, merge=False, usage=None):
+        """Write all-translations-<locale>.json, translations-for-database.json and bundles/<locale>.json
+
+        With merge=True the previous all-translations file is kept and updated,
+        so a resumed run adds to what the interrupted run already emitted.
+        Per-area bundles (see areas.py) are split by `usage` ({key: KeyUsage});
+        keys without usage are placed by namespace alone.
+        """
+        from .areas import write_area_bundles
+        from .bundles import INTERNED_SUFFIX, discard_compressed, write_bundle
+
+        output_dir = Path(output_dir)
+        flat_file = output_dir / f'all-translations-{self.locale}.json'
+        with self.metrics.stage('emit'):
+            output_dir.mkdir(parents=True, exist_ok=True)
+            translations = {}
+            if merge and flat_file.exists():
+                with open(flat_file, 'r', encoding='utf-8') as f:
+                    translations.update(json.load(f))
+            translations.update(result.translations)
+            flat = OrderedDict(sorted(translations.items()))
+            rows = [{'key': key, 'locale': self.locale, 'value': value} for key, value in flat.items()]
+
+            written = 0
+            for path, payload in ((flat_file, flat), (output_dir / 'translations-for-database.json', rows)):
+                text = json.dumps(payload, ensure_ascii=False, indent=2)
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                discard_compressed(path)
+                written += len(text.encode('utf-8'))
+
+            bundle_dir = output_dir / 'bundles'
+            bundle = write_bundle(flat, self.locale, bundle_dir, intern=self.intern)
+            areas = write_area_bundles(flat, self.locale, usage or {}, bundle_dir, intern=self.intern)
+            written += bundle['bytes'] + sum(area['bytes'] for area in areas.values())
+            # The unhashed <locale>.json aliases are served too, so they get .gz/.br siblings as well
+            artifacts = [bundle_dir / f'{self.locale}.json', bundle_dir / bundle['file']]
+            for name, area in areas.items():
+                artifacts += [bundle_dir / name / f'{self.locale}.json', bundle_dir / name / area['file']]
+            if self.intern:
+                written += bundle['interned']['bytes'] + sum(a['interned']['bytes'] for a in areas.values())
+                artifacts += [bundle_dir / f'{self.locale}{INTERNED_SUFFIX}', bundle_dir / bundle['interned']['file']]
+                for name, area in areas.items():
+                    artifacts += [bundle_dir / name / f'{self.locale}{INTERNED_SUFFIX}',
+                                  bundle_dir / name / area['interned']['file']]
+
+            if self.compressor is not None:
+                # .gz/.br siblings are built in a process pool while the run finishes; see close()
+                self.compressor.submit([flat_file, output_dir / 'translations-for-database.json'] + artifacts)
+        self.metrics.incr('emitted_bytes', written)
+        self.metrics.incr('bundle_bytes', bundle['bytes'])
+        if self.intern:
+            self.metrics.incr('interned_bundle_bytes', bundle['interned']['bytes'])
+        self.events.emit('bundle.written', locale=self.locale, file=bundle['file'], hash=bundle['hash'],
+                         keys=bundle['keys'], bytes=bundle['bytes'], conflicts=len(bundle['conflicts']),
+                         internedBytes=bundle.get('interned', {}).get('bytes'))
+        for name, area in areas.items():
+            self.events.emit('bundle.written', locale=self.locale, area=name, file=f"{name}/{area['file']}",
+                             hash=area['hash'], keys=area['keys'], bytes=area['bytes'],
+                             conflicts=len(area['conflicts']))
+        if self.snapshots is not None:
+            with self.metrics.stage('snapshot'):
+                snapshot, stored = self.snapshots.record(flat, self.locale, label='run', run=self.metrics.run_id)
+            self.metrics.incr('snapshot_bytes', stored['bytes'])
+            self.events.emit('snapshot.recorded', locale=self.locale, id=snapshot['id'], root=snapshot['root'],
+                             keys=snapshot['keys'], values=stored['values'], objects=stored['objects'],
+                             bytes=stored['bytes'], unchanged=stored['unchanged'])
+        return output_dir
+
+    def close(self):
+        """Wait for background compression and record its ratios"""
+        if self.compressor is None:
+            return None
+        with self.metrics.stage('compress'):
+            results = self.compressor.close()
+        if not results:
+            return None
+        from .compress import summarize
+
+        summary = summarize(results)
+        self.metrics.incr('compressed_files', summary['files'])
+        self.metrics.incr('compressed_source_bytes', summary['bytes'])
+        self.metrics.incr('gzip_bytes', summary['gzipBytes'])
+        if summary['brotliBytes'] is not None:
+            self.metrics.incr('brotli_bytes', summary['brotliBytes'])
+        self.events.emit('artifacts.compressed', **summary)
+        return summary
+
+    def tier_summary(self):
+        """Calls, keys, tokens and throughput per tier; {} when not tiering"""
+        if not self.tiers:
+            return {}
+        counters = self.metrics.counters
+        budget_tokens = counters['budget_tokens']
+        summary = OrderedDict()
+        for tier in TIERS:
+            seconds = self.metrics.histogram(f'tier_{tier}_seconds')
+            keys = counters[f'tier_{tier}_keys']
+            summary[tier] = {
+                'backend': getattr(self.tiers[tier], 'name', ''),
+                'calls': counters[f'tier_{tier}_calls'],
+                'keys': keys,
+                'translated': counters[f'tier_{tier}_translated'],
+                'rejected': counters[f'tier_{tier}_rejected'],
+                'tokens': counters[f'tier_{tier}_tokens'],
+                'tokenShare': round(counters[f'tier_{tier}_tokens'] / budget_tokens, 4) if budget_tokens else 0.0,
+                'keysPerCallSecond': round(keys / seconds['sum'], 1) if seconds['sum'] else None,
+                'p95Seconds': seconds['p95'],
+            }
+        return summary
+
+    def write_history(self, result, path=HISTORY_FILE):
+        """Record rejected and accepted LLM answers for the tier policy of the next run"""
+        attempted = [key for key in self._key_tier]
+        rejected = [key for key in attempted if result.origins.get(key) == 'fallback']
+        accepted = [key for key in attempted if result.origins.get(key) == 'llm']
+        return update_history(path, rejected, accepted)
+
+    def write_resume_plan(self, result, path):
+        """Resume plan for deferred keys; None (and no stale plan) when everything was attempted"""
+        if not result.deferred:
+            Path(path).unlink(missing_ok=True)
+            return None
+        return write_resume_plan(path, result.deferred, result.stop_reason, self.budget, self.locale)
+
+    def write_reports(self, report_path, prom_path=None):
+        self.close()
+        if hasattr(self.backend, 'summary'):
+            self.events.emit('backend.stats', backends=self.backend.summary())
+        if self.tiers:
+            self.events.emit('tiers.summary', tiers=self.tier_summary())
+        self.metrics.write_report(report_path)
+        if prom_path:
+            self.metrics.write_prometheus(prom_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the UI translation pipeline')
+    parser.add_argument('--backend', default='gemini',
+                        help='gemini, claude, http or fake; join with + to hedge across several (gemini+claude)')
+    parser.add_argument('--keys', default=str(EXTRACTED_KEYS_FILE), help='path to extracted-keys.json')
+    parser.add_argument('--locale', default='is', choices=tuple(COMPACT_TEMPLATES), help='target locale')
+    parser.add_argument('--batch-dir', help="existing batch translations (default: the locale's batch directory)")
+    parser.add_argument('--out', default=str(OUTPUT_DIR), help='output directory')
+    parser.add_argument('--report', help='JSON run report (default: <out>/run-report.json)')
+    parser.add_argument('--prom', help='Prometheus textfile (default: <out>/olfong_i18n.prom)')
+    parser.add_argument('--batch-budget', type=int, default=DEFAULT_BUDGET, help='max key payload bytes per call')
+    parser.add_argument('--max-keys', type=int, default=DEFAULT_MAX_KEYS)
+    parser.add_argument('--requests-per-day', type=int, help='daily LLM request budget')
+    parser.add_argument('--tokens-per-day', type=int, help='daily LLM token budget')
+    parser.add_argument('--budget-state', help='daily usage state (default: <out>/llm-budget.json)')
+    parser.add_argument('--resume', help='only translate the keys of a resume plan')
+    parser.add_argument('--events', help="NDJSON event log ('-' for stdout; default: <out>/events.ndjson)")
+    parser.add_argument('--concurrency', type=int, default=1, help='batches in flight at once')
+    parser.add_argument('--intern', action='store_true', help='also emit interned string-table bundles')
+    parser.add_argument('--tiers', action='store_true',
+                        help='send short labels to a fast model and long texts to a strong one')
+    parser.add_argument('--snapshots', help='snapshot store (default: <out>/snapshots; see snapshots.py)')
+    parser.add_argument('--no-snapshot', action='store_true', help='do not record a snapshot of this run')
+    args = parser.parse_args(argv)
+
+    out = Path(args.out)
+    metrics = RunMetrics()
+    if args.events == '-':
+        events = EventLog(stream=sys.stdout, run_id=metrics.run_id)
+    else:
+        out.mkdir(parents=True, exist_ok=True)
+        events = EventLog(path=args.events or out / 'events.ndjson', run_id=metrics.run_id)
+    budget = Budget(args.requests_per_day, args.tokens_per_day, args.budget_state or out / 'llm-budget.json')
+    history_file = out / HISTORY_FILE.name
+    if args.tiers:
+        tiers = create_tier_backends(args.backend, pool_size=args.concurrency)
+        backend = tiers['fast']
+        policy = TierPolicy(load_history(history_file))
+    else:
+        tiers = policy = None
+        backend = create_backend(args.backend, pool_size=args.concurrency)
+    snapshots = None
+    if not args.no_snapshot:
+        from .snapshots import SnapshotStore
+
+        snapshots = SnapshotStore(args.snapshots or out / 'snapshots')
+    pipeline = Pipeline(backend, metrics=metrics, batch_budget=args.batch_budget, max_keys=args.max_keys,
+                        locale=args.locale, budget=budget, events=events, concurrency=args.concurrency,
+                        intern=args.intern, tiers=tiers, policy=policy, snapshots=snapshots)
+    entries, existing = pipeline.load(args.keys, args.batch_dir)
+    usage = {entry.key: entry for entry in entries}
+    if args.resume:
+        wanted = set(load_resume_plan(args.resume)['keys'])
+        entries = [entry for entry in entries if entry.key in wanted]
+
+    result = pipeline.run(entries, existing)
+    pipeline.emit(result, out, merge=bool(args.resume), usage=usage)
+    pipeline.write_reports(args.report or out / 'run-report.json', args.prom or out / 'olfong_i18n.prom')
+    plan = pipeline.write_resume_plan(result, out / 'resume-plan.json')
+    if tiers:
+        pipeline.write_history(result, history_file)
+
+    events.close()
+    for used in (tiers or {'': backend}).values():
+        if hasattr(used, 'close'):
+            used.close()
+
+    # Human summary on stderr; the event log is the machine-readable record
+    report = pipeline.metrics.report()
+    print(f"Translated {len(result.translations)}/{len(result.origins)} keys "
+          f"({len(result.fallbacks)} fallback) in {report['wallSeconds']:.2f}s", file=sys.stderr)
+    offline = [key for key, origin in result.origins.items() if origin == 'rules']
+    if offline:
+        rules = ', '.join(f"{rule} {count}" for rule, count in pipeline.rules.summary().items())
+        print(f"  {len(offline)} keys resolved offline by rules ({rules})", file=sys.stderr)
+    if pipeline.metrics.counters['keynames_drafted']:
+        print(f"  {pipeline.metrics.counters['keynames_drafted']} keys drafted from key names, "
+              f"{pipeline.metrics.counters['keynames_calls_avoided']} calls avoided", file=sys.stderr)
+    for tier, summary in pipeline.tier_summary().items():
+        print(f"  {tier} tier ({summary['backend']}): {summary['calls']} calls, {summary['keys']} keys, "
+              f"{summary['rejected']} rejected, {summary['tokens']} tokens "
+              f"({summary['tokenShare'] * 100:.0f}% of budget use), {summary['keysPerCallSecond']} keys/s",
+              file=sys.stderr)
+    if snapshots is not None:
+        head = snapshots.heads()[pipeline.locale]
+        print(f"  snapshot {head['id']} ({pipeline.metrics.counters['snapshot_bytes']} bytes stored); "
+              f"diff or roll back with python -m olfong_i18n.snapshots --dir {snapshots.root}", file=sys.stderr)
+    if plan:
+        print(f"Stopped early ({result.stop_reason}): {len(result.deferred)} keys deferred, "
+              f"resume with --resume {plan}", file=sys.stderr)
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Customer-impact priority for translation work.
+
+Every key is assigned a surface from its namespace and the files that use it
+(extracted-keys.json): checkout, storefront, common, admin or junk (CSS
+selectors, bare numbers and other extractor noise). Work is ordered by
+surface first and usage second, so a partial or quota-limited run delivers
+the strings customers see before admin-only ones.
+
+Usage:
+    python -m olfong_i18n.priority [--keys extracted-keys.json] [--top 30]
+"""
+
+import argparse
+import math
+import re
+from collections import Counter
+
+from .catalog import EXTRACTED_KEYS_FILE, KeyUsage, load_extracted_keys
+
+SURFACES = ('checkout', 'storefront', 'common', 'admin', 'junk')
+SURFACE_WEIGHTS = {'checkout': 8, 'storefront': 6, 'common': 4, 'admin': 1, 'junk': 0}
+
+CHECKOUT_ROOTS = {'checkoutPage', 'checkout', 'cartPage', 'cart', 'addresses', 'delivery', 'ageVerification'}
+STOREFRONT_ROOTS = {
+    'home', 'productDetailPage', 'productsPage', 'products', 'product', 'categories', 'category',
+    'subcategories', 'navigation', 'footer', 'search', 'ordersPage', 'orderDetailPage', 'orders',
+    'profilePage', 'profile', 'login', 'auth', 'authExtra', 'subscription', 'imageSearchModal',
+}
+COMMON_ROOTS = {'common', 'aria', 'tooltips', 'notifications', 'chat'}
+ADMIN_ROOTS = {'atvrImport', 'discounts', 'pos', 'demoData', 'receipts'}
+
+ADMIN_FILE_PREFIXES = ('pages/admin/', 'components/admin/', 'pages/AdminLogin')
+CHECKOUT_FILES = ('pages/Cart', 'pages/Checkout', 'pages/delivery/')
+JUNK_PATTERN = re.compile(r'^[.\-#]|^[\d.,:-]+$')
+
+
+def is_junk_key(key):
+    """CSS selectors (.relative), punctuation and bare numbers (24.00) picked up by the extractor"""
+    return not key or bool(JUNK_PATTERN.match(key)) or not any(c.isalpha() for c in key)
+
+
+def surface_of(key, files=()):
+    """checkout, storefront, common, admin or junk for one key"""
+    if is_junk_key(key):
+        return 'junk'
+    root = key.split('.', 1)[0]
+    if root in CHECKOUT_ROOTS:
+        return 'checkout'
+    if root.startswith('admin') or root in ADMIN_ROOTS:
+        return 'admin'
+    if root in STOREFRONT_ROOTS:
+        return 'storefront'
+    if root in COMMON_ROOTS:
+        return 'common'
+
+    customer_files = [f for f in files if not f.startswith(ADMIN_FILE_PREFIXES)]
+    if any(f.startswith(CHECKOUT_FILES) for f in customer_files):
+        return 'checkout'
+    if any(f.startswith('pages/') or f.startswith('components/layout/') for f in customer_files):
+        return 'storefront'
+    if files and not customer_files:
+        return 'admin'
+    return 'common'
+
+
+def priority_score(entry):
+    """Surface weight scaled by how widely the key is used"""
+    weight = SURFACE_WEIGHTS[surface_of(entry.key, entry.files)]
+    return weight * (1 + math.log2(max(entry.count, 1) + len(entry.files)))
+
+
+def prioritize(entries):
+    """Entries ordered by surface, then usage (most used first), then key"""
+    rank = {surface: index for index, surface in enumerate(SURFACES)}
+    return sorted(entries, key=lambda e: (rank[surface_of(e.key, e.files)], -priority_score(e), e.key))
+
+
+def prioritize_keys(keys, usage):
+    """Plain keys in priority order; keys missing from `usage` ({key: KeyUsage}) rank by name alone"""
+    entries = [usage.get(key) or KeyUsage(key) for key in keys]
+    return [entry.key for entry in prioritize(entries)]
+
+
+def split_by_surface(entries):
+    """[(surface, entries)] in priority order, skipping empty surfaces"""
+    buckets = {surface: [] for surface in SURFACES}
+    for entry in entries:
+        buckets[surface_of(entry.key, entry.files)].append(entry)
+    return [(surface, buckets[surface]) for surface in SURFACES if buckets[surface]]
+
+
+def batch_score(batch):
+    return sum(priority_score(entry) for group in batch.groups for entry in group.entries)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Show translation priority by customer impact')
+    parser.add_argument('--keys', default=str(EXTRACTED_KEYS_FILE), help='path to extracted-keys.json')
+    parser.add_argument('--top', type=int, default=30, help='number of keys to list')
+    args = parser.parse_args(argv)
+
+    entries = load_extracted_keys(args.keys, valid_only=False)
+    surfaces = Counter(surface_of(e.key, e.files) for e in entries)
+    print(f"📊 {len(entries)} keys: " + ', '.join(f"{s} {surfaces[s]}" for s in SURFACES))
+    for entry in prioritize(entries)[:args.top]:
+        print(f"  {priority_score(entry):6.2f}  {surface_of(entry.key, entry.files):<10}  {entry.key}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+"""
+Prompt encodings for the Icelandic UI translation requests.
+
+The legacy prompts (one per key, or a JSON list of full keys) repeat the
+guidelines and every dotted prefix. The compact encoding sends the guidelines
+once, groups keys by namespace so each shared prefix appears once, and refers
+to entries by short IDs that are mapped back to full keys on ingest. Its
+static part is COMPACT_TEMPLATE's prefix (see templates.py), so every batch
+prompt starts with the same bytes. The encoding is line based, so a source
+text's line breaks travel as a literal \\n; answers keep it (a translation
+is validated as one line), and callers restore it with unescape_translation().
+
+Usage:
+    python -m olfong_i18n.prompts --benchmark [--keys extracted-keys.json] [--batch-size 50]
+"""
+
+import argparse
+import json
+import math
+import string
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .catalog import EXTRACTED_KEYS_FILE, load_extracted_keys, namespace_of
+from .templates import COMPACT_TEMPLATE
+
+_ID_ALPHABET = string.digits + string.ascii_lowercase
+
+
+@dataclass
+class CompactPrompt:
+    text: str
+    ids: dict  # short id -> full key
+
+
+def short_id(index):
+    """Base36 id for the n-th entry of a prompt (0, 1, ..., z, 10, ...)"""
+    if index == 0:
+        return _ID_ALPHABET[0]
+    digits = []
+    while index:
+        index, rem = divmod(index, len(_ID_ALPHABET))
+        digits.append(_ID_ALPHABET[rem])
+    return ''.join(reversed(digits))
+
+
+def escape_source(text):
+    """Compact prompts are line based; newlines travel as a literal \\n"""
+    return text.replace('\r\n', '\n').replace('\n', '\\n')
+
+
+def unescape_translation(text):
+    return text.replace('\\n', '\n')
+
+
+def group_by_namespace(keys):
+    """Group keys by dotted namespace, preserving first-seen namespace order"""
+    groups = OrderedDict()
+    for key in keys:
+        groups.setdefault(namespace_of(key), []).append(key)
+    return groups
+
+
+def encode_compact(keys, sources=None, context=None, template=COMPACT_TEMPLATE):
+    """Build a namespace-grouped prompt for a batch of keys"""
+    sources = sources or {}
+    context = context or {}
+    ids = {}
+    lines = []
+
+    for namespace, group in group_by_namespace(keys).items():
+        files = context.get(namespace)
+        lines.append(f'[{namespace}] {", ".join(files)}' if files else f'[{namespace}]')
+        for key in group:
+            entry_id = short_id(len(ids))
+            ids[entry_id] = key
+            suffix = key[len(namespace) + 1:] if namespace else key
+            source = escape_source(sources[key]) if sources.get(key) else None
+            lines.append(f'{entry_id} {suffix}\t{source}' if source else f'{entry_id} {suffix}')
+
+    return CompactPrompt(template.render('\n'.join(lines)), ids)
+
+
+def parse_compact(text):
+    """Inverse of encode_compact: list of (id, full key, source or None)"""
+    entries = []
+    namespace = None
+    for line in text.splitlines():
+        if line.startswith('[') and ']' in line:
+            namespace = line[1:line.index(']')]
+            continue
+        if namespace is None or ' ' not in line:
+            continue
+        entry_id, rest = line.split(' ', 1)
+        suffix, _, source = rest.partition('\t')
+        key = f'{namespace}.{suffix}' if namespace else suffix
+        entries.append((entry_id, key, source or None))
+    return entries
+
+
+def extract_json_object(output):
+    """Pull the outermost JSON object out of a CLI response"""
+    if '{' not in output:
+        return {}
+    start = output.find('{')
+    end = output.rfind('}') + 1
+    try:
+        parsed = json.loads(output[start:end])
+    except ValueError:
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def decode_response(output, ids):
+    """Map a compact response ({id: text}) back to {full key: text}"""
+    result = {}
+    for entry_id, value in extract_json_object(output).items():
+        key = ids.get(str(entry_id).strip())
+        if key is not None and isinstance(value, str) and value.strip():
+            result[key] = value.strip()
+    return result
+
+
+def legacy_key_prompt(key):
+    """Per-key prompt as comprehensive-translate.py sent it before templates.KEY_TEMPLATE (key first)"""
+    return f'''Translate this UI text key to professional Icelandic for "Ölföng", an e-commerce wine and beer website.
+Key context: {key}
+
+Guidelines:
+- Use formal, professional Icelandic
+- For UI labels: clear, concise descriptive text
+- For buttons: active verbs
+- For settings: descriptive labels
+- For payment providers: keep original names (Teya, Valitor)
+- For numbers: use comma as decimal separator (24,00 not 24.00)
+- For categories: use Icelandic equivalents (WINE->Vín, BEER->Bjór, SPIRITS->Brennivín)
+- For common UI terms:
+  * Save = Vista
+  * Delete = Eyða
+  * Edit = Breyta
+  * Add = Bæta við
+  * View = Skoðaðu
+  * Submit = Senda
+  * Cancel = Hætta við
+  * Settings = Stillingar
+  * Profile = Prófíl
+
+Return ONLY the Icelandic translation text, nothing else.'''
+
+
+def legacy_batch_prompt(keys):
+    """Full-key JSON list prompt as sent by comprehensive-translate-all.py"""
+    return f'''Translate these UI text keys to professional Icelandic for an e-commerce wine/beer website called "Ölföng".
+
+Return ONLY a valid JSON object mapping each key to its Icelandic translation.
+Use formal, professional language appropriate for UI labels.
+Keep payment provider names unchanged (Teya, Valitor).
+Use Icelandic equivalents for categories (WINE→Vín, BEER→Bjór, SPIRITS→Brennivín, etc).
+
+Keys to translate:
+{json.dumps(keys, ensure_ascii=False)}
+
+Return ONLY the JSON object, no other text.'''
+
+
+def estimate_tokens(text):
+    """Token count via tiktoken when installed, else ~4 UTF-8 bytes per token"""
+    try:
+        import tiktoken
+    except ImportError:
+        return math.ceil(len(text.encode('utf-8')) / 4)
+    return len(tiktoken.get_encoding('cl100k_base').encode(text))
+
+
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def benchmark(keys, batch_size=50):
+    """Prompt bytes and tokens for the legacy and compact encodings"""
+    encodings = OrderedDict([
+        ('per-key', [legacy_key_prompt(key) for key in keys]),
+        ('batch-json', [legacy_batch_prompt(chunk) for chunk in chunked(keys, batch_size)]),
+        ('compact', [encode_compact(chunk).text for chunk in chunked(keys, batch_size)]),
+    ])
+
+    report = OrderedDict()
+    for name, prompts in encodings.items():
+        total_bytes = sum(len(p.encode('utf-8')) for p in prompts)
+        total_tokens = sum(estimate_tokens(p) for p in prompts)
+        report[name] = {
+            'prompts': len(prompts),
+            'bytes': total_bytes,
+            'tokens': total_tokens,
+            'bytesPerKey': round(total_bytes / max(len(keys), 1), 2),
+            'tokensPerKey': round(total_tokens / max(len(keys), 1), 2),
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compact prompt encoding tools')
+    parser.add_argument('--benchmark', action='store_true', help='compare prompt sizes per key')
+    parser.add_argument('--keys', default=str(EXTRACTED_KEYS_FILE), help='path to extracted-keys.json')
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args(argv)
+
+    if not args.benchmark:
+        parser.print_help()
+        return
+
+    keys = [entry.key for entry in load_extracted_keys(args.keys)]
+    report = benchmark(keys, args.batch_size)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Prompt size for {len(keys)} keys (batch size {args.batch_size}):")
+    print(f"{'encoding':<12} {'prompts':>8} {'bytes':>10} {'tokens':>9} {'B/key':>8} {'tok/key':>8}")
+    for name, row in report.items():
+        print(f"{name:<12} {row['prompts']:>8} {row['bytes']:>10} {row['tokens']:>9} "
+              f"{row['bytesPerKey']:>8} {row['tokensPerKey']:>8}")
+
+    baseline = report['batch-json']['tokens']
+    saved = 1 - report['compact']['tokens'] / baseline if baseline else 0
+    print(f"\nCompact vs batch-json: {saved * 100:.1f}% fewer prompt tokens")
+
+
+if __name__ == '__main__':
+    main()
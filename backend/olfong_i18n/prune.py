@@ -0,0 +1,152 @@
+"""
+Dead-key pruning report for the Lang table.
+
+Joins Lang rows against current key usage (extracted-keys.json) and sorts
+them into live keys, orphans (no longer referenced by the web app) and junk
+the extractor picked up (`-`, `.`, `24.00`, CSS selectors). Reports the
+bundle bytes each locale would save, and can write pruned bundles plus a
+delete change set for scripts/apply-translation-changeset.js.
+
+Keys built at runtime (t(`status.${value}`)) never show up in the
+extractor's output; protect them with --keep PREFIX.
+
+Usage:
+    python -m olfong_i18n.prune [--rows prisma/database-export.json] [--keep orderStatus.]
+        [--report translated-data/prune-report.json] [--bundles translated-data/bundles]
+        [--changeset translated-data/prune-changeset.json]
+"""
+
+import argparse
+import json
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .bundles import encode_bundle, nest, write_bundle
+from .catalog import BACKEND_DIR, EXTRACTED_KEYS_FILE, is_valid_key, load_extracted_keys
+from .priority import is_junk_key
+
+DATABASE_EXPORT = BACKEND_DIR / 'prisma' / 'database-export.json'
+REPORT_FILE = BACKEND_DIR / 'translated-data' / 'prune-report.json'
+
+
+def load_lang_rows(path=DATABASE_EXPORT):
+    """Lang rows [{id, key, locale, value}] from a database export or translations-for-database.json"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    rows = data.get('langs', []) if isinstance(data, dict) else data
+    return [row for row in rows if isinstance(row.get('key'), str)]
+
+
+def classify(key, used, keep=()):
+    """live, orphan or junk
+
+    Every key the extractor still finds is live, even one that fails the
+    batch scripts' key filter (`category`, `Search`); only extractor noise
+    (is_junk_key) is pruned regardless.
+    """
+    if key.startswith(tuple(keep)):
+        return 'live'
+    if is_junk_key(key):
+        return 'junk'
+    if key in used:
+        return 'live'
+    return 'orphan' if is_valid_key(key) else 'junk'
+
+
+def bundle_size(flat):
+    return len(encode_bundle(nest(flat)[0]))
+
+
+def prune(rows, used, keep=()):
+    """Per-locale report plus {locale: pruned {key: value}} and the rows to delete"""
+    by_locale = OrderedDict()
+    for row in rows:
+        by_locale.setdefault(row.get('locale', 'is'), []).append(row)
+
+    report = OrderedDict()
+    pruned = OrderedDict()
+    deletes = []
+    for locale, locale_rows in sorted(by_locale.items()):
+        flat = {}
+        kept = {}
+        orphans = []
+        junk = []
+        for row in locale_rows:
+            value = row.get('value') if isinstance(row.get('value'), str) else ''
+            flat[row['key']] = value
+            status = classify(row['key'], used, keep)
+            if status == 'live':
+                kept[row['key']] = value
+                continue
+            (orphans if status == 'orphan' else junk).append(row['key'])
+            deletes.append({'id': row.get('id'), 'key': row['key'], 'locale': locale, 'reason': status})
+
+        before = bundle_size(flat)
+        after = bundle_size(kept)
+        report[locale] = {
+            'rows': len(locale_rows),
+            'live': len(kept),
+            'orphaned': len(orphans),
+            'junk': len(junk),
+            'bundleBytes': before,
+            'prunedBundleBytes': after,
+            'savedBytes': before - after,
+            'savedPercent': round((before - after) * 100 / before, 1) if before else 0.0,
+            'orphanKeys': sorted(set(orphans)),
+            'junkKeys': sorted(set(junk)),
+        }
+        pruned[locale] = kept
+    return report, pruned, deletes
+
+
+def write_changeset(path, deletes, upserts=None):
+    """Change set for scripts/apply-translation-changeset.js; upserts [{key, locale, value}] are optional"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'createdAt': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+            'model': 'lang',
+            'deletes': deletes,
+            **({'upserts': upserts} if upserts is not None else {}),
+        }, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report orphaned and junk translation keys')
+    parser.add_argument('--rows', default=str(DATABASE_EXPORT),
+                        help='database-export.json (langs) or translations-for-database.json')
+    parser.add_argument('--keys', default=str(EXTRACTED_KEYS_FILE), help='path to extracted-keys.json')
+    parser.add_argument('--keep', action='append', default=[], help='key prefix to never prune (repeatable)')
+    parser.add_argument('--report', default=str(REPORT_FILE), help='JSON report path')
+    parser.add_argument('--bundles', help='write pruned bundles to this directory')
+    parser.add_argument('--changeset', help='write a delete change set to this path')
+    args = parser.parse_args(argv)
+
+    used = {entry.key for entry in load_extracted_keys(args.keys, valid_only=False)}
+    report, pruned, deletes = prune(load_lang_rows(args.rows), used, args.keep)
+
+    report_path = Path(args.report)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for locale, summary in report.items():
+        print(f"📊 {locale}: {summary['rows']} rows, {summary['orphaned']} orphaned, {summary['junk']} junk; "
+              f"bundle {summary['bundleBytes']} -> {summary['prunedBundleBytes']} bytes "
+              f"(-{summary['savedPercent']}%)")
+    print(f"✅ Report saved to: {report_path}")
+
+    if args.bundles:
+        for locale, flat in pruned.items():
+            write_bundle(flat, locale, args.bundles)
+        print(f"✅ Pruned bundles saved to: {args.bundles}")
+    if args.changeset:
+        write_changeset(args.changeset, deletes)
+        print(f"✅ Change set with {len(deletes)} deletes saved to: {args.changeset}")
+
+
+if __name__ == '__main__':
+    main()
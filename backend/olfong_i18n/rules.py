@@ -0,0 +1,124 @@
+"""
+Deterministic translation rules, applied before any backend call.
+
+Whole classes of keys need no model:
+
+- numbers and amounts (`24.00` -> `24,00`, `500 kr` -> `500 kr.`) are
+  formatted for the locale;
+- payment providers and other brands (`adminSettings.teya`,
+  `adminSettings.netgiro`) are their brand name in every locale;
+- CSS selectors (`.relative`) and punctuation (`-`, `.`) the extractor
+  picked up are not translatable and map to themselves.
+
+RulesEngine is a read-only mapping, so the pipeline uses it as its first
+lookup layer; it counts how many keys each rule resolved.
+
+Usage:
+    python -m olfong_i18n.rules [--keys extracted-keys.json] [--locale is] [--json]
+"""
+
+import argparse
+import json
+import re
+from collections import Counter
+
+from .catalog import EXTRACTED_KEYS_FILE, load_extracted_keys
+
+# Lower-cased last key segment -> brand name as written in every locale
+BRANDS = {
+    'olfong': 'Ölföng',
+    'teya': 'Teya',
+    'valitor': 'Valitor',
+    'rapyd': 'Rapyd',
+    'netgiro': 'Netgíró',
+    'paypal': 'PayPal',
+    'stripe': 'Stripe',
+    'atvr': 'ÁTVR',
+    'kenni': 'Kenni',
+    'uniconta': 'Uniconta',
+}
+
+# Decimal separator and how an ISK amount is written
+NUMBER_FORMATS = {
+    'is': {'decimal': ',', 'currency': '{amount} kr.'},
+    'en': {'decimal': '.', 'currency': 'ISK {amount}'},
+}
+
+NUMBER_RE = re.compile(r'^-?\d+(?:[.,]\d+)?$')
+PERCENT_RE = re.compile(r'^(-?\d+(?:[.,]\d+)?)\s*%$')
+CURRENCY_RE = re.compile(r'^(-?\d+(?:[.,]\d+)?)\s*(?:kr\.?|ISK)$', re.IGNORECASE)
+CSS_SELECTOR_RE = re.compile(r'^[.#][A-Za-z_][\w-]*$')
+PUNCTUATION_RE = re.compile(r'^[^\w\s]+$')
+
+RULES = ('untranslatable', 'number', 'percent', 'currency', 'brand')
+
+
+class RulesEngine:
+    """Resolves keys by rule for one locale; .get() makes it a pipeline lookup layer"""
+
+    def __init__(self, locale='is', brands=None):
+        self.locale = locale
+        self.format = NUMBER_FORMATS.get(locale, NUMBER_FORMATS['en'])
+        self.brands = {name.lower(): value for name, value in (brands or BRANDS).items()}
+        self.resolved = Counter()
+
+    def number(self, text):
+        """Locale decimal separator for a plain number (no grouping; keys hold ids and codes too)"""
+        return text.replace('.', ',') if self.format['decimal'] == ',' else text.replace(',', '.')
+
+    def resolve(self, key):
+        """(rule, value) for a key a rule covers, else None"""
+        if CSS_SELECTOR_RE.match(key) or PUNCTUATION_RE.match(key):
+            return 'untranslatable', key
+        if NUMBER_RE.match(key):
+            return 'number', self.number(key)
+        match = PERCENT_RE.match(key)
+        if match:
+            return 'percent', f'{self.number(match.group(1))}%'
+        match = CURRENCY_RE.match(key)
+        if match:
+            return 'currency', self.format['currency'].format(amount=self.number(match.group(1)))
+        brand = self.brands.get(key.rsplit('.', 1)[-1].lower())
+        if brand:
+            return 'brand', brand
+        return None
+
+    def get(self, key, default=None):
+        result = self.resolve(key)
+        if result is None:
+            return default
+        self.resolved[result[0]] += 1
+        return result[1]
+
+    def __contains__(self, key):
+        return self.resolve(key) is not None
+
+    def summary(self):
+        return {rule: self.resolved[rule] for rule in RULES if self.resolved[rule]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Show which keys the deterministic rules resolve')
+    parser.add_argument('--keys', default=str(EXTRACTED_KEYS_FILE), help='path to extracted-keys.json')
+    parser.add_argument('--locale', default='is')
+    parser.add_argument('--json', action='store_true', help='print {key: value} for the resolved keys only')
+    args = parser.parse_args(argv)
+
+    engine = RulesEngine(args.locale)
+    entries = load_extracted_keys(args.keys, valid_only=False)
+    if args.json:
+        resolved = {entry.key: engine.get(entry.key) for entry in entries if entry.key in engine}
+        print(json.dumps(resolved, ensure_ascii=False, indent=2))
+        return
+    for entry in entries:
+        result = engine.resolve(entry.key)
+        if result:
+            engine.get(entry.key)
+            print(f"  {result[0]:<15} {entry.key!r} -> {result[1]!r}")
+    total = sum(engine.resolved.values())
+    print(f"✅ {total} of {len(entries)} keys resolved offline: "
+          + ', '.join(f"{rule} {count}" for rule, count in engine.summary().items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Sentence segmentation for Icelandic and English descriptions.
+
+Long texts (ÁTVR product descriptions, category and subcategory copy) are
+edited a sentence at a time, so they are translated a sentence at a time:
+content.py sends each sentence as its own segment and caches it by its own
+text, and an edited description only re-sends the sentences that changed.
+
+A sentence ends at . ! ? or … followed by whitespace and an upper-case
+letter (Icelandic capitals included), a digit or an opening quote, or at a
+line break. Abbreviations don't end a sentence, in either language
+("t.d.", "u.þ.b.", "e.g.", "approx."), and neither do single initials
+("J. R. R."); "o.s.frv." and "etc." do, as they usually close one.
+segment() keeps the whitespace between sentences, so join_segments()
+rebuilds the exact text.
+
+Usage:
+    python -m olfong_i18n.segments "Fyrsta setning. Önnur setning, t.d. þessi."
+"""
+
+import argparse
+import re
+
+ABBREVIATIONS = {
+    # Icelandic
+    't.d', 'þ.e', 'þ.e.a.s', 'm.a', 'u.þ.b', 'skv', 'nr', 'kl', 'sbr', 'þ.m.t', 'ca',
+    'bls', 'frh', 'f.h', 'e.h', 'mín', 'sek', 'gr', 'dags', 'sl', 'ath', 'o.þ.h', 'þ.á.m', 'a.m.k', 'm.v',
+    'hf', 'ehf', 'sr', 'próf', 'dr',
+    # English
+    'e.g', 'i.e', 'approx', 'vs', 'vol', 'no', 'mr', 'mrs', 'ms', 'st', 'jr', 'sr', 'inc', 'ltd',
+    'co', 'fig', 'est',
+}
+# o.s.frv., o.fl. and etc. are left out on purpose: they usually close their sentence
+
+_CAPITALS = 'A-ZÁÐÉÍÓÚÝÞÆÖ'
+# Closing quotes and brackets; Icelandic quotes „like this“ close with “
+_CLOSING = ')"”“»\''
+# Candidate boundary: terminal punctuation (plus closing quotes/brackets), then whitespace
+_BOUNDARY_RE = re.compile(r'([.!?…]+[' + _CLOSING + r']*)(\s+)(?=[' + _CAPITALS + r'0-9"“„«(])')
+_LINE_RE = re.compile(r'(\s*\n\s*)')
+_WORD_BEFORE_RE = re.compile(r'(\S+)$')
+
+
+def _is_abbreviation(text, end):
+    """True when the period at text[end - 1] closes an abbreviation or an initial"""
+    match = _WORD_BEFORE_RE.search(text, 0, end)
+    if not match:
+        return False
+    word = match.group(1).rstrip('.').lstrip('("“„«').lower()
+    if word in ABBREVIATIONS:
+        return True
+    return len(word) == 1 and word.isalpha()
+
+
+def _split_line(line):
+    """[(sentence, whitespace after it)] for one line of text"""
+    segments = []
+    start = 0
+    for match in _BOUNDARY_RE.finditer(line):
+        punctuation_end = match.end(1)
+        if match.group(1).startswith('.') and len(match.group(1).rstrip(_CLOSING)) == 1 \
+                and _is_abbreviation(line, match.start(1) + 1):
+            continue
+        segments.append((line[start:punctuation_end], match.group(2)))
+        start = match.end(2)
+    segments.append((line[start:], ''))
+    return segments
+
+
+def segment(text):
+    """[(sentence, separator)] with ''.join(s + sep) == text; blank text gives []"""
+    segments = []
+    parts = _LINE_RE.split(text)
+    # parts alternates line, line break, line, ...
+    for index in range(0, len(parts), 2):
+        line = parts[index]
+        separator = parts[index + 1] if index + 1 < len(parts) else ''
+        if not line:
+            if segments:
+                sentence, previous = segments[-1]
+                segments[-1] = (sentence, previous + separator)
+            elif separator:
+                segments.append(('', separator))
+            continue
+        line_segments = _split_line(line)
+        sentence, last = line_segments[-1]
+        line_segments[-1] = (sentence, last + separator)
+        segments.extend(line_segments)
+    return segments
+
+
+def split_sentences(text):
+    """Just the sentences of segment(), without separators"""
+    return [sentence for sentence, _ in segment(text) if sentence]
+
+
+def join_segments(sentences, separators):
+    """Rebuild a text from (translated) sentences and the separators segment() found"""
+    return ''.join(sentence + separator for sentence, separator in zip(sentences, separators))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Split a description into sentences')
+    parser.add_argument('text')
+    args = parser.parse_args(argv)
+
+    for index, sentence in enumerate(split_sentences(args.text)):
+        print(f"  {index:>3}  {sentence}")
+
+
+if __name__ == '__main__':
+    main()
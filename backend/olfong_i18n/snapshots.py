@@ -0,0 +1,420 @@
+"""
+Content-addressed translation snapshots with cheap diff and rollback.
+
+Every pipeline run records the emitted catalog as a snapshot instead of a
+whole JSON copy (backups/db-exports, restore-db-from-backup.js):
+
+    snapshots/values/<h>.ndjson     {hash, value} per distinct string, append-only, sharded by hash prefix
+    snapshots/objects/<h>/<hash>.json
+                                    buckets {key: value hash}, keys spread over BUCKETS by key hash,
+                                    and roots [bucket hash per bucket]; written once, never changed
+    snapshots/snapshots.ndjson      {id, parent, root, locale, created, label, run, keys} per snapshot
+    snapshots/heads.json            {locale: latest snapshot}
+
+A run that changes nothing costs one log line; a run that changes a few
+strings adds those values, the small buckets holding their keys and a root,
+so storage grows with what changed, not with the history length. Two
+snapshots are diffed by comparing their roots and reading only the buckets
+and value shards that differ. Rolling back re-emits a previous root's
+catalog (see Pipeline.emit) and records a snapshot pointing at the same
+root, so it stores nothing new; --changeset also writes the upserts and
+deletes that bring the Lang table to that snapshot, for
+scripts/apply-translation-changeset.js. Content runs (content.py) record
+content-<locale> snapshots; rolling one of those back rewrites
+content-updates.ndjson instead.
+
+A snapshot is named by its id, an unambiguous id prefix, `head` or
+`head~N` (N snapshots before the locale's latest).
+
+Usage:
+    python -m olfong_i18n.snapshots list [--locale is] [--dir translated-data/snapshots]
+    python -m olfong_i18n.snapshots record [--from translated-data/all-translations-is.json] [--label manual]
+    python -m olfong_i18n.snapshots diff head~1 head [--values]
+    python -m olfong_i18n.snapshots rollback head~1 [--out translated-data]
+        [--changeset translated-data/rollback-changeset.json]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .catalog import BACKEND_DIR, EXTRACTED_KEYS_FILE, load_extracted_keys
+
+SNAPSHOT_DIR = BACKEND_DIR / 'translated-data' / 'snapshots'
+LOG_NAME = 'snapshots.ndjson'
+HEADS_NAME = 'heads.json'
+HASH_LENGTH = 16
+SHARD_LENGTH = 1  # values/<first hex digit>.ndjson and objects/<first hex digit>/: 16 shards each
+BUCKETS = 64  # ~25 keys per bucket for the UI catalog: a changed string rewrites ~1 KB plus the root
+
+
+def digest(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def value_hash(value):
+    return digest(value.encode('utf-8'))
+
+
+def bucket_of(key):
+    return int(digest(key.encode('utf-8'))[:8], 16) % BUCKETS
+
+
+def _encode(obj):
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def _write_atomic(path, data):
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+class SnapshotStore:
+    """Snapshots of {key: value} catalogs per locale, stored under `root` (see the module docstring)"""
+
+    def __init__(self, root=SNAPSHOT_DIR):
+        self.root = Path(root)
+        self.log_path = self.root / LOG_NAME
+        self.heads_path = self.root / HEADS_NAME
+        self._objects = {}
+
+    # -- storage --------------------------------------------------------------
+
+    def _object_path(self, obj_hash):
+        return self.root / 'objects' / obj_hash[:SHARD_LENGTH] / f'{obj_hash}.json'
+
+    def _shard_path(self, v_hash):
+        return self.root / 'values' / f'{v_hash[:SHARD_LENGTH]}.ndjson'
+
+    def read_object(self, obj_hash):
+        if obj_hash not in self._objects:
+            with open(self._object_path(obj_hash), 'r', encoding='utf-8') as f:
+                self._objects[obj_hash] = json.load(f)
+        return self._objects[obj_hash]
+
+    def _put_object(self, obj, stats):
+        data = _encode(obj)
+        obj_hash = digest(data)
+        path = self._object_path(obj_hash)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _write_atomic(path, data)
+            stats['objects'] += 1
+            stats['bytes'] += len(data)
+        self._objects[obj_hash] = obj
+        return obj_hash
+
+    def _read_shard(self, path):
+        values = {}
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # a torn last line from an interrupted append
+                    values[entry['hash']] = entry['value']
+        return values
+
+    def _put_values(self, values, stats):
+        """Append {hash: value} entries their shards don't hold yet"""
+        by_shard = OrderedDict()
+        for v_hash, value in sorted(values.items()):
+            by_shard.setdefault(self._shard_path(v_hash), {})[v_hash] = value
+        for path, entries in by_shard.items():
+            stored = self._read_shard(path)
+            lines = [json.dumps({'hash': v_hash, 'value': value}, ensure_ascii=False) + '\n'
+                     for v_hash, value in entries.items() if v_hash not in stored]
+            if not lines:
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+            stats['values'] += len(lines)
+            stats['bytes'] += sum(len(line.encode('utf-8')) for line in lines)
+
+    def get_values(self, hashes):
+        """{hash: value} for `hashes`, reading only the shards they fall in"""
+        by_shard = OrderedDict()
+        for v_hash in sorted(set(hashes)):
+            by_shard.setdefault(self._shard_path(v_hash), set()).add(v_hash)
+        found = {}
+        for path, wanted in by_shard.items():
+            shard = self._read_shard(path)
+            found.update((v_hash, shard[v_hash]) for v_hash in wanted if v_hash in shard)
+        missing = set(hashes) - set(found)
+        if missing:
+            raise KeyError(f'{len(missing)} values missing from {self.root} (e.g. {sorted(missing)[0]})')
+        return found
+
+    # -- history --------------------------------------------------------------
+
+    def heads(self):
+        if not self.heads_path.exists():
+            return {}
+        with open(self.heads_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def history(self, locale=None):
+        """Snapshot entries oldest first, optionally for one locale"""
+        entries = []
+        if self.log_path.exists():
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if locale is None or entry['locale'] == locale:
+                        entries.append(entry)
+        return entries
+
+    def resolve(self, ref, locale='is'):
+        """The entry named by an id, id prefix, `head` or `head~N`"""
+        if ref == 'head' or ref.startswith('head~'):
+            back = int(ref[len('head~'):] or 0) if ref != 'head' else 0
+            if back == 0 and locale in self.heads():
+                return self.heads()[locale]
+            entries = self.history(locale)
+            if back >= len(entries):
+                raise KeyError(f'{ref}: only {len(entries)} {locale} snapshots')
+            return entries[-1 - back]
+        matches = {entry['id']: entry for entry in self.history() if entry['id'].startswith(ref)}
+        if len(matches) != 1:
+            raise KeyError(f"{ref}: {'ambiguous' if matches else 'no such'} snapshot")
+        return next(iter(matches.values()))
+
+    # -- snapshots ------------------------------------------------------------
+
+    def record(self, translations, locale='is', label=None, run=None):
+        """Store a {key: value} catalog as the locale's new head; returns (entry, stats)
+
+        Only buckets that differ from the current head's are compared key
+        by key, and only values missing from their shards are
+        written. Values go in before the buckets that point at them, so an
+        interrupted record never leaves a bucket with a dangling hash.
+        """
+        stats = {'objects': 0, 'values': 0, 'bytes': 0}
+        head = self.heads().get(locale)
+        previous = self.read_object(head['root']) if head else [None] * BUCKETS
+
+        grouped = [{} for _ in range(BUCKETS)]
+        for key, value in translations.items():
+            grouped[bucket_of(key)][key] = value
+        buckets = []
+        new_values = {}
+        for index, values in enumerate(grouped):
+            bucket = {key: value_hash(value) for key, value in values.items()}
+            buckets.append(bucket)
+            old = previous[index]
+            if old == digest(_encode(bucket)):
+                continue
+            known = set(self.read_object(old).values()) if old else set()
+            new_values.update((v_hash, values[key]) for key, v_hash in bucket.items() if v_hash not in known)
+
+        self._put_values(new_values, stats)
+        tree = [self._put_object(bucket, stats) if bucket else None for bucket in buckets]
+        root = self._put_object(tree, stats)
+
+        created = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+        parent = head['id'] if head else None
+        entry = OrderedDict([
+            ('id', digest(f'{locale}:{root}:{parent}:{created}'.encode('utf-8'))),
+            ('parent', parent),
+            ('root', root),
+            ('locale', locale),
+            ('created', created),
+            ('label', label),
+            ('run', run),
+            ('keys', len(translations)),
+        ])
+        self.root.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(line)
+        heads = self.heads()
+        heads[locale] = entry
+        _write_atomic(self.heads_path, json.dumps(heads, ensure_ascii=False, indent=2).encode('utf-8'))
+        stats['bytes'] += len(line.encode('utf-8'))
+        stats['unchanged'] = root == (head or {}).get('root')
+        return entry, stats
+
+    def hashes(self, entry):
+        """{key: value hash} of a snapshot"""
+        flat = {}
+        for bucket in self.read_object(entry['root']):
+            if bucket:
+                flat.update(self.read_object(bucket))
+        return flat
+
+    def load(self, entry):
+        """The {key: value} catalog of a snapshot, keys sorted"""
+        hashes = self.hashes(entry)
+        values = self.get_values(hashes.values())
+        return OrderedDict((key, values[v_hash]) for key, v_hash in sorted(hashes.items()))
+
+    def diff(self, old, new, values=True):
+        """{added, removed, changed, buckets} between two snapshots
+
+        Buckets with the same hash are skipped unread, so the cost follows
+        the number of changed strings, not the catalog size. added/removed
+        map key -> value and changed maps key -> [old, new]; with
+        values=False they hold value hashes instead.
+        """
+        old_tree, new_tree = self.read_object(old['root']), self.read_object(new['root'])
+        added, removed, changed = {}, {}, {}
+        touched = 0
+        for old_bucket, new_bucket in zip(old_tree, new_tree):
+            if old_bucket == new_bucket:
+                continue
+            touched += 1
+            before = self.read_object(old_bucket) if old_bucket else {}
+            after = self.read_object(new_bucket) if new_bucket else {}
+            for key in before.keys() | after.keys():
+                if key not in after:
+                    removed[key] = before[key]
+                elif key not in before:
+                    added[key] = after[key]
+                elif before[key] != after[key]:
+                    changed[key] = [before[key], after[key]]
+        if values:
+            found = self.get_values(list(added.values()) + list(removed.values()) +
+                                    [v for pair in changed.values() for v in pair])
+            added = {key: found[v] for key, v in added.items()}
+            removed = {key: found[v] for key, v in removed.items()}
+            changed = {key: [found[a], found[b]] for key, (a, b) in changed.items()}
+        return OrderedDict([
+            ('added', OrderedDict(sorted(added.items()))),
+            ('removed', OrderedDict(sorted(removed.items()))),
+            ('changed', OrderedDict(sorted(changed.items()))),
+            ('buckets', touched),
+        ])
+
+    def rollback(self, entry, output_dir, usage=None, keys_file=EXTRACTED_KEYS_FILE, compress=True):
+        """Re-emit a snapshot's catalog into output_dir and record it as the locale's head
+
+        Bundles are split into areas by `usage`, loaded from keys_file by
+        default like the pipeline does, and recompressed, so clients served
+        the .gz/.br siblings get the rolled-back strings too. The recorded
+        snapshot points at the rolled-back root, so it stores nothing but
+        its log line. Content snapshots (content-<locale>, see content.py)
+        are re-emitted as content-updates.ndjson instead of bundles.
+        Returns (new entry, diff from the previous head).
+        """
+        locale = entry['locale']
+        head = self.heads().get(locale)
+        translations = self.load(entry)
+        if locale.startswith('content-'):
+            from .content import write_updates
+
+            write_updates(translations, output_dir)
+        else:
+            self._emit(translations, locale, output_dir, usage, keys_file, compress)
+        changes = self.diff(head, entry) if head else None
+        recorded, _ = self.record(translations, locale, label=f"rollback to {entry['id']}")
+        return recorded, changes
+
+    def _emit(self, translations, locale, output_dir, usage, keys_file, compress):
+        from .pipeline import Pipeline, RunResult
+
+        if usage is None and keys_file and Path(keys_file).exists():
+            usage = {item.key: item for item in load_extracted_keys(keys_file)}
+        writer = Pipeline(None, locale=locale, compress=compress)
+        try:
+            writer.emit(RunResult(translations, {key: 'snapshot' for key in translations}), output_dir, usage=usage)
+        finally:
+            writer.close()
+
+
+def changeset_rows(changes, locale):
+    """(upserts, deletes) for scripts/apply-translation-changeset.js from a diff()"""
+    upserts = [{'key': key, 'locale': locale, 'value': value} for key, value in changes['added'].items()]
+    upserts += [{'key': key, 'locale': locale, 'value': new} for key, (_, new) in changes['changed'].items()]
+    deletes = [{'key': key, 'locale': locale, 'reason': 'rollback'} for key in changes['removed']]
+    return upserts, deletes
+
+
+def _print_diff(changes, show_values):
+    print(f"📊 +{len(changes['added'])} -{len(changes['removed'])} ~{len(changes['changed'])} "
+          f"in {changes['buckets']}/{BUCKETS} buckets")
+    if not show_values:
+        return
+    for key, value in changes['added'].items():
+        print(f'  + {key}: {value}')
+    for key, value in changes['removed'].items():
+        print(f'  - {key}: {value}')
+    for key, (old, new) in changes['changed'].items():
+        print(f'  ~ {key}: {old} -> {new}')
+
+
+def main(argv=None):
+    from .pipeline import OUTPUT_DIR
+
+    parser = argparse.ArgumentParser(description='Record, diff and roll back translation snapshots')
+    parser.add_argument('--dir', default=str(SNAPSHOT_DIR), help='snapshot store directory')
+    parser.add_argument('--locale', default='is')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='snapshots of the locale, newest first')
+    record = commands.add_parser('record', help='snapshot an all-translations-<locale>.json file')
+    record.add_argument('--from', dest='source', help='default: translated-data/all-translations-<locale>.json')
+    record.add_argument('--label', default='manual')
+    diff = commands.add_parser('diff', help='what changed between two snapshots')
+    diff.add_argument('old')
+    diff.add_argument('new', nargs='?', default='head')
+    diff.add_argument('--values', action='store_true', help='print every changed key and value')
+    diff.add_argument('--json', help='write the diff to this file')
+    rollback = commands.add_parser('rollback', help='re-emit a snapshot and make it the head')
+    rollback.add_argument('ref')
+    rollback.add_argument('--out', default=str(OUTPUT_DIR), help='output directory to re-emit into')
+    rollback.add_argument('--keys', default=str(EXTRACTED_KEYS_FILE),
+                          help='extracted-keys.json, to split area bundles as the pipeline does')
+    rollback.add_argument('--changeset', help='write the Lang upserts/deletes for apply-translation-changeset.js')
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore(args.dir)
+    try:
+        if args.command == 'list':
+            head = store.heads().get(args.locale, {})
+            for entry in reversed(store.history(args.locale)):
+                marker = '*' if entry['id'] == head.get('id') else ' '
+                print(f"{marker} {entry['id']}  {entry['created']}  {entry['keys']:>5} keys  "
+                      f"root {entry['root']}  {entry.get('label') or ''}")
+        elif args.command == 'record':
+            source = Path(args.source or OUTPUT_DIR / f'all-translations-{args.locale}.json')
+            with open(source, 'r', encoding='utf-8') as f:
+                translations = json.load(f)
+            entry, stats = store.record(translations, args.locale, label=args.label)
+            print(f"✅ Snapshot {entry['id']}: {entry['keys']} keys, {stats['values']} new values, "
+                  f"{stats['objects']} new objects, {stats['bytes']} bytes")
+        elif args.command == 'diff':
+            changes = store.diff(store.resolve(args.old, args.locale), store.resolve(args.new, args.locale))
+            _print_diff(changes, args.values)
+            if args.json:
+                with open(args.json, 'w', encoding='utf-8') as f:
+                    json.dump(changes, f, ensure_ascii=False, indent=2)
+        elif args.command == 'rollback':
+            target = store.resolve(args.ref, args.locale)
+            entry, changes = store.rollback(target, args.out, keys_file=args.keys)
+            print(f"✅ Rolled back {args.locale} to {target['id']} ({target['created']}) as snapshot {entry['id']}")
+            if changes is not None:
+                _print_diff(changes, False)
+                if args.changeset and not args.locale.startswith('content-'):
+                    from .prune import write_changeset
+
+                    upserts, deletes = changeset_rows(changes, args.locale)
+                    path = write_changeset(args.changeset, deletes, upserts=upserts)
+                    print(f'🌐 Change set for the Lang table: {path} '
+                          f'(node scripts/apply-translation-changeset.js {path})')
+    except KeyError as error:
+        print(f'⚠️ {error.args[0]}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
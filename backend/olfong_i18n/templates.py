@@ -0,0 +1,284 @@
+"""
+Versioned prompt templates with a byte-identical static prefix.
+
+Providers (and a local llama.cpp / Ollama server) reuse the work done on a
+prompt prefix they have already seen, but only up to the first byte that
+differs. The legacy per-key prompts put the key on the second line and the
+guidelines after it, so no two prompts share more than the first sentence.
+A PromptTemplate compiles the static part (role, style rules, glossary,
+output format) once into `prefix`; render() only ever appends the variable
+payload, so every prompt of a template starts with the same bytes.
+
+Each template has a version. Bump it whenever the prefix changes: the
+translation memory keys cached translations by tm_key(), which includes
+name and version, so translations made under an older prompt are not
+reused silently.
+
+The benchmark replays the prompts of a catalog through a prefix cache
+model (see PROFILES) and reports time to first token and input cost with
+the legacy layouts and with the templates.
+
+Usage:
+    python -m olfong_i18n.templates [--show key|compact|compact-en]
+    python -m olfong_i18n.templates --benchmark [--keys extracted-keys.json] [--profile llama.cpp] [--json]
+"""
+
+import argparse
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+# Common UI terms every Icelandic prompt pins down, in prompt order
+GLOSSARY = (
+    ('Save', 'Vista'),
+    ('Delete', 'Eyða'),
+    ('Edit', 'Breyta'),
+    ('Add', 'Bæta við'),
+    ('View', 'Skoðaðu'),
+    ('Submit', 'Senda'),
+    ('Cancel', 'Hætta við'),
+    ('Settings', 'Stillingar'),
+    ('Profile', 'Prófíl'),
+)
+
+STYLE_RULES = (
+    'Use formal, professional Icelandic',
+    'For UI labels: clear, concise descriptive text',
+    'For buttons: active verbs',
+    'For settings: descriptive labels',
+    'For payment providers: keep original names (Teya, Valitor)',
+    'For numbers: use comma as decimal separator (24,00 not 24.00)',
+    'For categories: use Icelandic equivalents (WINE->Vín, BEER->Bjór, SPIRITS->Brennivín)',
+)
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    name: str
+    version: int
+    role: str
+    rules: tuple
+    glossary: tuple
+    output: str
+    glossary_inline: bool = False  # "- Common terms: Save=Vista, ..." instead of one line per term
+    prefix: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'prefix', self._compile())
+
+    def _compile(self):
+        lines = [self.role, '', 'Guidelines:']
+        lines += [f'- {rule}' for rule in self.rules]
+        if self.glossary and self.glossary_inline:
+            lines.append('- Common terms: ' + ', '.join(f'{en}={target}' for en, target in self.glossary))
+        elif self.glossary:
+            lines.append('- For common UI terms:')
+            lines += [f'  * {en} = {target}' for en, target in self.glossary]
+        lines += ['', self.output, '', '']
+        return '\n'.join(lines)
+
+    @property
+    def tag(self):
+        """'<name>/v<version>', recorded with every call and cached translation"""
+        return f'{self.name}/v{self.version}'
+
+    @property
+    def fingerprint(self):
+        return hashlib.sha256(self.prefix.encode('utf-8')).hexdigest()[:12]
+
+    def render(self, payload):
+        """The static prefix followed by the payload; nothing variable precedes it"""
+        return self.prefix + payload
+
+    def tm_key(self, source):
+        """Translation memory key of a source text translated with this template"""
+        return hashlib.sha256(f'{self.tag}\n{source}'.encode('utf-8')).hexdigest()[:16]
+
+
+# One key per call (comprehensive-translate.py, translate-all-batches.py); v1 was the key-first layout
+KEY_TEMPLATE = PromptTemplate(
+    name='key',
+    version=2,
+    role='Translate UI text keys to professional Icelandic for "Ölföng", an e-commerce wine and beer website.',
+    rules=STYLE_RULES,
+    glossary=GLOSSARY,
+    output='The key to translate follows. Return ONLY the Icelandic translation text, nothing else.',
+)
+
+# Namespace-grouped batches (prompts.encode_compact); v1 dropped the settings rule and View/Submit/Profile
+COMPACT_TEMPLATE = PromptTemplate(
+    name='compact',
+    version=2,
+    role='Translate UI text keys to professional Icelandic for "Ölföng", an e-commerce wine and beer website.',
+    rules=STYLE_RULES,
+    glossary=GLOSSARY,
+    output='Keys are grouped under [namespace] headers, optionally followed by the source files using them; '
+           'each line is "<id> <key suffix>", optionally followed by a tab and the source text.\n'
+           'Return ONLY a JSON object mapping each id to its Icelandic translation, no other text.',
+    glossary_inline=True,
+)
+
+# The same batches from Icelandic to English (translation daemon, admin "generate English")
+COMPACT_EN_TEMPLATE = PromptTemplate(
+    name='compact-en',
+    version=2,
+    role='Translate Icelandic UI texts for "Ölföng", an e-commerce wine and beer website, to natural English.',
+    rules=(
+        'Use clear, concise UI English in sentence case',
+        'For buttons: imperative verbs',
+        'For settings: descriptive labels',
+        'For payment providers and brands: keep original names (Teya, Valitor)',
+        'For numbers: use a period as decimal separator (24.00 not 24,00)',
+        'For categories: use English equivalents (Vín->Wine, Bjór->Beer, Brennivín->Spirits)',
+    ),
+    glossary=tuple((target, en) for en, target in GLOSSARY),
+    output='Keys are grouped under [namespace] headers, optionally followed by the source files using them; '
+           'each line is "<id> <key suffix>", optionally followed by a tab and the Icelandic source text.\n'
+           'Return ONLY a JSON object mapping each id to its English translation, no other text.',
+    glossary_inline=True,
+)
+
+TEMPLATES = OrderedDict((template.name, template)
+                        for template in (KEY_TEMPLATE, COMPACT_TEMPLATE, COMPACT_EN_TEMPLATE))
+COMPACT_TEMPLATES = {'is': COMPACT_TEMPLATE, 'en': COMPACT_EN_TEMPLATE}
+
+
+def key_prompt(key):
+    """Per-key prompt: static prefix, then the key"""
+    return KEY_TEMPLATE.render(f'Key: {key}')
+
+
+# Prefix cache behaviour and prices per provider profile. A cached prefix is
+# matched in whole blocks of `block` tokens and only once it reaches
+# `min_tokens`; TTFT is base + prefill of the uncached tokens + a small
+# per-token cost for the cached ones. Prices are USD per million input tokens.
+PROFILES = OrderedDict([
+    # Local llama.cpp / Ollama server behind HttpBackend: KV cache reuse from the first token
+    ('llama.cpp', {'block': 1, 'min_tokens': 0, 'base_ms': 15.0, 'prefill_ms': 0.8, 'cached_ms': 0.02,
+                   'price': 0.0, 'cached_price': 0.0}),
+    # Hosted API with implicit prefix caching (Gemini / OpenAI style): 1024-token minimum, 128-token blocks
+    ('hosted', {'block': 128, 'min_tokens': 1024, 'base_ms': 250.0, 'prefill_ms': 0.15, 'cached_ms': 0.01,
+                'price': 0.30, 'cached_price': 0.075}),
+])
+
+BYTES_PER_TOKEN = 4  # same approximation as prompts.estimate_tokens without tiktoken
+
+
+class PrefixCache:
+    """Longest already-seen prompt prefix, in tokens, matched at block boundaries"""
+
+    def __init__(self, block=1, min_tokens=0):
+        self.block = max(1, block)
+        self.min_tokens = min_tokens
+        self._seen = set()
+
+    def tokens(self, prompt):
+        data = prompt.encode('utf-8')
+        return -(-len(data) // BYTES_PER_TOKEN), data
+
+    def lookup(self, prompt):
+        """(prompt tokens, cached tokens); remembers the prompt's prefixes for later calls"""
+        total, data = self.tokens(prompt)
+        step = self.block * BYTES_PER_TOKEN
+        cached = 0
+        missed = False
+        for end in range(step, len(data) + 1, step):
+            digest = hash(data[:end])
+            if not missed and digest in self._seen:
+                cached = end // BYTES_PER_TOKEN
+            else:
+                missed = True
+                self._seen.add(digest)
+        return total, cached if cached >= self.min_tokens else 0
+
+
+def replay(prompts, profile):
+    """TTFT and input cost of sending `prompts` in order to a provider with this profile"""
+    cache = PrefixCache(profile['block'], profile['min_tokens'])
+    ttfts = []
+    tokens = cached_tokens = 0
+    cost = 0.0
+    for prompt in prompts:
+        total, cached = cache.lookup(prompt)
+        tokens += total
+        cached_tokens += cached
+        ttfts.append(profile['base_ms'] + (total - cached) * profile['prefill_ms'] + cached * profile['cached_ms'])
+        cost += ((total - cached) * profile['price'] + cached * profile['cached_price']) / 1e6
+    ttfts.sort()
+    return {
+        'prompts': len(prompts),
+        'tokens': tokens,
+        'cachedTokens': cached_tokens,
+        'cachedShare': round(cached_tokens / tokens, 4) if tokens else 0.0,
+        'ttftMeanMs': round(sum(ttfts) / len(ttfts), 2) if ttfts else 0.0,
+        'ttftP95Ms': round(ttfts[int(0.95 * (len(ttfts) - 1))], 2) if ttfts else 0.0,
+        'costUsd': round(cost, 6),
+    }
+
+
+def benchmark(keys, profile, batch_size=50):
+    """{variant: replay()} for the legacy layouts and their templated replacements"""
+    from .prompts import chunked, encode_compact, legacy_batch_prompt, legacy_key_prompt
+
+    variants = OrderedDict([
+        ('per-key legacy', [legacy_key_prompt(key) for key in keys]),
+        ('per-key template', [key_prompt(key) for key in keys]),
+        ('batch-json legacy', [legacy_batch_prompt(chunk) for chunk in chunked(keys, batch_size)]),
+        ('compact template', [encode_compact(chunk).text for chunk in chunked(keys, batch_size)]),
+    ])
+    return OrderedDict((name, replay(prompts, profile)) for name, prompts in variants.items())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Versioned prompt templates and prefix-reuse benchmark')
+    parser.add_argument('--show', choices=list(TEMPLATES), help='print a compiled template prefix')
+    parser.add_argument('--benchmark', action='store_true', help='replay a catalog through a prefix cache model')
+    parser.add_argument('--keys', help='path to extracted-keys.json')
+    parser.add_argument('--profile', choices=list(PROFILES), action='append',
+                        help='provider profile (repeatable; default: all)')
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args(argv)
+
+    if args.show:
+        template = TEMPLATES[args.show]
+        print(f"# {template.tag} ({template.fingerprint}, {len(template.prefix.encode('utf-8'))} bytes)")
+        print(template.prefix, end='')
+        return
+    if not args.benchmark:
+        for template in TEMPLATES.values():
+            print(f"  {template.tag:<14} {template.fingerprint}  {len(template.prefix.encode('utf-8')):>5} bytes")
+        return
+
+    from .catalog import EXTRACTED_KEYS_FILE, load_extracted_keys
+
+    keys = [entry.key for entry in load_extracted_keys(args.keys or EXTRACTED_KEYS_FILE)]
+    report = OrderedDict((name, benchmark(keys, PROFILES[name], args.batch_size))
+                         for name in args.profile or PROFILES)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Prefix reuse for {len(keys)} keys (batch size {args.batch_size}):")
+    for name, variants in report.items():
+        print(f"\n[{name}]")
+        print(f"{'variant':<18} {'prompts':>8} {'tokens':>9} {'cached':>7} {'TTFT ms':>8} {'p95 ms':>8} {'USD':>9}")
+        for variant, row in variants.items():
+            print(f"{variant:<18} {row['prompts']:>8} {row['tokens']:>9} {row['cachedShare'] * 100:>6.1f}% "
+                  f"{row['ttftMeanMs']:>8} {row['ttftP95Ms']:>8} {row['costUsd']:>9.4f}")
+        for template in TEMPLATES.values():
+            prefix_tokens = -(-len(template.prefix.encode('utf-8')) // BYTES_PER_TOKEN)
+            if prefix_tokens < PROFILES[name]['min_tokens']:
+                print(f"⚠️  {template.tag} prefix is ~{prefix_tokens} tokens, under this profile's "
+                      f"{PROFILES[name]['min_tokens']}-token cache minimum: no reuse until it grows")
+        legacy, templated = variants['per-key legacy'], variants['per-key template']
+        if legacy['ttftMeanMs']:
+            print(f"per-key: {(1 - templated['ttftMeanMs'] / legacy['ttftMeanMs']) * 100:.1f}% lower mean TTFT, "
+                  f"{(1 - templated['costUsd'] / legacy['costUsd']) * 100 if legacy['costUsd'] else 0:.1f}% "
+                  f"lower input cost")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Size-based model tiering for translation work.
+
+Short UI labels (`addresses.add`, `common.save`) go to a fast, cheap model;
+long descriptions and help texts (`adminSettings.*Help`, `*Description`),
+marketing copy and keys whose answers failed validation before go to a
+stronger one. Each tier is its own backend (gemini -m <model>, claude
+--model <model>, or an HTTP model), and the pipeline reports calls, keys,
+tokens and throughput per tier.
+
+Validation history is kept in <out>/validation-history.json: a key that was
+rejected is sent to the strong tier on the next run, and forgotten once a
+translation for it is accepted.
+
+Usage:
+    python -m olfong_i18n.tiers [--keys extracted-keys.json] [--history translated-data/validation-history.json]
+"""
+
+import argparse
+import json
+import os
+from collections import Counter, OrderedDict
+from pathlib import Path
+
+from .backends import (API_KEY_ENV, DEFAULT_URL, URL_ENV, CliBackend, FakeBackend, FallbackBackend,
+                       HedgedBackend, HttpBackend)
+from .catalog import BACKEND_DIR, EXTRACTED_KEYS_FILE, load_extracted_keys
+
+TIERS = ('fast', 'strong')
+HISTORY_FILE = BACKEND_DIR / 'translated-data' / 'validation-history.json'
+
+FAST_MODEL_ENV = 'OLFONG_LLM_FAST_MODEL'
+STRONG_MODEL_ENV = 'OLFONG_LLM_STRONG_MODEL'
+TIER_MODELS = {
+    'gemini': {'fast': 'gemini-2.5-flash', 'strong': 'gemini-2.5-pro'},
+    'claude': {'fast': 'haiku', 'strong': 'sonnet'},
+    'http': {'fast': 'default', 'strong': 'default'},
+}
+
+# Last key segment endings that mean a sentence or more of text
+LONG_TEXT_SUFFIXES = (
+    'description', 'desc', 'help', 'helptext', 'message', 'msg', 'subtitle', 'tooltip', 'hint',
+    'note', 'warning', 'explanation', 'review', 'disclaimer',
+)
+STRONG_NAMESPACES = ('home.why', 'home.features', 'home.testimonials', 'demoData')
+LONG_SOURCE_CHARS = 60
+
+
+class TierPolicy:
+    """Chooses the fast or strong tier for each key"""
+
+    def __init__(self, history=None, long_source=LONG_SOURCE_CHARS, suffixes=LONG_TEXT_SUFFIXES,
+                 namespaces=STRONG_NAMESPACES, max_rejections=1):
+        self.history = history or {}
+        self.long_source = long_source
+        self.suffixes = tuple(suffixes)
+        self.namespaces = tuple(namespaces)
+        # Whole namespaces only: home.whyUs is not in home.why
+        self._namespace_prefixes = tuple(f'{namespace}.' for namespace in self.namespaces)
+        self.max_rejections = max_rejections
+
+    def tier_of(self, key, source=''):
+        if self.history.get(key, 0) >= self.max_rejections:
+            return 'strong'
+        if len(source or '') > self.long_source:
+            return 'strong'
+        if key in self.namespaces or key.startswith(self._namespace_prefixes):
+            return 'strong'
+        if key.rsplit('.', 1)[-1].lower().endswith(self.suffixes):
+            return 'strong'
+        return 'fast'
+
+    def split(self, entries, sources=None):
+        """[(tier, entries)] in TIERS order, skipping empty tiers"""
+        sources = sources or {}
+        buckets = {tier: [] for tier in TIERS}
+        for entry in entries:
+            buckets[self.tier_of(entry.key, sources.get(entry.key))].append(entry)
+        return [(tier, buckets[tier]) for tier in TIERS if buckets[tier]]
+
+
+def load_history(path=HISTORY_FILE):
+    """{key: times its answer was rejected}"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def update_history(path, rejected, accepted):
+    """Count new rejections and forget keys that have since been translated"""
+    path = Path(path)
+    history = load_history(path)
+    for key in rejected:
+        history[key] = history.get(key, 0) + 1
+    for key in accepted:
+        history.pop(key, None)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(OrderedDict(sorted(history.items())), f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+    return history
+
+
+def tier_model(name, tier):
+    env = FAST_MODEL_ENV if tier == 'fast' else STRONG_MODEL_ENV
+    return os.environ.get(env) or TIER_MODELS[name][tier]
+
+
+def create_tier_backends(name, timeout=60, pool_size=4):
+    """{tier: backend} for a backend name; `gemini+claude` hedges each tier across both"""
+    if '+' in name:
+        parts = [create_tier_backends(part, timeout, pool_size) for part in name.split('+')]
+        return OrderedDict((tier, HedgedBackend([part[tier] for part in parts], hedge_after=timeout / 4))
+                           for tier in TIERS)
+
+    backends = OrderedDict()
+    for tier in TIERS:
+        if name == 'gemini':
+            model = tier_model(name, tier)
+            backends[tier] = CliBackend(('gemini', '-m', model, '-p'), timeout, name=f'gemini:{model}')
+        elif name == 'claude':
+            model = tier_model(name, tier)
+            backends[tier] = CliBackend(('claude', '--model', model, '-p'), timeout, name=f'claude:{model}')
+        elif name == 'http':
+            model = tier_model(name, tier)
+            http = HttpBackend(os.environ.get(URL_ENV, DEFAULT_URL), model, pool_size, timeout,
+                               os.environ.get(API_KEY_ENV), name=f'http:{model}')
+            fallback = tier_model('gemini', tier)
+            backends[tier] = FallbackBackend(http, CliBackend(('gemini', '-m', fallback, '-p'), timeout,
+                                                              name=f'gemini:{fallback}'))
+        elif name == 'fake':
+            backends[tier] = FakeBackend(name=f'fake-{tier}')
+        else:
+            raise ValueError(f'Unknown backend: {name}')
+    return backends
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Show which model tier each key would use')
+    parser.add_argument('--keys', default=str(EXTRACTED_KEYS_FILE), help='path to extracted-keys.json')
+    parser.add_argument('--history', default=str(HISTORY_FILE), help='validation history')
+    parser.add_argument('--show', type=int, default=20, help='strong-tier keys to list')
+    args = parser.parse_args(argv)
+
+    policy = TierPolicy(load_history(args.history))
+    entries = load_extracted_keys(args.keys)
+    tiers = Counter(policy.tier_of(entry.key) for entry in entries)
+    print(f"📊 {len(entries)} keys: " + ', '.join(f"{tier} {tiers[tier]}" for tier in TIERS))
+    for entry in [e for e in entries if policy.tier_of(e.key) == 'strong'][:args.show]:
+        print(f"  strong  {entry.key}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,464 @@
+"""
+Shardable work queue for running one translation run across processes and hosts.
+
+A coordinator plans the run exactly like Pipeline.run (dedupe, lookup,
+surface/tier batching) and stores each planned batch as a chunk in a SQLite
+database. Any number of workers, on one box or several hosts sharing the
+database file, then pull chunks cooperatively:
+
+- claim() leases the lowest pending chunk for `lease` seconds inside a
+  BEGIN IMMEDIATE transaction, so two workers never hold the same chunk;
+- a Heartbeat thread extends the lease while the backend call runs;
+- a chunk whose lease expires (worker killed, host lost) is claimed again,
+  up to max_attempts, after which it is marked failed;
+- complete() only accepts the result of the current lease holder, so a
+  worker that lost its lease can't overwrite the retry's answer.
+
+merge rebuilds the cache lookups, takes chunk results in chunk order and
+emits through Pipeline.emit, so the output is identical whatever the number
+of workers or the order they finished in, and is recorded as a snapshot
+(see snapshots.py) like a single-process run. Several locales can share one
+queue; each run/locale is planned and merged on its own.
+
+Several hosts need the database on a filesystem with working POSIX locks
+(local disk, NFSv4) and roughly synchronized clocks (leases are wall-clock
+deadlines). Throughput scales with workers until the backend's own rate
+limits are reached; `bench` measures it against the FakeBackend.
+
+Usage:
+    python -m olfong_i18n.workqueue enqueue --db translated-data/queue.sqlite --run 2025-06-01 [--locale is]
+        [--keys extracted-keys.json] [--batch-dir translation-batches] [--tiers]
+    python -m olfong_i18n.workqueue work --db translated-data/queue.sqlite --run 2025-06-01 [--backend gemini]
+    python -m olfong_i18n.workqueue status --db translated-data/queue.sqlite --run 2025-06-01
+    python -m olfong_i18n.workqueue merge --db translated-data/queue.sqlite --run 2025-06-01 [--out translated-data]
+        [--snapshots translated-data/snapshots] [--no-snapshot]
+    python -m olfong_i18n.workqueue bench [--workers 1,2,4,8] [--size 1500] [--latency 0.05]
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from multiprocessing import Process
+from pathlib import Path
+
+from .backends import FakeBackend, create_backend
+from .batching import Batch, KeyGroup
+from .catalog import BACKEND_DIR, EXTRACTED_KEYS_FILE, KeyUsage
+from .events import EventLog
+from .metrics import RunMetrics
+from .pipeline import OUTPUT_DIR, Pipeline, RunResult, validate_translation
+from .tiers import TierPolicy, create_tier_backends
+
+QUEUE_FILE = BACKEND_DIR / 'translated-data' / 'queue.sqlite'
+DEFAULT_LEASE = 120.0
+DEFAULT_MAX_ATTEMPTS = 3
+POLL_SECONDS = 1.0
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS chunks (
+    run TEXT NOT NULL,
+    locale TEXT NOT NULL,
+    chunk INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    updated REAL,
+    PRIMARY KEY (run, locale, chunk)
+);
+CREATE INDEX IF NOT EXISTS chunks_state ON chunks (run, state, chunk);
+'''
+STATES = ('pending', 'leased', 'done', 'failed')
+
+
+@dataclass
+class Lease:
+    run: str
+    locale: str
+    chunk: int
+    payload: dict
+    worker: str
+    attempt: int
+
+
+def encode_batch(batch, sources=None):
+    """JSON-safe chunk payload for a planned Batch, with source text for its keys"""
+    sources = sources or {}
+    return {
+        'tier': batch.tier,
+        'groups': [{
+            'namespace': group.namespace,
+            'files': sorted(group.files),
+            'entries': [{'key': e.key, 'count': e.count, 'files': list(e.files), 'source': sources.get(e.key)}
+                        for e in group.entries],
+        } for group in batch.groups],
+    }
+
+
+def decode_batch(payload):
+    """(Batch, {key: source text}) from an encode_batch payload"""
+    batch = Batch(tier=payload.get('tier'))
+    sources = {}
+    for group in payload['groups']:
+        entries = []
+        for item in group['entries']:
+            entries.append(KeyUsage(item['key'], item.get('count', 0), list(item.get('files', []))))
+            if item.get('source'):
+                sources[item['key']] = item['source']
+        batch.groups.append(KeyGroup(group['namespace'], entries, set(group.get('files', []))))
+        batch.count += len(entries)
+    return batch, sources
+
+
+class WorkQueue:
+    """Chunks of a translation run in SQLite, leased to workers"""
+
+    def __init__(self, path=QUEUE_FILE, lease=DEFAULT_LEASE, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self._local = threading.local()  # sqlite3 connections are per thread
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db().executescript(SCHEMA)
+
+    def _db(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(str(self.path), timeout=60, isolation_level=None)
+            self._local.db = db
+        return db
+
+    def _write(self, sql, params=()):
+        return self._db().execute(sql, params).rowcount
+
+    def enqueue(self, run, locale, payloads):
+        """Add chunks 1..n for a run/locale; chunks already queued are left alone"""
+        db = self._db()
+        now = time.time()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            db.executemany(
+                'INSERT OR IGNORE INTO chunks (run, locale, chunk, payload, updated) VALUES (?, ?, ?, ?, ?)',
+                [(run, locale, index, json.dumps(payload, ensure_ascii=False), now)
+                 for index, payload in enumerate(payloads, 1)])
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        return len(payloads)
+
+    def claim(self, run, worker):
+        """Lease the lowest pending (or expired) chunk of a run; None when there is nothing to claim now"""
+        db = self._db()
+        now = time.time()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            db.execute("UPDATE chunks SET state = 'failed', error = 'lease expired', updated = ? "
+                       "WHERE run = ? AND state = 'leased' AND lease_until < ? AND attempts >= ?",
+                       (now, run, now, self.max_attempts))
+            row = db.execute("SELECT locale, chunk, payload, attempts FROM chunks "
+                             "WHERE run = ? AND (state = 'pending' OR (state = 'leased' AND lease_until < ?)) "
+                             "ORDER BY chunk, locale LIMIT 1", (run, now)).fetchone()
+            if row is None:
+                db.execute('COMMIT')
+                return None
+            locale, chunk, payload, attempts = row
+            db.execute("UPDATE chunks SET state = 'leased', worker = ?, lease_until = ?, attempts = ?, updated = ? "
+                       "WHERE run = ? AND locale = ? AND chunk = ?",
+                       (worker, now + self.lease, attempts + 1, now, run, locale, chunk))
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        return Lease(run, locale, chunk, json.loads(payload), worker, attempts + 1)
+
+    def _owned(self):
+        return "WHERE run = ? AND locale = ? AND chunk = ? AND worker = ? AND attempts = ? AND state = 'leased'"
+
+    def _lease_key(self, lease):
+        return (lease.run, lease.locale, lease.chunk, lease.worker, lease.attempt)
+
+    def heartbeat(self, lease):
+        """Extend a lease; False when it was lost to another worker"""
+        now = time.time()
+        return self._write(f'UPDATE chunks SET lease_until = ?, updated = ? {self._owned()}',
+                           (now + self.lease, now) + self._lease_key(lease)) == 1
+
+    def complete(self, lease, result):
+        """Store a chunk's {key: value or None}; False (and nothing stored) when the lease was lost"""
+        return self._write(f"UPDATE chunks SET state = 'done', result = ?, error = NULL, updated = ? {self._owned()}",
+                           (json.dumps(result, ensure_ascii=False), time.time()) + self._lease_key(lease)) == 1
+
+    def fail(self, lease, error):
+        """Give a chunk back for another attempt, or mark it failed after max_attempts"""
+        state = 'failed' if lease.attempt >= self.max_attempts else 'pending'
+        return self._write(f'UPDATE chunks SET state = ?, error = ?, lease_until = NULL, updated = ? {self._owned()}',
+                           (state, str(error), time.time()) + self._lease_key(lease)) == 1
+
+    def status(self, run):
+        """{locale: {state: chunks}}"""
+        status = OrderedDict()
+        for locale, state, count in self._db().execute(
+                'SELECT locale, state, COUNT(*) FROM chunks WHERE run = ? GROUP BY locale, state ORDER BY locale',
+                (run,)):
+            status.setdefault(locale, Counter())[state] = count
+        return status
+
+    def open_chunks(self, run):
+        """Chunks still pending or leased (expired leases included)"""
+        return self._db().execute("SELECT COUNT(*) FROM chunks WHERE run = ? AND state IN ('pending', 'leased')",
+                                  (run,)).fetchone()[0]
+
+    def results(self, run, locale):
+        """({key: value or None}, [keys of failed or unfinished chunks]) merged in chunk order"""
+        merged = OrderedDict()
+        missing = []
+        for payload, state, result in self._db().execute(
+                'SELECT payload, state, result FROM chunks WHERE run = ? AND locale = ? ORDER BY chunk',
+                (run, locale)):
+            if state != 'done':
+                batch, _ = decode_batch(json.loads(payload))
+                missing.extend(batch.keys)
+                continue
+            for key, value in json.loads(result).items():
+                merged.setdefault(key, value)  # first chunk wins if a key was ever queued twice
+        return merged, missing
+
+    def close(self):
+        db = getattr(self._local, 'db', None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+
+class Heartbeat:
+    """Extends a lease every lease/3 seconds while a chunk is being worked on"""
+
+    def __init__(self, queue, lease):
+        self.queue = queue
+        self.lease = lease
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, daemon=True)
+
+    def _beat(self):
+        try:
+            while not self._stop.wait(self.queue.lease / 3):
+                if not self.queue.heartbeat(self.lease):
+                    self.lost = True
+                    return
+        finally:
+            self.queue.close()  # this thread's connection
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+
+def plan_run(queue, run, locale='is', keys_file=EXTRACTED_KEYS_FILE, batch_dir=None, tiers=False,
+             entries=None, sources=None):
+    """Plan a run like Pipeline.run and enqueue its batches; (chunks, keys resolved without a call)"""
+    policy = TierPolicy() if tiers else None
+    pipeline = Pipeline(None, locale=locale, compress=False, sources=sources, policy=policy)
+    if entries is None:
+        entries, existing = pipeline.load(keys_file, batch_dir)
+    else:
+        existing = {}
+    _, _, pending = pipeline.lookup(pipeline.dedupe(entries), existing)
+    batches = pipeline.plan(pending)
+    queue.enqueue(run, locale, [encode_batch(batch, pipeline.sources) for batch in batches])
+    return len(batches), len(entries) - len(pending)
+
+
+def work(queue, run, backend=None, tiers=None, worker=None, poll=POLL_SECONDS, events=None):
+    """Claim and translate chunks until the run has none left; Counter of what this worker did"""
+    worker = worker or f'{socket.gethostname()}:{os.getpid()}'
+    events = events or EventLog.from_env()
+    pipelines = {}
+    done = Counter()
+    while True:
+        lease = queue.claim(run, worker)
+        if lease is None:
+            if not queue.open_chunks(run):
+                return done
+            time.sleep(poll)  # other workers hold the rest; wait for them to finish or their leases to expire
+            continue
+        pipeline = pipelines.get(lease.locale)
+        if pipeline is None:
+            pipeline = pipelines[lease.locale] = Pipeline(backend, locale=lease.locale, tiers=tiers, events=events,
+                                                          compress=False, retry_delay=0.5)
+        batch, sources = decode_batch(lease.payload)
+        if not tiers:
+            batch.tier = None
+        pipeline.sources.update(sources)
+        events.emit('queue.claimed', worker=worker, chunk=lease.chunk, locale=lease.locale, attempt=lease.attempt)
+        with Heartbeat(queue, lease) as beat:
+            answers, ok = pipeline.send_batch(batch, chunk=lease.chunk)
+        if not ok:
+            queue.fail(lease, 'backend gave up')
+            done['failed'] += 1
+            if pipeline.budget.exhausted:
+                events.emit('queue.stopped', worker=worker, reason='quota exceeded')
+                return done  # the backend's quota is shared; leave the rest to workers with quota left
+            continue
+        result = {key: validate_translation(key, answers.get(key)) for key in batch.keys}
+        if beat.lost or not queue.complete(lease, result):
+            done['lost'] += 1  # another worker owns the retry; its answer is the one kept
+            events.emit('queue.lost', worker=worker, chunk=lease.chunk, locale=lease.locale)
+            continue
+        done['chunks'] += 1
+        done['keys'] += len(result)
+        events.emit('queue.completed', worker=worker, chunk=lease.chunk, locale=lease.locale, keys=len(result))
+
+
+def merge_run(queue, run, locale='is', out=OUTPUT_DIR, keys_file=EXTRACTED_KEYS_FILE, batch_dir=None,
+              snapshots=None):
+    """Emit the merged run like Pipeline.run + emit; returns (RunResult, pipeline)
+
+    With a SnapshotStore the merged catalog is recorded under the queue's run id.
+    """
+    pipeline = Pipeline(None, metrics=RunMetrics(run), locale=locale, snapshots=snapshots)
+    entries, existing = pipeline.load(keys_file, batch_dir)
+    usage = {entry.key: entry for entry in entries}
+    resolved, origins, _ = pipeline.lookup(pipeline.dedupe(entries), existing)
+    result = RunResult(resolved, origins)
+    answers, missing = queue.results(run, locale)
+    for key in sorted(answers):
+        value = answers[key]
+        if value is None:
+            result.origins[key] = 'fallback'
+        else:
+            result.translations[key] = value
+            result.origins[key] = 'llm'
+    for key in missing:
+        result.origins[key] = 'deferred'
+    if missing:
+        result.stop_reason = 'chunks not finished'
+    pipeline.emit(result, out, usage=usage)
+    pipeline.close()
+    return result, pipeline
+
+
+def _bench_worker(path, run, latency, index):
+    queue = WorkQueue(path)
+    work(queue, run, FakeBackend(latency=latency, seed=index), worker=f'bench-{index}', poll=0.05,
+         events=EventLog())
+
+
+def bench(workers=(1, 2, 4, 8), size=1500, latency=0.05, max_keys=25):
+    """keys/sec for each worker count, against a FakeBackend with `latency` seconds per call"""
+    from .bench import synthetic_catalog
+
+    entries, sources = synthetic_catalog(size)
+    results = []
+    for count in workers:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'queue.sqlite'
+            queue = WorkQueue(path)
+            pipeline = Pipeline(None, compress=False, max_keys=max_keys, sources=sources)
+            _, _, pending = pipeline.lookup(pipeline.dedupe(entries), {})
+            batches = pipeline.plan(pending)
+            queue.enqueue('bench', 'is', [encode_batch(batch, sources) for batch in batches])
+            start = time.perf_counter()
+            processes = [Process(target=_bench_worker, args=(str(path), 'bench', latency, i)) for i in range(count)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            seconds = time.perf_counter() - start
+            answers, missing = queue.results('bench', 'is')
+            results.append({'workers': count, 'chunks': len(batches), 'keys': len(answers), 'missing': len(missing),
+                            'seconds': round(seconds, 3), 'keysPerSecond': round(len(answers) / seconds, 1)})
+    for result in results:
+        result['speedup'] = round(result['keysPerSecond'] / results[0]['keysPerSecond'], 2)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Shard a translation run across workers')
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name in ('enqueue', 'work', 'status', 'merge'):
+        command = sub.add_parser(name)
+        command.add_argument('--db', default=str(QUEUE_FILE), help='queue database (shared between workers)')
+        command.add_argument('--run', required=True, help='run id; enqueue is idempotent per run')
+        command.add_argument('--lease', type=float, default=DEFAULT_LEASE, help='lease seconds')
+    enqueue, worker, _, merge = (sub.choices[name] for name in ('enqueue', 'work', 'status', 'merge'))
+    for command in (enqueue, merge):
+        command.add_argument('--locale', default='is')
+        command.add_argument('--keys', default=str(EXTRACTED_KEYS_FILE), help='path to extracted-keys.json')
+        command.add_argument('--batch-dir', help="existing batch translations (default: the locale's batch directory)")
+    enqueue.add_argument('--tiers', action='store_true', help='plan fast/strong tier batches')
+    worker.add_argument('--backend', default='gemini', help='gemini, claude, http, fake or a+b')
+    worker.add_argument('--tiers', action='store_true', help='send tier batches to fast/strong models')
+    worker.add_argument('--worker-id', help='default: <hostname>:<pid>')
+    merge.add_argument('--out', default=str(OUTPUT_DIR), help='output directory')
+    merge.add_argument('--snapshots', help='snapshot store (default: <out>/snapshots; see snapshots.py)')
+    merge.add_argument('--no-snapshot', action='store_true', help='do not record a snapshot of the merged run')
+    bench_cmd = sub.add_parser('bench', help='measure throughput for several worker counts')
+    bench_cmd.add_argument('--workers', default='1,2,4,8')
+    bench_cmd.add_argument('--size', type=int, default=1500, help='synthetic keys')
+    bench_cmd.add_argument('--latency', type=float, default=0.05, help='FakeBackend seconds per call')
+    bench_cmd.add_argument('--max-keys', type=int, default=25, help='keys per chunk')
+    args = parser.parse_args(argv)
+
+    if args.command == 'bench':
+        results = bench([int(w) for w in args.workers.split(',') if w], args.size, args.latency, args.max_keys)
+        print(f"{'workers':>7} {'chunks':>7} {'keys':>6} {'seconds':>8} {'keys/s':>9} {'speedup':>8}")
+        for r in results:
+            print(f"{r['workers']:>7} {r['chunks']:>7} {r['keys']:>6} {r['seconds']:>8} {r['keysPerSecond']:>9} "
+                  f"{r['speedup']:>7}x")
+        return 0
+
+    queue = WorkQueue(args.db, lease=args.lease)
+    if args.command == 'enqueue':
+        chunks, resolved = plan_run(queue, args.run, args.locale, args.keys, args.batch_dir, args.tiers)
+        print(f"✅ {args.run}/{args.locale}: {chunks} chunks queued, {resolved} keys resolved without a call")
+    elif args.command == 'work':
+        if args.tiers:
+            tiers = create_tier_backends(args.backend)
+            backend = tiers['fast']
+        else:
+            tiers = None
+            backend = create_backend(args.backend)
+        done = work(queue, args.run, backend, tiers, args.worker_id)
+        for used in (tiers or {'': backend}).values():
+            if hasattr(used, 'close'):
+                used.close()
+        print(f"✅ {done['chunks']} chunks ({done['keys']} keys) done, {done['failed']} failed, "
+              f"{done['lost']} lost to expired leases", file=sys.stderr)
+    elif args.command == 'status':
+        for locale, states in queue.status(args.run).items():
+            print(f"📊 {args.run}/{locale}: " + ', '.join(f"{state} {states[state]}" for state in STATES))
+    else:
+        snapshots = None
+        if not args.no_snapshot:
+            from .snapshots import SnapshotStore
+
+            snapshots = SnapshotStore(args.snapshots or Path(args.out) / 'snapshots')
+        result, _ = merge_run(queue, args.run, args.locale, args.out, args.keys, args.batch_dir, snapshots)
+        print(f"✅ Merged {len(result.translations)}/{len(result.origins)} keys "
+              f"({len(result.fallbacks)} fallback, {len(result.deferred)} in unfinished chunks) into {args.out}")
+        if snapshots is not None:
+            print(f"  snapshot {snapshots.heads()[args.locale]['id']}; diff or roll back with "
+                  f"python -m olfong_i18n.snapshots --dir {snapshots.root}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,5 @@
+-- AlterTable
+ALTER TABLE "Lang" ADD COLUMN     "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP;
+
+-- CreateIndex
+CREATE INDEX "Lang_updatedAt_idx" ON "Lang"("updatedAt");
@@ -0,0 +1,74 @@
+const fs = require('fs');
+const readline = require('readline');
+const { PrismaClient } = require('@prisma/client');
+const prisma = new PrismaClient();
+
+// Applies the content translations written by `python -m olfong_i18n.content`
+// (one {entity, id, data} JSON object per line), replacing the ad-hoc
+// update-*-descriptions.js scripts.
+// Usage: node scripts/apply-content-updates.js <content-updates.ndjson> [--dry-run]
+
+const CHUNK_SIZE = 100;
+
+// Export array name -> Prisma model delegate
+const MODELS = {
+  categories: 'category',
+  subcategories: 'subcategory',
+  products: 'product',
+  banners: 'banner',
+  pages: 'page',
+  shippingOptions: 'shippingOption',
+  vatProfiles: 'vatProfile',
+  paymentGateways: 'paymentGateway'
+};
+
+async function applyChunk(chunk) {
+  await prisma.$transaction(chunk.map(update =>
+    prisma[MODELS[update.entity]].update({ where: { id: update.id }, data: update.data })
+  ));
+  return chunk.length;
+}
+
+async function applyContentUpdates(file, dryRun) {
+  const lines = readline.createInterface({ input: fs.createReadStream(file, 'utf8'), crlfDelay: Infinity });
+  const byEntity = {};
+  let chunk = [];
+  let applied = 0;
+
+  for await (const line of lines) {
+    if (!line.trim()) continue;
+    const update = JSON.parse(line);
+    if (!MODELS[update.entity]) {
+      console.log(`⚠️  Skipping unknown entity ${update.entity} (id ${update.id})`);
+      continue;
+    }
+    byEntity[update.entity] = (byEntity[update.entity] || 0) + 1;
+    if (dryRun) {
+      if (applied++ < 20) {
+        console.log(`  would update ${update.entity} ${update.id}:`, Object.keys(update.data).join(', '));
+      }
+      continue;
+    }
+    chunk.push(update);
+    if (chunk.length >= CHUNK_SIZE) {
+      applied += await applyChunk(chunk);
+      chunk = [];
+    }
+  }
+  if (!dryRun && chunk.length) applied += await applyChunk(chunk);
+
+  console.log(dryRun ? `Dry run: ${applied} updates` : `✅ Applied ${applied} content updates`, byEntity);
+}
+
+const [file] = process.argv.slice(2).filter(arg => !arg.startsWith('--'));
+if (!file) {
+  console.error('Usage: node scripts/apply-content-updates.js <content-updates.ndjson> [--dry-run]');
+  process.exit(1);
+}
+
+applyContentUpdates(file, process.argv.includes('--dry-run'))
+  .catch(error => {
+    console.error('Error applying content updates:', error);
+    process.exitCode = 1;
+  })
+  .finally(() => prisma.$disconnect());
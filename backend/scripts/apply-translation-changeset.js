@@ -0,0 +1,67 @@
+const fs = require('fs');
+const { PrismaClient } = require('@prisma/client');
+const prisma = new PrismaClient();
+
+// Applies a change set written by `python -m olfong_i18n.prune --changeset <file>` (deletes by id)
+// or `python -m olfong_i18n.snapshots rollback <snapshot> --changeset <file>` (upserts, deletes by key and locale).
+// Usage: node scripts/apply-translation-changeset.js <changeset.json> [--dry-run]
+
+const CHUNK_SIZE = 500;
+
+async function applyChangeset(file, dryRun) {
+  const changeset = JSON.parse(fs.readFileSync(file, 'utf8'));
+  const deletes = changeset.deletes || [];
+  const upserts = changeset.upserts || [];
+  const ids = deletes.map(d => d.id).filter(Boolean);
+  const byKey = deletes.filter(d => !d.id);
+
+  const byReason = deletes.reduce((acc, d) => {
+    acc[d.reason] = (acc[d.reason] || 0) + 1;
+    return acc;
+  }, {});
+  console.log(`Change set from ${changeset.createdAt}: ${upserts.length} upserts, ${deletes.length} deletes`, byReason);
+
+  if (dryRun) {
+    upserts.slice(0, 20).forEach(u => console.log(`  would set ${u.locale} ${u.key} = ${u.value}`));
+    if (upserts.length > 20) console.log(`  ... and ${upserts.length - 20} more`);
+    deletes.slice(0, 20).forEach(d => console.log(`  would delete ${d.locale} ${d.key} (${d.reason})`));
+    if (deletes.length > 20) console.log(`  ... and ${deletes.length - 20} more`);
+    return;
+  }
+
+  let deleted = 0;
+  for (let i = 0; i < ids.length; i += CHUNK_SIZE) {
+    const result = await prisma.lang.deleteMany({
+      where: { id: { in: ids.slice(i, i + CHUNK_SIZE) } }
+    });
+    deleted += result.count;
+  }
+  for (let i = 0; i < byKey.length; i += CHUNK_SIZE) {
+    const result = await prisma.lang.deleteMany({
+      where: { OR: byKey.slice(i, i + CHUNK_SIZE).map(d => ({ key: d.key, locale: d.locale })) }
+    });
+    deleted += result.count;
+  }
+
+  for (let i = 0; i < upserts.length; i += CHUNK_SIZE) {
+    await prisma.$transaction(upserts.slice(i, i + CHUNK_SIZE).map(u => prisma.lang.upsert({
+      where: { key_locale: { key: u.key, locale: u.locale } },
+      update: { value: u.value },
+      create: { key: u.key, locale: u.locale, value: u.value }
+    })));
+  }
+  console.log(`✅ Upserted ${upserts.length} and deleted ${deleted} translation rows`);
+}
+
+const [file] = process.argv.slice(2).filter(arg => !arg.startsWith('--'));
+if (!file) {
+  console.error('Usage: node scripts/apply-translation-changeset.js <changeset.json> [--dry-run]');
+  process.exit(1);
+}
+
+applyChangeset(file, process.argv.includes('--dry-run'))
+  .catch(error => {
+    console.error('Error applying change set:', error);
+    process.exitCode = 1;
+  })
+  .finally(() => prisma.$disconnect());
@@ -1,3 +1,5 @@
+// Legacy fixed-size planner; python -m olfong_i18n.batching writes namespace-aware batches
+// in the same layout.
 const fs = require('fs');
 const path = require('path');
 
@@ -64,6 +64,138 @@ class TranslationController {
     }
   }
 
+  /**
+   * GET /api/translations/manifest - Bundle hashes per locale; revalidated on every load
+   */
+  async getBundleManifest(req, res) {
+    try {
+      const manifest = await translationService.getBundleManifest();
+      res.set('Cache-Control', 'no-cache');
+      res.json(manifest);
+    } catch (error) {
+      console.error('Error in getBundleManifest:', error);
+      res.status(500).json({
+        success: false,
+        error: 'Failed to fetch translation manifest',
+        details: error.message
+      });
+    }
+  }
+
+  /**
+   * GET /api/translations/areas - Area bundle hashes and the areas each route needs
+   * 404 when the pipeline hasn't built area bundles (or they are stale); clients use the full bundle
+   */
+  async getAreaManifest(req, res) {
+    try {
+      const manifest = await translationService.getAreaManifest();
+      res.set('Cache-Control', 'no-cache');
+      if (!manifest) {
+        return res.status(404).json({
+          success: false,
+          error: 'No area bundles available'
+        });
+      }
+      res.json(manifest);
+    } catch (error) {
+      console.error('Error in getAreaManifest:', error);
+      res.status(500).json({
+        success: false,
+        error: 'Failed to fetch translation area manifest',
+        details: error.message
+      });
+    }
+  }
+
+  /**
+   * GET /api/translations/areas/:area/:locale/:hash? - Nested i18next bundle for one area of the app
+   * Query params: ?format=interned for the string-table encoding (plain when none was built)
+   */
+  async getAreaBundle(req, res) {
+    try {
+      const { area, locale, hash } = req.params;
+      if (!/^[a-z]+$/.test(area) || !/^[a-z]{2}$/.test(locale) || (hash && !/^[0-9a-f]{12}$/.test(hash))) {
+        return res.status(400).json({
+          success: false,
+          error: 'Invalid area, locale or bundle hash'
+        });
+      }
+
+      res.set('Vary', 'Accept-Encoding');
+      const prebuilt = await translationService.resolveBundleFile(locale, hash || null, req.get('Accept-Encoding') || '', {
+        area,
+        interned: req.query.format === 'interned'
+      });
+      if (!prebuilt) {
+        return res.status(404).json({
+          success: false,
+          error: 'Area bundle not found'
+        });
+      }
+
+      if (prebuilt.encoding) res.set('Content-Encoding', prebuilt.encoding);
+      res.set('Cache-Control', hash ? 'public, max-age=31536000, immutable' : 'no-cache');
+      res.type('application/json');
+      res.sendFile(prebuilt.file, { cacheControl: false });
+    } catch (error) {
+      console.error('Error in getAreaBundle:', error);
+      res.status(500).json({
+        success: false,
+        error: 'Failed to fetch translation area bundle',
+        details: error.message
+      });
+    }
+  }
+
+  /**
+   * GET /api/translations/bundle/:locale/:hash? - Nested i18next bundle for a locale
+   * Hashed URLs never change content and are cached as immutable.
+   * Query params: ?format=interned for the string-table encoding (plain when none was built)
+   */
+  async getBundle(req, res) {
+    try {
+      const { locale, hash } = req.params;
+      if (!/^[a-z]{2}$/.test(locale) || (hash && !/^[0-9a-f]{12}$/.test(hash))) {
+        return res.status(400).json({
+          success: false,
+          error: 'Invalid locale or bundle hash'
+        });
+      }
+
+      const cacheControl = hash ? 'public, max-age=31536000, immutable' : 'no-cache';
+      res.set('Vary', 'Accept-Encoding');
+
+      // Precompressed artifacts from the pipeline: no per-request compression work
+      const prebuilt = await translationService.resolveBundleFile(locale, hash || null, req.get('Accept-Encoding') || '', {
+        interned: req.query.format === 'interned'
+      });
+      if (prebuilt) {
+        if (prebuilt.encoding) res.set('Content-Encoding', prebuilt.encoding);
+        res.set('Cache-Control', cacheControl);
+        res.type('application/json');
+        return res.sendFile(prebuilt.file, { cacheControl: false });
+      }
+
+      const bundle = await translationService.getBundle(locale, hash || null);
+      if (bundle === null) {
+        return res.status(404).json({
+          success: false,
+          error: 'Bundle version not found'
+        });
+      }
+
+      res.set('Cache-Control', cacheControl);
+      res.type('application/json').send(bundle);
+    } catch (error) {
+      console.error('Error in getBundle:', error);
+      res.status(500).json({
+        success: false,
+        error: 'Failed to fetch translation bundle',
+        details: error.message
+      });
+    }
+  }
+
   /**
    * GET /api/translations/:key - Get single translation by key
    * Query params: ?locale=is|en
@@ -23,6 +23,20 @@ router.get('/stats', translationController.getStats);
 // Query params: ?format=json|csv&locale=is|en
 router.get('/export', authenticate, authorize(), translationController.exportTranslations);
 
+// GET /api/translations/manifest - Bundle manifest { version, locales: { is: { hash, file, bytes } } }
+router.get('/manifest', translationController.getBundleManifest);
+
+// GET /api/translations/bundle/:locale/:hash? - Pre-nested i18next bundle (minified JSON object)
+// With a hash the response is immutable and cached for a year; ?format=interned for the string-table encoding
+router.get('/bundle/:locale/:hash?', translationController.getBundle);
+
+// GET /api/translations/areas - Area bundle manifest { version, areas: { admin: { is: { hash, file } } }, routes }
+router.get('/areas', translationController.getAreaManifest);
+
+// GET /api/translations/areas/:area/:locale/:hash? - Bundle for one area (common, storefront, checkout, admin)
+// Query params: ?format=interned
+router.get('/areas/:area/:locale/:hash?', translationController.getAreaBundle);
+
 // GET /api/translations/:key - Get single translation by key
 // Query params: ?locale=is|en
 router.get('/:key', translationController.getTranslation);
@@ -0,0 +1,94 @@
+const http = require('http');
+const https = require('https');
+const { execFile } = require('child_process');
+const axios = require('axios');
+
+/**
+ * LLM client for translation requests.
+ *
+ * When LLM_API_URL points at an OpenAI-compatible chat completions endpoint
+ * (local llama.cpp / Ollama server or a proxy), requests are multiplexed over
+ * a pool of keep-alive sockets, so process startup and auth are not paid per
+ * string. Without it, or while the endpoint is unreachable, each request falls
+ * back to spawning `claude -p`.
+ */
+class LlmClient {
+  constructor(config = {}) {
+    this.apiUrl = config.apiUrl || process.env.LLM_API_URL || null;
+    this.model = config.model || process.env.LLM_MODEL || 'default';
+    this.apiKey = config.apiKey || process.env.LLM_API_KEY || null;
+    this.concurrency = parseInt(config.concurrency || process.env.LLM_CONCURRENCY || '4', 10);
+    this.timeout = config.timeout || 30000;
+    this.retryAfter = config.retryAfter || 30000;
+    this.downUntil = 0;
+
+    if (this.apiUrl) {
+      const agentOptions = { keepAlive: true, maxSockets: this.concurrency };
+      this.client = axios.create({
+        timeout: this.timeout,
+        httpAgent: new http.Agent(agentOptions),
+        httpsAgent: new https.Agent(agentOptions),
+        headers: { 'Content-Type': 'application/json' }
+      });
+    }
+  }
+
+  /**
+   * True when requests go over the pooled endpoint (no per-call spawn)
+   */
+  get pooled() {
+    return Boolean(this.apiUrl) && Date.now() >= this.downUntil;
+  }
+
+  /**
+   * Complete a prompt; resolves to the trimmed response text
+   */
+  async complete(prompt) {
+    if (this.pooled) {
+      try {
+        return await this.completeHttp(prompt);
+      } catch (error) {
+        if (error.response) {
+          // The endpoint answered (4xx/5xx, e.g. 429); don't mask it with the CLI
+          throw error;
+        }
+        console.error(`LLM endpoint unreachable, falling back to claude CLI: ${error.message}`);
+        this.downUntil = Date.now() + this.retryAfter;
+      }
+    }
+    return this.completeCli(prompt);
+  }
+
+  async completeHttp(prompt) {
+    const headers = this.apiKey ? { Authorization: `Bearer ${this.apiKey}` } : {};
+    const response = await this.client.post(this.apiUrl, {
+      model: this.model,
+      messages: [{ role: 'user', content: prompt }],
+      temperature: 0
+    }, { headers });
+    const content = response.data?.choices?.[0]?.message?.content;
+    return (content || '').trim();
+  }
+
+  /**
+   * Spawn-per-call fallback; the prompt is passed as an argument, not through a shell
+   */
+  completeCli(prompt) {
+    return new Promise((resolve, reject) => {
+      execFile('claude', ['-p', prompt, '--dangerously-skip-permissions'], {
+        encoding: 'utf8',
+        maxBuffer: 10 * 1024 * 1024,
+        timeout: this.timeout
+      }, (error, stdout) => {
+        if (error) {
+          reject(error);
+        } else {
+          resolve(stdout.trim());
+        }
+      });
+    });
+  }
+}
+
+module.exports = new LlmClient();
+module.exports.LlmClient = LlmClient;
@@ -0,0 +1,89 @@
+const http = require('http');
+const readline = require('readline');
+
+/**
+ * Client for the Python translation daemon (`python -m olfong_i18n.daemon`).
+ *
+ * The daemon coalesces requests arriving within a short window into batched
+ * backend calls and shares identical in-flight items between requests, so
+ * many admin clicks cost a few LLM calls instead of one process per item.
+ * Set TRANSLATION_DAEMON_SOCKET (Unix socket path) or TRANSLATION_DAEMON_URL
+ * (e.g. http://127.0.0.1:8765) to use it; unset, or while the daemon is not
+ * running, callers fall back to llmClient.
+ */
+class TranslationDaemonClient {
+  constructor(config = {}) {
+    this.socketPath = config.socketPath || process.env.TRANSLATION_DAEMON_SOCKET || null;
+    this.url = config.url || process.env.TRANSLATION_DAEMON_URL || null;
+    this.timeout = config.timeout || 10 * 60 * 1000;
+  }
+
+  get configured() {
+    return Boolean(this.socketPath || this.url);
+  }
+
+  /**
+   * True for errors meaning the daemon isn't there (so the caller should fall back)
+   */
+  isUnavailable(error) {
+    return ['ECONNREFUSED', 'ENOENT', 'ECONNRESET', 'EHOSTUNREACH'].includes(error.code);
+  }
+
+  requestOptions(method, path) {
+    if (this.socketPath) {
+      return { socketPath: this.socketPath, method, path };
+    }
+    const url = new URL(path, this.url);
+    return { hostname: url.hostname, port: url.port, method, path: url.pathname };
+  }
+
+  /**
+   * Translate items ([{ key, value }]); onEvent receives every streamed event
+   * ({ type: 'log' | 'error' | 'result' | 'done', ... }). Resolves to
+   * { translations: { key: value }, errors: { key: message }, done }.
+   */
+  translate(sourceLocale, targetLocale, items, onEvent = null) {
+    const body = JSON.stringify({ sourceLocale, targetLocale, items });
+    const options = this.requestOptions('POST', '/translate');
+    options.headers = { 'Content-Type': 'application/json', 'Content-Length': Buffer.byteLength(body) };
+    options.timeout = this.timeout;
+
+    return new Promise((resolve, reject) => {
+      const req = http.request(options, async (res) => {
+        if (res.statusCode !== 200) {
+          let text = '';
+          for await (const chunk of res) text += chunk;
+          reject(new Error(`Translation daemon: HTTP ${res.statusCode} ${text}`));
+          return;
+        }
+        const translations = {};
+        const errors = {};
+        let done = null;
+        try {
+          for await (const line of readline.createInterface({ input: res, crlfDelay: Infinity })) {
+            if (!line.trim()) continue;
+            const event = JSON.parse(line);
+            if (event.type === 'result') translations[event.key] = event.value;
+            else if (event.type === 'error' && event.key) errors[event.key] = event.message;
+            else if (event.type === 'done') done = event;
+            if (onEvent) onEvent(event);
+          }
+        } catch (error) {
+          reject(error);
+          return;
+        }
+        if (!done) {
+          reject(new Error('Translation daemon closed the stream before finishing'));
+          return;
+        }
+        resolve({ translations, errors, done });
+      });
+      req.on('timeout', () => req.destroy(new Error('Translation daemon timed out')));
+      req.on('error', reject);
+      req.end(body);
+    });
+  }
+}
+
+module.exports = new TranslationDaemonClient();
+module.exports.TranslationDaemonClient = TranslationDaemonClient;
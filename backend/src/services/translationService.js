@@ -1,8 +1,52 @@
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
 const { PrismaClient } = require('@prisma/client');
+const llmClient = require('./llmClient');
+const translationDaemon = require('./translationDaemon');
+const { parseBundle } = require('../utils/translationBundle');
 
 const prisma = new PrismaClient();
 
+// Pre-nested i18next bundles written by the Python pipeline (olfong_i18n.bundles)
+const BUNDLE_DIR = process.env.TRANSLATION_BUNDLE_DIR || path.join(__dirname, '../../translated-data/bundles');
+const BUNDLE_LOCALES = ['is', 'en'];
+// Per-area bundles (olfong_i18n.areas): bundles/<area>/<locale>.<hash>.json, listed in bundles/areas.json
+const BUNDLE_AREAS = ['common', 'storefront', 'checkout', 'admin'];
+const HASH_LENGTH = 12;
+// Leaf key holding the string of a key that is also a namespace (olfong_i18n.bundles.LEAF_KEY)
+const LEAF_KEY = '_';
+// Last check of manifest.json against the Lang table: { version, marker, current }, kept across restarts
+const VERIFIED_FILE = path.join(BUNDLE_DIR, 'database-check.json');
+
 class TranslationService {
+  constructor() {
+    // { marker, bundles: { [locale]: json }, manifest } built from the database (see databaseMarker)
+    this.databaseBundles = null;
+    // In-memory copy of VERIFIED_FILE
+    this.verified = undefined;
+  }
+
+  /**
+   * Drop bundles built from the database after a write through this service. Writes from
+   * scripts or other processes are caught by databaseMarker() instead.
+   */
+  invalidateBundles() {
+    this.databaseBundles = null;
+  }
+
+  /**
+   * Change marker of the Lang table: row count and latest updatedAt. Every insert, update or
+   * delete changes it, whichever process made it, and it is stored in the database itself.
+   */
+  async databaseMarker() {
+    const { _count, _max } = await prisma.lang.aggregate({
+      _count: { _all: true },
+      _max: { updatedAt: true }
+    });
+    return `${_count._all}:${_max.updatedAt ? _max.updatedAt.toISOString() : ''}`;
+  }
+
   /**
    * Get all translations for a specific locale (default IS)
    */
@@ -72,6 +116,7 @@ class TranslationService {
           value
         }
       });
+      this.invalidateBundles();
       return translation;
     } catch (error) {
       console.error(`Error creating translation for key ${key} and locale ${locale}:`, error);
@@ -100,6 +145,7 @@ class TranslationService {
           value
         }
       });
+      this.invalidateBundles();
       return translation;
     } catch (error) {
       console.error(`Error upserting translation for key ${key} and locale ${locale}:`, error);
@@ -116,6 +162,7 @@ class TranslationService {
         where: { id },
         data: { value }
       });
+      this.invalidateBundles();
       return translation;
     } catch (error) {
       console.error(`Error updating translation with ID ${id}:`, error);
@@ -137,6 +184,7 @@ class TranslationService {
         },
         data: { value }
       });
+      this.invalidateBundles();
       return translation;
     } catch (error) {
       console.error(`Error updating translation for key ${key} and locale ${locale}:`, error);
@@ -152,6 +200,7 @@ class TranslationService {
       const translation = await prisma.lang.delete({
         where: { id }
       });
+      this.invalidateBundles();
       return translation;
     } catch (error) {
       console.error(`Error deleting translation with ID ${id}:`, error);
@@ -172,6 +221,7 @@ class TranslationService {
           }
         }
       });
+      this.invalidateBundles();
       return translation;
     } catch (error) {
       console.error(`Error deleting translation for key ${key} and locale ${locale}:`, error);
@@ -321,6 +371,255 @@ class TranslationService {
     }
   }
 
+  /**
+   * Get the nested, minified i18next bundle for a locale as a JSON string.
+   * With a hash, only that exact version is returned (null when it no longer exists).
+   * Serves the pipeline's prebuilt bundles; builds one from the database when none exists.
+   */
+  async getBundle(locale = 'is', hash = null) {
+    const bundleFile = path.join(BUNDLE_DIR, hash ? `${locale}.${hash}.json` : `${locale}.json`);
+    if (hash || await this.prebuiltBundlesCurrent()) {
+      try {
+        return await fs.promises.readFile(bundleFile, 'utf8');
+      } catch (error) {
+        if (error.code !== 'ENOENT') {
+          console.error(`Error reading translation bundle ${bundleFile}:`, error);
+        }
+      }
+    }
+
+    const { bundles } = await this.getDatabaseBundles();
+    const bundle = bundles[locale] !== undefined ? bundles[locale] : await this.buildBundleFromDatabase(locale);
+    if (hash && this.hashBundle(bundle) !== hash) {
+      return null;
+    }
+    return bundle;
+  }
+
+  /**
+   * Prebuilt bundle file to send as-is, preferring the precompressed .br / .gz sibling the
+   * client accepts: { file, encoding } or null when the bundle has to come from getBundle().
+   * With an area, the file comes from that area's directory (area bundles are prebuilt only);
+   * with interned, the string-table encoding is used when the pipeline wrote one.
+   */
+  async resolveBundleFile(locale = 'is', hash = null, acceptEncoding = '', { area = null, interned = false } = {}) {
+    if (area && !BUNDLE_AREAS.includes(area)) {
+      return null;
+    }
+    const manifestFile = area ? 'areas.json' : 'manifest.json';
+    if (!hash && !(await this.prebuiltBundlesCurrent(manifestFile))) {
+      return null;
+    }
+    const name = `${locale}${hash ? `.${hash}` : ''}`;
+    const files = interned ? [`${name}.interned.json`, `${name}.json`] : [`${name}.json`];
+    for (const file of files) {
+      const prebuilt = await this.resolveEncodedFile(path.join(BUNDLE_DIR, area || '', file), acceptEncoding);
+      if (prebuilt) return { ...prebuilt, interned: file.endsWith('.interned.json') };
+    }
+    return null;
+  }
+
+  async resolveEncodedFile(bundleFile, acceptEncoding) {
+    let source;
+    try {
+      source = await fs.promises.stat(bundleFile);
+    } catch (error) {
+      return null;
+    }
+    const candidates = [];
+    if (/\bbr\b/.test(acceptEncoding)) candidates.push({ file: `${bundleFile}.br`, encoding: 'br' });
+    if (/\bgzip\b/.test(acceptEncoding)) candidates.push({ file: `${bundleFile}.gz`, encoding: 'gzip' });
+
+    for (const candidate of candidates) {
+      try {
+        // A sibling older than the bundle was compressed from previous content
+        if ((await fs.promises.stat(candidate.file)).mtimeMs >= source.mtimeMs) return candidate;
+      } catch (error) {
+        // try the next encoding
+      }
+    }
+    return { file: bundleFile, encoding: null };
+  }
+
+  /**
+   * Nested translations for server-side use (emails, receipts): the prebuilt interned
+   * bundle when there is one, otherwise the plain bundle
+   */
+  async loadBundle(locale = 'is') {
+    const prebuilt = await this.resolveBundleFile(locale, null, '', { interned: true });
+    if (prebuilt) {
+      return parseBundle(await fs.promises.readFile(prebuilt.file, 'utf8'));
+    }
+    return parseBundle(await this.getBundle(locale));
+  }
+
+  /**
+   * Bundle manifest: { version, locales: { [locale]: { hash, file, bytes, keys } } }
+   */
+  async getBundleManifest() {
+    if (await this.prebuiltBundlesCurrent()) {
+      try {
+        const manifest = await fs.promises.readFile(path.join(BUNDLE_DIR, 'manifest.json'), 'utf8');
+        return JSON.parse(manifest);
+      } catch (error) {
+        console.error('Error reading translation bundle manifest:', error);
+      }
+    }
+
+    // No pipeline output, or translations were edited since; describe bundles built from the database
+    return (await this.getDatabaseBundles()).manifest;
+  }
+
+  /**
+   * Bundles of BUNDLE_LOCALES built from the database and their manifest, built once and
+   * reused until a translation is written (see invalidateBundles)
+   */
+  async getDatabaseBundles(marker = null) {
+    marker = marker || await this.databaseMarker();
+    if (this.databaseBundles && this.databaseBundles.marker === marker) {
+      return this.databaseBundles;
+    }
+    const bundles = {};
+    const locales = {};
+    for (const locale of BUNDLE_LOCALES) {
+      const bundle = await this.buildBundleFromDatabase(locale);
+      const hash = this.hashBundle(bundle);
+      bundles[locale] = bundle;
+      locales[locale] = {
+        hash,
+        file: `${locale}.${hash}.json`,
+        bytes: Buffer.byteLength(bundle),
+        keys: null
+      };
+    }
+    const version = this.hashBundle(BUNDLE_LOCALES.map(locale => `${locale}:${locales[locale].hash};`).join(''));
+    // Keyed by the marker read before building, so a write made meanwhile forces a rebuild
+    this.databaseBundles = { marker, bundles, manifest: { version, locales } };
+    return this.databaseBundles;
+  }
+
+  /**
+   * Area manifest: { version, areas: { [area]: { [locale]: { hash, file, bytes, keys } } },
+   * routes: [{ prefix, areas }] }, or null when there are no current area bundles
+   */
+  async getAreaManifest() {
+    if (!(await this.prebuiltBundlesCurrent('areas.json'))) {
+      return null;
+    }
+    try {
+      const manifest = await fs.promises.readFile(path.join(BUNDLE_DIR, 'areas.json'), 'utf8');
+      return JSON.parse(manifest);
+    } catch (error) {
+      console.error('Error reading translation area manifest:', error);
+      return null;
+    }
+  }
+
+  /**
+   * True when the pipeline's bundles match the Lang table: every locale hash in manifest.json
+   * equals the hash of the bundle built from the database. The answer is stored in
+   * VERIFIED_FILE with the manifest version and databaseMarker(), so it is only worked out
+   * again after the table or the manifest changes, including across restarts.
+   * Area bundles (areas.json) count as current with the manifest of the same pipeline run.
+   */
+  async prebuiltBundlesCurrent(manifestFile = 'manifest.json') {
+    let manifest;
+    try {
+      manifest = JSON.parse(await fs.promises.readFile(path.join(BUNDLE_DIR, 'manifest.json'), 'utf8'));
+      if (manifestFile !== 'manifest.json') {
+        const [areas, main] = await Promise.all([
+          fs.promises.stat(path.join(BUNDLE_DIR, manifestFile)),
+          fs.promises.stat(path.join(BUNDLE_DIR, 'manifest.json'))
+        ]);
+        if (areas.mtimeMs < main.mtimeMs) return false;
+      }
+    } catch (error) {
+      return false;
+    }
+
+    const marker = await this.databaseMarker();
+    const verified = await this.readVerified();
+    if (verified && verified.version === manifest.version && verified.marker === marker) {
+      return verified.current;
+    }
+    const built = (await this.getDatabaseBundles(marker)).manifest.locales;
+    const current = Object.entries(manifest.locales || {})
+      .every(([locale, entry]) => built[locale] && built[locale].hash === entry.hash);
+    await this.writeVerified({ version: manifest.version, marker, current });
+    return current;
+  }
+
+  async readVerified() {
+    if (this.verified === undefined) {
+      try {
+        this.verified = JSON.parse(await fs.promises.readFile(VERIFIED_FILE, 'utf8'));
+      } catch (error) {
+        this.verified = null;
+      }
+    }
+    return this.verified;
+  }
+
+  async writeVerified(verified) {
+    this.verified = verified;
+    try {
+      const tmp = `${VERIFIED_FILE}.${process.pid}.tmp`;
+      await fs.promises.writeFile(tmp, JSON.stringify(verified));
+      await fs.promises.rename(tmp, VERIFIED_FILE);
+    } catch (error) {
+      console.error('Error saving translation bundle check:', error);
+    }
+  }
+
+  hashBundle(bundle) {
+    return crypto.createHash('sha256').update(bundle).digest('hex').slice(0, HASH_LENGTH);
+  }
+
+  async buildBundleFromDatabase(locale) {
+    const translations = await prisma.lang.findMany({
+      where: { locale },
+      select: { key: true, value: true }
+    });
+
+    // Same layout and bytes as olfong_i18n.bundles (nest + encode_bundle): shorter keys first,
+    // a string that is also a namespace moves under its "_" leaf key, keys sorted, so equal
+    // content gives the pipeline's hash
+    const nested = {};
+    translations
+      .sort((a, b) => (a.key.split('.').length - b.key.split('.').length) || (a.key < b.key ? -1 : 1))
+      .forEach(({ key, value }) => {
+        const parts = key.split('.');
+        if (parts.includes(LEAF_KEY)) {
+          // The pipeline refuses to build these; serving the rest beats failing the request
+          console.warn(`Skipping translation key ${key}: "${LEAF_KEY}" is a reserved key segment`);
+          return;
+        }
+        let node = nested;
+        for (let i = 0; i < parts.length - 1; i++) {
+          const child = node[parts[i]];
+          if (child === undefined || child === null) {
+            node[parts[i]] = {};
+          } else if (typeof child !== 'object') {
+            node[parts[i]] = { [LEAF_KEY]: child };
+          }
+          node = node[parts[i]];
+        }
+        node[parts[parts.length - 1]] = value;
+      });
+    return this.encodeBundle(nested);
+  }
+
+  /**
+   * Minified JSON with keys sorted at every level (JSON.stringify puts integer-like keys first)
+   */
+  encodeBundle(node) {
+    if (node === null || typeof node !== 'object') {
+      return JSON.stringify(node);
+    }
+    const keys = Object.keys(node).sort();
+    return `{${keys.map(key => `${JSON.stringify(key)}:${this.encodeBundle(node[key])}`).join(',')}}`;
+  }
+
   /**
    * Export translations to CSV
    */
@@ -443,14 +742,11 @@ class TranslationService {
   }
 
   /**
-   * Generate translations using Claude CLI
+   * Generate translations through the translation daemon (coalesced, batched calls),
+   * or the LLM client (pooled endpoint, or claude CLI fallback) without it
    */
   async generateTranslations(sourceLocale, targetLocale, keysToTranslate, onProgress = null) {
     try {
-      const { execSync } = require('child_process');
-      const fs = require('fs');
-      const path = require('path');
-
       // Get source translations
       let sourceTranslations;
       if (keysToTranslate && keysToTranslate.length > 0) {
@@ -494,112 +790,148 @@ class TranslationService {
         };
       }
 
-      // Process items one at a time
-      const translationResults = [];
-      let totalWords = 0;
-      const sourceLabel = sourceLocale === 'is' ? 'Icelandic' : 'English';
-      const targetLabel = targetLocale === 'is' ? 'Icelandic' : 'English';
+      let translationResults = null;
+      if (translationDaemon.configured) {
+        translationResults = await this.translateWithDaemon(toTranslate, sourceLocale, targetLocale, onProgress);
+      }
+      if (!translationResults) {
+        translationResults = await this.translateWithLlmClient(toTranslate, sourceLocale, targetLocale, onProgress);
+      }
 
-      const startMsg = `Processing ${toTranslate.length} items one at a time`;
-      console.log(startMsg);
-      if (onProgress) onProgress({ type: 'log', message: startMsg });
+      // Upsert all translated entries into database
+      const upsertResults = await this.batchUpsertTranslations(translationResults);
+
+      const finalMsg = `Generated ${upsertResults.length} translations from ${toTranslate.length} source entries`;
+      console.log(finalMsg);
+      if (onProgress) onProgress({ type: 'log', message: finalMsg });
+
+      return {
+        generated: upsertResults.length,
+        translations: upsertResults,
+        message: finalMsg
+      };
+    } catch (error) {
+      console.error('Error generating translations:', error);
+      throw error;
+    }
+  }
 
-      for (let idx = 0; idx < toTranslate.length; idx++) {
+  /**
+   * Translate items one prompt at a time through the LLM client (pooled endpoint, or claude CLI fallback)
+   */
+  async translateWithLlmClient(toTranslate, sourceLocale, targetLocale, onProgress = null) {
+    const translationResults = [];
+    let totalWords = 0;
+    const sourceLabel = sourceLocale === 'is' ? 'Icelandic' : 'English';
+    const targetLabel = targetLocale === 'is' ? 'Icelandic' : 'English';
+
+    // Pooled endpoint: several requests in flight over keep-alive sockets.
+    // CLI fallback: one process at a time with a delay, to avoid rate limiting.
+    const workers = llmClient.pooled ? Math.min(llmClient.concurrency, toTranslate.length) : 1;
+
+    const startMsg = `Processing ${toTranslate.length} items (${workers} in flight)`;
+    console.log(startMsg);
+    if (onProgress) onProgress({ type: 'log', message: startMsg });
+
+    let next = 0;
+    const translateNext = async () => {
+      while (next < toTranslate.length) {
+        const idx = next++;
         const item = toTranslate[idx];
 
-        try {
-          const preparingMsg = `[${idx + 1}/${toTranslate.length}] Preparing to translate "${item.key}"...`;
-          console.log(preparingMsg);
-          if (onProgress) onProgress({ type: 'log', message: preparingMsg });
+        const translatingMsg = `[${idx + 1}/${toTranslate.length}] Translating "${item.key}"...`;
+        console.log(translatingMsg);
+        if (onProgress) onProgress({ type: 'log', message: translatingMsg });
 
-          const prompt = `You are a professional UI translation expert. Translate this single ${sourceLabel} UI text to ${targetLabel}. Return ONLY the translated text, nothing else. Do not include quotes.
+        const prompt = `You are a professional UI translation expert. Translate this single ${sourceLabel} UI text to ${targetLabel}. Return ONLY the translated text, nothing else. Do not include quotes.
 
 "${item.key}": "${item.value}"`;
 
-          try {
-            // Call Claude CLI
-            const tempPromptFile = path.join('/tmp', `claude-item-${Date.now()}-${idx}.txt`);
-            fs.writeFileSync(tempPromptFile, prompt);
-
-            const translatingMsg = `[${idx + 1}/${toTranslate.length}] Calling Claude to translate "${item.key}"...`;
-            console.log(translatingMsg);
-            if (onProgress) onProgress({ type: 'log', message: translatingMsg });
+        try {
+          const translatedValue = await llmClient.complete(prompt);
 
-            const result = execSync(`claude -p "$(cat ${tempPromptFile})" --dangerously-skip-permissions`, {
-              encoding: 'utf8',
-              maxBuffer: 10 * 1024 * 1024,
-              shell: '/bin/bash',
-              timeout: 30000
+          if (translatedValue && translatedValue.length > 0) {
+            translationResults.push({
+              key: item.key,
+              locale: targetLocale,
+              value: translatedValue
             });
 
-            // Clean up temp file
-            fs.unlinkSync(tempPromptFile);
-
-            const translatedValue = result.trim();
-
-            if (translatedValue && translatedValue.length > 0) {
-              translationResults.push({
-                key: item.key,
-                locale: targetLocale,
-                value: translatedValue
-              });
-
-              // Count words
-              const wordCount = translatedValue.split(/\s+/).length;
-              totalWords += wordCount;
-
-              const progressMsg = `[${idx + 1}/${toTranslate.length}] Translated "${item.key}" (${wordCount} words, total: ${totalWords})`;
-              console.log(progressMsg);
-              if (onProgress) onProgress({ type: 'log', message: progressMsg });
-            }
-          } catch (error) {
-            // Clean up temp file if it still exists
-            if (fs.existsSync(tempPromptFile)) {
-              fs.unlinkSync(tempPromptFile);
-            }
-            const errorMsg = `Error translating item ${idx + 1} (${item.key}): ${error.message}`;
-            console.error(errorMsg);
-            if (onProgress) onProgress({ type: 'error', message: errorMsg });
-          }
+            // Count words
+            const wordCount = translatedValue.split(/\s+/).length;
+            totalWords += wordCount;
 
-          // Add delay between items to avoid rate limiting
-          if (idx < toTranslate.length - 1) {
-            await new Promise(resolve => setTimeout(resolve, 1000));
+            const progressMsg = `[${idx + 1}/${toTranslate.length}] Translated "${item.key}" (${wordCount} words, total: ${totalWords})`;
+            console.log(progressMsg);
+            if (onProgress) onProgress({ type: 'log', message: progressMsg });
           }
         } catch (error) {
-          const errorMsg = `Error processing item ${idx + 1}: ${error.message}`;
+          const errorMsg = `Error translating item ${idx + 1} (${item.key}): ${error.message}`;
           console.error(errorMsg);
           if (onProgress) onProgress({ type: 'error', message: errorMsg });
         }
+
+        if (!llmClient.pooled && next < toTranslate.length) {
+          await new Promise(resolve => setTimeout(resolve, 1000));
+        }
       }
+    };
 
-      // Upsert all translated entries into database
-      const upsertResults = await this.batchUpsertTranslations(translationResults);
+    await Promise.all(Array.from({ length: workers }, translateNext));
 
-      const finalMsg = `Generated ${upsertResults.length} translations from ${toTranslate.length} source entries`;
-      console.log(finalMsg);
-      if (onProgress) onProgress({ type: 'log', message: finalMsg });
+    return translationResults;
+  }
 
-      return {
-        generated: upsertResults.length,
-        translations: upsertResults,
-        message: finalMsg
-      };
+  /**
+   * Translate items through the coalescing translation daemon, forwarding its
+   * streamed events to onProgress. Resolves to null when the daemon isn't
+   * running, so the caller can fall back to the LLM client.
+   */
+  async translateWithDaemon(items, sourceLocale, targetLocale, onProgress = null, { reportResults = true } = {}) {
+    let count = 0;
+    let totalWords = 0;
+    const forward = (event) => {
+      let message;
+      if (event.type === 'log') {
+        message = event.message;
+      } else if (event.type === 'error') {
+        message = event.key ? `Error translating "${event.key}": ${event.message}` : event.message;
+      } else if (event.type === 'result' && reportResults) {
+        const wordCount = event.value.split(/\s+/).length;
+        totalWords += wordCount;
+        message = `[${++count}/${items.length}] Translated "${event.key}" (${wordCount} words, total: ${totalWords})`;
+      } else {
+        return;
+      }
+      const type = event.type === 'error' ? 'error' : 'log';
+      (type === 'error' ? console.error : console.log)(message);
+      if (onProgress) onProgress({ type, message });
+    };
+
+    try {
+      const { translations } = await translationDaemon.translate(
+        sourceLocale,
+        targetLocale,
+        items.map(item => ({ key: item.key, value: item.value })),
+        forward
+      );
+      return Object.entries(translations)
+        .filter(([, value]) => value && value.length > 0)
+        .map(([key, value]) => ({ key, locale: targetLocale, value }));
     } catch (error) {
-      console.error('Error generating translations:', error);
-      throw error;
+      if (!translationDaemon.isUnavailable(error)) throw error;
+      const fallbackMsg = `Translation daemon unavailable (${error.code}), falling back to the LLM client`;
+      console.error(fallbackMsg);
+      if (onProgress) onProgress({ type: 'log', message: fallbackMsg });
+      return null;
     }
   }
 
   /**
-   * Translate a single item using Claude CLI
+   * Translate a single item through the translation daemon, or the LLM client without it
    */
   async translateItem(key, sourceLocale, targetLocale, value, onProgress = null) {
     try {
-      const { execSync } = require('child_process');
-      const fs = require('fs');
-      const path = require('path');
-
       const sourceLabel = sourceLocale === 'is' ? 'Icelandic' : 'English';
       const targetLabel = targetLocale === 'is' ? 'Icelandic' : 'English';
 
@@ -612,25 +944,20 @@ class TranslationService {
 "${key}": "${value}"`;
 
       try {
-        // Call Claude CLI
-        const tempPromptFile = path.join('/tmp', `claude-item-${Date.now()}.txt`);
-        fs.writeFileSync(tempPromptFile, prompt);
-
-        const result = execSync(`claude -p "$(cat ${tempPromptFile})" --dangerously-skip-permissions`, {
-          encoding: 'utf8',
-          maxBuffer: 10 * 1024 * 1024,
-          shell: '/bin/bash',
-          timeout: 30000
-        });
-
-        // Clean up temp file
-        fs.unlinkSync(tempPromptFile);
-
-        const translatedValue = result.trim();
+        let translatedValue = null;
+        if (translationDaemon.configured) {
+          const results = await this.translateWithDaemon(
+            [{ key, value }], sourceLocale, targetLocale, onProgress, { reportResults: false }
+          );
+          if (results) translatedValue = results.length > 0 ? results[0].value : '';
+        }
+        if (translatedValue === null) {
+          translatedValue = await llmClient.complete(prompt);
+        }
 
         // Check if translation is empty
         if (!translatedValue || translatedValue.length === 0) {
-          const emptyMsg = `Error: Claude returned empty translation for "${key}"`;
+          const emptyMsg = `Error: LLM returned empty translation for "${key}"`;
           console.error(emptyMsg);
           if (onProgress) onProgress({ type: 'error', message: emptyMsg });
           throw new Error(emptyMsg);
@@ -656,10 +983,6 @@ class TranslationService {
           translation: upserted
         };
       } catch (error) {
-        // Clean up temp file if it still exists
-        if (fs.existsSync(tempPromptFile)) {
-          fs.unlinkSync(tempPromptFile);
-        }
         const errorMsg = `Error translating "${key}": ${error.message}`;
         console.error(errorMsg);
         if (onProgress) onProgress({ type: 'error', message: errorMsg });
@@ -0,0 +1,19 @@
+// Decoder for interned translation bundles written by olfong_i18n.bundles (--intern):
+// {"$strings":[...],"$tree":{...}} where a leaf is a string or an index into $strings.
+// The reviver swaps indices for the shared table strings in place, so repeated values are
+// held once and no second object tree is built. Plain nested bundles parse as usual.
+
+const INTERNED_PREFIX = '{"$strings":';
+
+function parseBundle(text) {
+  if (!text.startsWith(INTERNED_PREFIX)) return JSON.parse(text);
+  let strings = null;
+  // Keys are sorted, so $strings is revived before any $tree leaf
+  const data = JSON.parse(text, (key, value) => {
+    if (key === '$strings' && strings === null) return (strings = value);
+    return typeof value === 'number' ? strings[value] : value;
+  });
+  return data.$tree;
+}
+
+module.exports = { parseBundle };
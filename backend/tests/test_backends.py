@@ -0,0 +1,136 @@
+"""
+HedgedBackend and BackendStats against FakeBackend latency profiles.
+
+Usage (from backend/):
+    python -m pytest -q tests/test_backends.py
+"""
+
+import threading
+import time
+
+import pytest
+
+from olfong_i18n.backends import BackendCancelled, BackendStats, FakeBackend, HedgedBackend
+from olfong_i18n.prompts import encode_compact
+
+PROMPT = encode_compact(['common.save'], {'common.save': 'Vista'}).text
+
+
+class Recording:
+    """Wraps a backend and records how each call ended and how long it ran"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.name = backend.name
+        self.calls = []  # (outcome, seconds)
+        self.finished = threading.Event()
+
+    def complete(self, prompt, cancel=None):
+        start = time.perf_counter()
+        try:
+            completion = self.backend.complete(prompt, cancel)
+        except BackendCancelled:
+            self.calls.append(('cancelled', time.perf_counter() - start))
+            raise
+        finally:
+            self.finished.set()
+        self.calls.append(('ok', time.perf_counter() - start))
+        return completion
+
+
+def _observe(hedged, name, latency, count=20):
+    for _ in range(count):
+        hedged.stats[name].record(latency, True)
+
+
+def test_stats_p95_uses_default_until_min_samples():
+    stats = BackendStats()
+    for latency in (0.01, 0.02, 0.03):
+        stats.record(latency, True)
+    assert stats.p95(min_samples=5, default=1.5) == 1.5
+    for latency in [0.01] * 18 + [0.5, 0.5]:
+        stats.record(latency, True)
+    assert stats.p95(min_samples=5, default=1.5) == pytest.approx(0.5)
+
+
+def test_stats_weight_prefers_fast_and_reliable_backends():
+    fast, slow, flaky = BackendStats(), BackendStats(), BackendStats()
+    for _ in range(20):
+        fast.record(0.01, True)
+        slow.record(0.1, True)
+        flaky.record(0.01, False)
+    flaky.observe_latency(0.01)
+    assert fast.weight(1.0) > slow.weight(1.0)
+    assert fast.weight(1.0) > flaky.weight(1.0)
+
+
+def test_pick_is_weighted_by_observed_latency():
+    hedged = HedgedBackend([FakeBackend(name='fast'), FakeBackend(name='slow')], seed=1)
+    _observe(hedged, 'fast', 0.01)
+    _observe(hedged, 'slow', 0.09)
+    picks = [hedged.pick().name for _ in range(2000)]
+    # Weights are 1/0.01 : 1/0.09, so 'fast' should get about 90% of the calls
+    assert 0.85 < picks.count('fast') / len(picks) < 0.95
+    hedged.close()
+
+
+def test_pick_skips_backends_cooling_down():
+    hedged = HedgedBackend([FakeBackend(name='a'), FakeBackend(name='b')], seed=1)
+    hedged.stats['a'].down_until = time.monotonic() + 60
+    assert {hedged.pick().name for _ in range(50)} == {'b'}
+    hedged.stats['b'].down_until = time.monotonic() + 60
+    assert hedged.pick() is None
+    hedged.close()
+
+
+def test_hedge_fires_at_primary_p95_and_cancels_the_slower_call():
+    slow = Recording(FakeBackend(latency=2.0, name='slow'))
+    fast = Recording(FakeBackend(latency=0.01, name='fast'))
+    hedged = HedgedBackend([slow, fast], hedge_after=5.0, min_samples=20)
+    _observe(hedged, 'slow', 0.05)  # p95 of 'slow' is 50 ms: hedge after that, not after hedge_after
+    hedged.pick = lambda exclude=(): slow
+
+    start = time.perf_counter()
+    completion = hedged.complete(PROMPT)
+    elapsed = time.perf_counter() - start
+
+    assert completion.backend == 'fast'
+    assert completion.hedged
+    assert 0.05 <= elapsed < 0.5
+    assert hedged.stats['fast'].hedges == 1
+    assert hedged.stats['fast'].wins == 1
+
+    # The losing call is cancelled instead of running out its 2 s
+    assert slow.finished.wait(1.0)
+    outcome, seconds = slow.calls[0]
+    assert outcome == 'cancelled'
+    assert seconds < 1.0
+    hedged.close()
+
+
+def test_no_hedge_when_the_primary_answers_before_its_p95():
+    primary = Recording(FakeBackend(latency=0.01, name='primary'))
+    backup = Recording(FakeBackend(latency=0.01, name='backup'))
+    hedged = HedgedBackend([primary, backup], min_samples=20)
+    _observe(hedged, 'primary', 0.5)
+    hedged.pick = lambda exclude=(): primary
+
+    completion = hedged.complete(PROMPT)
+    assert completion.backend == 'primary'
+    assert not completion.hedged
+    assert backup.calls == []
+    assert hedged.stats['backup'].hedges == 0
+    hedged.close()
+
+
+def test_failed_primary_fails_over_without_counting_a_hedge():
+    broken = FakeBackend(failure_rate=1.0, name='broken')
+    backup = FakeBackend(latency=0.01, name='backup')
+    hedged = HedgedBackend([broken, backup], hedge_after=5.0)
+    hedged.pick = lambda exclude=(): broken
+
+    completion = hedged.complete(PROMPT)
+    assert completion.backend == 'backup'
+    assert not completion.hedged
+    assert hedged.stats['broken'].failures == 1
+    hedged.close()
@@ -0,0 +1,118 @@
+"""
+Daily budget: batches that can't be paid for are deferred, never degraded, and resumed later.
+
+Usage (from backend/):
+    python -m pytest -q tests/test_budget.py
+"""
+
+import importlib.util
+import json
+
+import pytest
+
+from olfong_i18n.backends import BackendError, Completion, FakeBackend, QuotaExceeded
+from olfong_i18n.budget import Budget, load_resume_plan
+from olfong_i18n.catalog import BACKEND_DIR, KeyUsage
+from olfong_i18n.pipeline import Pipeline
+from olfong_i18n.pipeline import main as pipeline_main
+
+KEYS = [f'{namespace}.label{n}' for namespace in ('cart', 'checkout') for n in range(60)]
+
+
+class QuotaAfter(FakeBackend):
+    """FakeBackend whose daily quota runs out after `calls` calls"""
+
+    def __init__(self, calls):
+        super().__init__()
+        self.calls = calls
+
+    def complete(self, prompt):
+        if self.calls <= 0:
+            raise QuotaExceeded('fake: quota exceeded')
+        self.calls -= 1
+        return super().complete(prompt)
+
+
+def _run(backend, budget):
+    pipeline = Pipeline(backend, budget=budget, compress=False, max_keys=20, retry_delay=0)
+    result = pipeline.run([KeyUsage(key) for key in KEYS])
+    pipeline.close()
+    return result
+
+
+def test_spent_budget_defers_the_remaining_batches():
+    result = _run(FakeBackend(), Budget(requests_per_day=2))
+    assert result.stop_reason == 'daily budget spent'
+    assert len(result.translations) == 40
+    assert len(result.deferred) == len(KEYS) - 40
+    assert result.fallbacks == []
+
+
+def test_quota_exceeded_exhausts_the_budget_and_defers_instead_of_falling_back():
+    budget = Budget()
+    result = _run(QuotaAfter(3), budget)
+    assert result.stop_reason == 'quota exceeded'
+    assert budget.exhausted
+    assert len(result.translations) == 60
+    assert sorted(result.deferred + list(result.translations)) == sorted(KEYS)
+    assert result.fallbacks == []
+
+
+def test_budget_state_is_shared_between_runs_of_the_same_day(tmp_path):
+    state = tmp_path / 'llm-budget.json'
+    _run(FakeBackend(), Budget(requests_per_day=4, state_file=state))
+    result = _run(FakeBackend(), Budget(requests_per_day=4, state_file=state))
+    assert result.stop_reason == 'daily budget spent'
+    assert result.translations == {}
+    assert json.loads(state.read_text())['requests'] == 4
+
+
+def test_resume_plan_translates_only_the_deferred_keys_and_merges(tmp_path):
+    keys_file = tmp_path / 'extracted-keys.json'
+    keys_file.write_text(json.dumps({'keys': [{'key': key, 'count': 1, 'files': ['pages/Cart.jsx']}
+                                              for key in KEYS]}))
+    out = tmp_path / 'out'
+    args = ['--backend', 'fake', '--keys', str(keys_file), '--batch-dir', str(tmp_path / 'no-batches'),
+            '--out', str(out), '--max-keys', '20', '--no-snapshot']
+    plan_file = out / 'resume-plan.json'
+
+    pipeline_main(args + ['--requests-per-day', '2'])
+    plan = load_resume_plan(plan_file)
+    assert (plan['reason'], plan['keyCount']) == ('daily budget spent', len(KEYS) - 40)
+    first = json.loads((out / 'all-translations-is.json').read_text(encoding='utf-8'))
+    assert len(first) == 40 and not set(first) & set(plan['keys'])
+
+    pipeline_main(args + ['--resume', str(plan_file), '--budget-state', str(tmp_path / 'tomorrow.json')])
+    merged = json.loads((out / 'all-translations-is.json').read_text(encoding='utf-8'))
+    assert sorted(merged) == sorted(KEYS)
+    assert {key: merged[key] for key in first} == first
+    assert not plan_file.exists()
+
+
+@pytest.fixture
+def script():
+    spec = importlib.util.spec_from_file_location('comprehensive_translate', BACKEND_DIR / 'comprehensive-translate.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class Failing:
+    def __init__(self, error):
+        self.error = error
+
+    def complete(self, prompt):
+        if self.error:
+            raise self.error
+        return Completion('Vista\n', 0.0)
+
+
+def test_script_stops_on_quota_instead_of_falling_back(script):
+    script.backend = Failing(QuotaExceeded('gemini: quota exceeded'))
+    with pytest.raises(QuotaExceeded):
+        script.translate_key_with_gemini('common.save')
+
+    script.backend = Failing(BackendError('gemini: exit 1'))
+    assert script.translate_key_with_gemini('common.save') is None
+    script.backend = Failing(None)
+    assert script.translate_key_with_gemini('common.save') == 'Vista'
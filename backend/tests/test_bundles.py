@@ -0,0 +1,140 @@
+"""
+Bundle writing: lossless nesting, hash naming and stability, interning, and rewritten
+bundles never keep stale .gz/.br siblings.
+
+Usage (from backend/):
+    python -m pytest -q tests/test_bundles.py
+"""
+
+import gzip
+import hashlib
+import json
+
+import pytest
+
+import olfong_i18n
+from olfong_i18n.bundles import (HASH_LENGTH, decode_interned, encode_bundle, flatten, intern_bundle, load_manifest,
+                                  nest, write_bundle)
+from olfong_i18n.compress import compress_file
+from olfong_i18n.pipeline import Pipeline, RunResult
+
+
+# Both a string and a namespace in the real catalog
+SHADOWED = {
+    'orders.statuses': 'Staða',
+    'orders.statuses.pending': 'Í bið',
+    'orders.statuses.shipped': 'Sent',
+    'adminSettings.smtp': 'SMTP',
+    'adminSettings.smtp.host': 'Netþjónn',
+    'adminSettings.title': 'Stillingar',
+}
+
+CATALOG = dict(SHADOWED, **{
+    'common.save': 'Vista',
+    'common.cancel': 'Hætta við',
+    'cart.remove': 'Hætta við',
+    'checkout.cancel': 'Hætta við',
+    'products.save': 'Vista',
+    'admin.products.save': 'Vista',
+    'prices.vat': '24',
+    'home.title': 'Velkomin í Ölföng',
+})
+
+
+def _gunzip(path):
+    return gzip.decompress(path.with_name(path.name + '.gz').read_bytes())
+
+
+def test_rewriting_a_bundle_drops_its_stale_compressed_siblings(tmp_path):
+    write_bundle({'common.save': 'Vista'}, 'is', tmp_path)
+    bundle = tmp_path / 'is.json'
+    compress_file(bundle)
+    assert _gunzip(bundle) == bundle.read_bytes()
+
+    write_bundle({'common.save': 'Geyma'}, 'is', tmp_path)
+    assert json.loads(bundle.read_bytes()) == {'common': {'save': 'Geyma'}}
+    assert not bundle.with_name('is.json.gz').exists()
+    assert not bundle.with_name('is.json.br').exists()
+
+
+def test_pipeline_emit_recompresses_rewritten_bundles(tmp_path):
+    for value in ('Vista', 'Geyma'):
+        writer = Pipeline(None, compress=True)
+        writer.emit(RunResult({'common.save': value, 'orders.title': 'Pantanir'}), tmp_path)
+        writer.close()
+
+    bundles = tmp_path / 'bundles'
+    for path in (bundles / 'is.json', bundles / 'common' / 'is.json', tmp_path / 'all-translations-is.json'):
+        assert _gunzip(path) == path.read_bytes()
+    assert json.loads(_gunzip(bundles / 'is.json'))['common']['save'] == 'Geyma'
+
+
+def test_library_emit_without_compression_leaves_no_stale_siblings(tmp_path):
+    olfong_i18n.emit(RunResult({'common.save': 'Vista'}), tmp_path)
+    for path in tmp_path.rglob('*.json'):
+        compress_file(path)
+
+    olfong_i18n.emit(RunResult({'common.save': 'Geyma'}), tmp_path)
+    for path in tmp_path.rglob('*.json'):
+        gz = path.with_name(path.name + '.gz')
+        assert not gz.exists() or _gunzip(path) == path.read_bytes(), path
+
+
+def test_keys_that_are_also_namespaces_survive_nesting():
+    nested, conflicts = nest(SHADOWED)
+    assert nested['orders']['statuses'] == {'_': 'Staða', 'pending': 'Í bið', 'shipped': 'Sent'}
+    assert nested['adminSettings']['smtp'] == {'_': 'SMTP', 'host': 'Netþjónn'}
+    assert sorted(conflicts) == ['adminSettings.smtp', 'orders.statuses']
+    assert flatten(nested) == SHADOWED
+
+
+def test_written_bundles_keep_every_key(tmp_path):
+    summary = write_bundle(SHADOWED, 'is', tmp_path)
+    assert flatten(json.loads((tmp_path / summary['file']).read_bytes())) == SHADOWED
+
+
+@pytest.mark.parametrize('key', ['orders.statuses._', 'orders._.pending', '_'])
+def test_the_leaf_key_is_reserved(key):
+    with pytest.raises(ValueError, match='reserved'):
+        nest(dict(SHADOWED, **{key: 'x'}))
+
+
+def test_nested_bundles_are_minified_sorted_and_named_by_content_hash(tmp_path):
+    summary = write_bundle({'b.z': '2', 'b.a': '1', 'a': 'Á'}, 'is', tmp_path)
+    data = (tmp_path / 'is.json').read_bytes()
+    assert data == '{"a":"Á","b":{"a":"1","z":"2"}}'.encode('utf-8')
+    assert summary['hash'] == hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    assert summary['file'] == f"is.{summary['hash']}.json"
+    assert (tmp_path / summary['file']).read_bytes() == data
+    assert load_manifest(tmp_path)['locales']['is'] == {'hash': summary['hash'], 'file': summary['file'],
+                                                        'bytes': len(data), 'keys': 3}
+
+
+def test_an_unchanged_bundle_keeps_its_hash_and_manifest_version(tmp_path):
+    first = write_bundle(CATALOG, 'is', tmp_path)
+    version = load_manifest(tmp_path)['version']
+    second = write_bundle(dict(reversed(list(CATALOG.items()))), 'is', tmp_path)
+    assert second['hash'] == first['hash']
+    assert load_manifest(tmp_path)['version'] == version
+    assert sorted(path.name for path in tmp_path.glob('is.*.json')) == [first['file']]
+
+    changed = write_bundle(dict(CATALOG, **{'common.save': 'Geyma'}), 'is', tmp_path)
+    assert changed['hash'] != first['hash']
+    assert load_manifest(tmp_path)['version'] != version
+    # The previous version stays for clients that still hold the old manifest
+    assert sorted(path.name for path in tmp_path.glob('is.*.json')) == sorted([first['file'], changed['file']])
+
+
+def test_interned_bundles_decode_to_the_plain_bundle(tmp_path):
+    nested, _ = nest(CATALOG)
+    interned = intern_bundle(nested)
+    assert 'Hætta við' in interned['$strings']
+    assert '24' not in interned['$strings']  # used once: a table entry would cost more than it saves
+    assert decode_interned(json.loads(encode_bundle(interned))) == nested
+    assert decode_interned(nested) == nested
+
+    summary = write_bundle(CATALOG, 'is', tmp_path, intern=True)
+    written = json.loads((tmp_path / summary['interned']['file']).read_bytes())
+    assert summary['interned']['file'] == f"is.{summary['hash']}.interned.json"
+    assert decode_interned(written) == json.loads((tmp_path / summary['file']).read_bytes())
+    assert flatten(decode_interned(written)) == CATALOG
@@ -0,0 +1,100 @@
+"""
+Content translation: streaming the export, snapshots of the translated fields and their rollback.
+
+Usage (from backend/):
+    python -m pytest -q tests/test_content.py
+"""
+
+import json
+
+import pytest
+
+from olfong_i18n import content
+from olfong_i18n.backends import FakeBackend
+from olfong_i18n.content import UPDATES_FILE, iter_records, translate_content
+from olfong_i18n.pipeline import Pipeline
+from olfong_i18n.snapshots import SnapshotStore
+
+FIELDS = [{'entity': 'products', 'source': 'description', 'target': 'descriptionIs', 'locale': 'is'}]
+
+# Serialized with escapes (\", \n, \\, \t, ö and a surrogate pair), numbers and nested values,
+# so tiny read chunks end mid-token and mid-escape
+EXPORT = {
+    'meta': {'exportedAt': '2025-06-01T12:00:00Z', 'counts': [1, 2, 3]},
+    'products': [
+        {'id': 1, 'description': 'Ljóst öl "Gull" með\nkeim af sítrus\\ humlum', 'price': 1290.5},
+        {'id': 2, 'description': 'Ölföng 🍺 12% \t afsláttur', 'tags': ['öl', None, True]},
+        {'id': 123456789, 'description': '', 'nested': {'a': [{'b': -1.5e-3}], 'c': {}}},
+        'not a record',
+        {'id': 4, 'description': ' [{"braces": "in a string"}], '},
+    ],
+    'banners': [],
+    'categories': [{'id': 7, 'description': 'Rauðvín'}],
+    'version': 3,
+}
+
+
+def _export(path, descriptions):
+    products = [{'id': record_id, 'description': text} for record_id, text in descriptions.items()]
+    path.write_text(json.dumps({'products': products, 'orders': [{'id': 1}]}), encoding='utf-8')
+    return path
+
+
+def _updates(out):
+    with open(out / UPDATES_FILE, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7])
+@pytest.mark.parametrize('indent', [None, 2])
+def test_tiny_read_chunks_stream_the_same_records_as_json_load(tmp_path, monkeypatch, size, indent):
+    path = tmp_path / 'export.json'
+    path.write_text(json.dumps(EXPORT, ensure_ascii=indent is None, indent=indent), encoding='utf-8')
+    monkeypatch.setattr(content, 'READ_SIZE', size)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    expected = [(name, record) for name, records in data.items() if isinstance(records, list)
+                for record in records if isinstance(record, dict)]
+    assert list(iter_records(path)) == expected
+    assert list(iter_records(path, {'categories'})) == [('categories', {'id': 7, 'description': 'Rauðvín'})]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(tmp_path / 'snapshots')
+
+
+def _translate(export, out, store):
+    # FakeBackend answers with the source text, so each translation equals its description
+    pipeline = Pipeline(FakeBackend(), compress=False)
+    summary = translate_content(pipeline, export, FIELDS, out, overwrite=True, snapshots=store)
+    pipeline.close()
+    return summary
+
+
+def test_content_runs_are_recorded_on_top_of_the_previous_snapshot(store, tmp_path):
+    out = tmp_path / 'out'
+    first = _translate(_export(tmp_path / 'a.json', {1: 'Ljóst öl.', 2: 'Rauðvín.'}), out, store)
+    second = _translate(_export(tmp_path / 'b.json', {2: 'Þurrt rauðvín.'}), out, store)
+
+    head = store.heads()['content-is']
+    assert head['id'] == second['snapshot'] != first['snapshot']
+    assert (head['label'], head['keys']) == ('content', 2)
+    assert store.load(head) == {'content.products.1.descriptionIs': 'Ljóst öl.',
+                                'content.products.2.descriptionIs': 'Þurrt rauðvín.'}
+    assert 'is' not in store.heads()  # the UI catalog's head is left alone
+
+
+def test_rolling_back_a_content_snapshot_rewrites_the_updates_file(store, tmp_path):
+    out = tmp_path / 'out'
+    _translate(_export(tmp_path / 'a.json', {1: 'Ljóst öl.', 2: 'Rauðvín.'}), out, store)
+    _translate(_export(tmp_path / 'b.json', {2: 'Þurrt rauðvín.'}), out, store)
+
+    entry, changes = store.rollback(store.resolve('head~1', 'content-is'), out)
+
+    assert changes['changed'] == {'content.products.2.descriptionIs': ['Þurrt rauðvín.', 'Rauðvín.']}
+    assert _updates(out) == [{'entity': 'products', 'id': 1, 'data': {'descriptionIs': 'Ljóst öl.'}},
+                             {'entity': 'products', 'id': 2, 'data': {'descriptionIs': 'Rauðvín.'}}]
+    assert store.heads()['content-is'] == entry
+    assert not (out / 'bundles').exists()
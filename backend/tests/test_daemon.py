@@ -0,0 +1,56 @@
+"""
+Daemon Coalescer: items are translated from the source text they were sent with.
+
+Usage (from backend/):
+    python -m pytest -q tests/test_daemon.py
+"""
+
+import pytest
+
+from olfong_i18n.backends import FakeBackend
+from olfong_i18n.daemon import Coalescer
+
+
+@pytest.fixture
+def coalescer():
+    coalescer = Coalescer(FakeBackend(), window=0.01)
+    yield coalescer
+    coalescer.close()
+
+
+def _translate(coalescer, target, items):
+    flights, _ = coalescer.submit('is', target, items, lambda event: None)
+    for flight in flights:
+        assert flight.done.wait(5)
+    return {flight.key: (flight.result, flight.origin) for flight in flights}
+
+
+def test_items_are_translated_from_their_source_text(coalescer):
+    # FakeBackend answers with the source text, so a result equal to it came from the source
+    results = _translate(coalescer, 'en', [
+        {'key': 'home.heroTitle', 'value': 'Velkomin í Ölföng'},
+        {'key': 'common.save', 'value': 'Vista breytingar'},
+        {'key': 'adminSettings.teya', 'value': 'Teya greiðslugátt'},
+        {'key': 'prices.24.00', 'value': '24.00 kr. á mann'},
+    ])
+    assert results == {
+        'home.heroTitle': ('Velkomin í Ölföng', 'llm'),
+        'common.save': ('Vista breytingar', 'llm'),
+        'adminSettings.teya': ('Teya greiðslugátt', 'llm'),
+        'prices.24.00': ('24.00 kr. á mann', 'llm'),
+    }
+
+
+def test_items_without_source_text_still_use_the_key_layers(coalescer):
+    results = _translate(coalescer, 'en', [
+        {'key': 'common.save', 'value': 'common.save'},
+        {'key': 'adminSettings.teya', 'value': 'adminSettings.teya'},
+    ])
+    assert results == {'common.save': ('Save', 'keynames'), 'adminSettings.teya': ('Teya', 'rules')}
+
+
+def test_icelandic_target_is_translated_from_the_english_source(coalescer):
+    flights, _ = coalescer.submit('en', 'is', [{'key': 'adminSettings.teya', 'value': 'Teya gateway'}],
+                                  lambda event: None)
+    assert flights[0].done.wait(5)
+    assert (flights[0].result, flights[0].origin) == ('Teya gateway', 'llm')
@@ -0,0 +1,48 @@
+"""
+Event log analysis: runs appended to one log are timed on their own.
+
+Usage (from backend/):
+    python -m pytest -q tests/test_events.py
+"""
+
+import json
+
+from olfong_i18n.events import analyze
+
+
+def _line(ts, run, event, **fields):
+    return json.dumps(dict({'ts': ts, 'run': run, 'event': event}, **fields))
+
+
+def _run(run, start, seconds, keys):
+    lines = [_line(start, run, 'run.started')]
+    lines += [_line(start + seconds * (n + 1) / (keys + 1), run, 'key.finished', key=f'common.k{n}', origin='llm',
+                    latency=0.1) for n in range(keys)]
+    lines.append(_line(start + seconds, run, 'run.finished'))
+    return lines
+
+
+def test_two_runs_in_one_log_are_timed_separately():
+    # A day apart: the idle time between the runs must not count towards the elapsed time
+    lines = _run('run-a', 1000.0, 10.0, 50) + ['Translating...'] + _run('run-b', 1000.0 + 86400, 5.0, 100)
+
+    summary = analyze(lines)
+
+    assert summary['runs'] == [
+        {'run': 'run-a', 'elapsedSeconds': 10.0, 'keysFinished': 50, 'keysPerSecond': 5.0},
+        {'run': 'run-b', 'elapsedSeconds': 5.0, 'keysFinished': 100, 'keysPerSecond': 20.0},
+    ]
+    assert summary['elapsedSeconds'] == 15.0
+    assert summary['keysFinished'] == 150
+    assert summary['keysPerSecond'] == 10.0
+
+
+def test_a_run_without_start_and_finish_events_spans_its_first_to_last_event():
+    lines = [_line(5.0, 'run-a', 'key.finished', key='a'), _line(7.5, 'run-a', 'key.finished', key='b'),
+             _line(100.0, 'run-b', 'run.started'), _line(100.5, 'run-b', 'key.finished', key='c')]
+
+    summary = analyze(lines)
+
+    assert [run['elapsedSeconds'] for run in summary['runs']] == [2.5, 0.5]
+    assert summary['elapsedSeconds'] == 3.0
+    assert summary['keysPerSecond'] == 1.0
@@ -0,0 +1,66 @@
+"""
+Import-time budget for olfong_i18n.
+
+Workers, the daemon and every script import the package on start, so
+`import olfong_i18n` must stay under BUDGET_MS and load no submodules, and
+importing any module or script must not touch the filesystem or print.
+
+Usage (from backend/):
+    python -m pytest -q tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BUDGET_MS = 30
+RUNS = 5
+
+SCRIPTS = sorted(str(path) for path in list(BACKEND_DIR.glob('*.py')) + list(BACKEND_DIR.glob('scripts/*.py')))
+MODULES = sorted(f'olfong_i18n.{path.stem}' for path in (BACKEND_DIR / 'olfong_i18n').glob('*.py')
+                 if path.stem != '__init__')
+
+TIMED_IMPORT = '''
+import sys, time, json
+start = time.perf_counter()
+import olfong_i18n
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({'ms': elapsed, 'loaded': sorted(m for m in sys.modules if m.startswith('olfong_i18n'))}))
+'''
+
+IMPORT_ALL = '''
+import importlib, runpy, sys
+for module in sys.argv[1].split(','):
+    importlib.import_module(module)
+for script in sys.argv[2].split(','):
+    runpy.run_path(script, run_name='import_probe')
+'''
+
+
+def _python(code, *args, env=None, cwd=BACKEND_DIR):
+    return subprocess.run([sys.executable, '-c', code, *args], cwd=cwd, env=env, capture_output=True,
+                          text=True, check=True)
+
+
+def test_package_import_is_within_budget():
+    # Best of several fresh interpreters, so a cold disk cache doesn't count against the budget
+    runs = [json.loads(_python(TIMED_IMPORT).stdout) for _ in range(RUNS)]
+    assert min(run['ms'] for run in runs) < BUDGET_MS, runs
+
+
+def test_package_import_loads_no_submodules():
+    assert json.loads(_python(TIMED_IMPORT).stdout)['loaded'] == ['olfong_i18n']
+
+
+def test_imports_have_no_side_effects(tmp_path):
+    root = tmp_path / 'root'
+    root.mkdir()
+    env = dict(os.environ, OLFONG_I18N_ROOT=str(root), OLFONG_I18N_EVENTS=str(tmp_path / 'events.ndjson'),
+               PYTHONPATH=str(BACKEND_DIR), PYTHONDONTWRITEBYTECODE='1')
+    result = _python(IMPORT_ALL, ','.join(MODULES), ','.join(SCRIPTS), env=env, cwd=tmp_path)
+    assert result.stdout == ''
+    assert sorted(os.listdir(tmp_path)) == ['root']
+    assert os.listdir(root) == []
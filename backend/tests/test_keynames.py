@@ -0,0 +1,81 @@
+"""
+Key-name drafts against the English already in translation-batches-en.
+
+Usage (from backend/):
+    python -m pytest -q tests/test_keynames.py
+"""
+
+import json
+
+import pytest
+
+from olfong_i18n.keynames import EN_BATCH_DIR, KeyNameDrafts, draft, normalize
+
+
+def _existing_english():
+    answers = {}
+    for answers_file in sorted(EN_BATCH_DIR.glob('batch-*-en.json')):
+        with open(answers_file, 'r', encoding='utf-8') as f:
+            answers.update(json.load(f))
+    return answers
+
+
+@pytest.fixture(scope='module')
+def english():
+    answers = _existing_english()
+    if not answers:
+        pytest.skip(f'no batch-NNN-en.json files in {EN_BATCH_DIR}')
+    return answers
+
+
+def test_drafts_agree_with_the_existing_english(english):
+    drafts = KeyNameDrafts()
+    # Some en answers are still Icelandic; only compare against English text
+    pairs = [(drafts.resolve(key), text) for key, text in english.items() if text.isascii()]
+    pairs = [(drafted, text) for drafted, text in pairs if drafted is not None]
+    same = sum(1 for drafted, text in pairs if normalize(drafted) == normalize(text))
+    assert len(pairs) > 1000
+    assert same / len(pairs) >= 0.85
+
+
+def test_headings_are_left_to_the_backend(english):
+    drafts = KeyNameDrafts()
+    headings = [key for key in english if key.endswith(('Title', 'Heading'))]
+    assert 'home.features.deliveryTitle' in headings
+    assert [key for key in headings if key in drafts] == []
+
+
+def test_title_is_kept_in_language_field_labels(english):
+    assert english['adminPlaceholders.enterMetaTitleEn'] == 'Enter meta title (English)'
+    assert draft('adminPlaceholders.enterMetaTitleEn') == ('Enter meta title (English)', 1.0)
+    assert draft('adminCategories.metaTitleIs')[0] == 'Meta title (Icelandic)'
+
+
+def test_widget_suffixes_are_stripped(english):
+    assert english['atvrImport.importProductsButton'] == 'Import products'
+    assert KeyNameDrafts().resolve('atvrImport.importProductsButton') == 'Import products'
+    assert KeyNameDrafts().resolve('adminCustomers.idLabel') == english['adminCustomers.idLabel']
+
+
+@pytest.mark.parametrize('key', [
+    'adminSettings.smtp.providerSendGrid',
+    'adminSettings.smtp.providerGmail',
+    'adminSettings.languageEnglish',
+    'adminSettings.currencyUSD',
+    'adminSettings.dateFormatDDMMYYYY',
+    'discounts.statusExpiringsoon',
+    'adminStaff.roleAdmin',
+])
+def test_enum_and_vendor_keys_are_left_to_the_backend(english, key):
+    assert key in english
+    assert key not in KeyNameDrafts()
+
+
+def test_contractions_get_their_apostrophe():
+    assert draft('login.dontHaveAccount')[0] == "Don't have account"
+    assert draft('errors.cantConnect')[0] == "Can't connect"
+
+
+def test_mark_as_read(english):
+    for key in ('adminNotifications.markRead', 'adminNotifications.markAllRead', 'adminNotifications.markUnread'):
+        assert KeyNameDrafts().resolve(key) == english[key]
@@ -0,0 +1,61 @@
+"""
+Dead-key pruning: keys the web app still uses survive; orphans and extractor noise go.
+
+Usage (from backend/):
+    python -m pytest -q tests/test_prune.py
+"""
+
+import json
+
+import pytest
+
+from olfong_i18n.prune import main, prune
+
+USED = ['common.save', 'checkout.pay', 'orders.statuses', 'category', 'Search', '24.00', '.relative']
+LANG = {
+    'common.save': ('Vista', 'Save'),
+    'checkout.pay': ('Greiða', 'Pay'),
+    'orders.statuses': ('Staða', 'Status'),
+    'category': ('Flokkur', 'Category'),
+    'Search': ('Leita', 'Search'),
+    'orderStatus.PENDING': ('Í bið', 'Pending'),  # built at runtime, protected with --keep
+    'oldPage.title': ('Gömul síða', 'Old page'),
+    'removed': ('Fjarlægt', 'Removed'),
+    '24.00': ('24,00', '24.00'),
+    '.relative': ('.relative', '.relative'),
+    '-': ('-', '-'),
+}
+
+
+@pytest.fixture
+def rows():
+    return [{'id': n, 'key': key, 'locale': locale, 'value': values[index]}
+            for n, (key, values) in enumerate(LANG.items())
+            for index, locale in enumerate(('is', 'en'))]
+
+
+def test_keys_still_extracted_survive(rows):
+    report, pruned, deletes = prune(rows, set(USED), keep=('orderStatus.',))
+
+    live = ['common.save', 'checkout.pay', 'orders.statuses', 'category', 'Search', 'orderStatus.PENDING']
+    for locale in ('is', 'en'):
+        assert sorted(pruned[locale]) == sorted(live)
+        assert report[locale]['orphanKeys'] == ['oldPage.title']
+        assert report[locale]['junkKeys'] == ['-', '.relative', '24.00', 'removed']
+        assert report[locale]['prunedBundleBytes'] < report[locale]['bundleBytes']
+    assert not {row['key'] for row in deletes} & set(live)
+    assert pruned['is']['category'] == 'Flokkur'
+
+
+def test_cli_reads_every_extracted_key_and_writes_the_changeset(rows, tmp_path, capsys):
+    keys_file = tmp_path / 'extracted-keys.json'
+    keys_file.write_text(json.dumps({'keys': [{'key': key, 'count': 1, 'files': ['pages/Home.jsx']} for key in USED]}))
+    rows_file = tmp_path / 'database-export.json'
+    rows_file.write_text(json.dumps({'langs': rows}, ensure_ascii=False), encoding='utf-8')
+    changeset = tmp_path / 'prune-changeset.json'
+
+    main(['--rows', str(rows_file), '--keys', str(keys_file), '--keep', 'orderStatus.',
+          '--report', str(tmp_path / 'report.json'), '--changeset', str(changeset)])
+
+    deleted = {row['key'] for row in json.loads(changeset.read_text(encoding='utf-8'))['deletes']}
+    assert deleted == {'oldPage.title', 'removed', '24.00', '.relative', '-'}
@@ -0,0 +1,69 @@
+"""
+Deterministic rules: which keys are resolved without a model, and to what.
+
+Usage (from backend/):
+    python -m pytest -q tests/test_rules.py
+"""
+
+import pytest
+
+from olfong_i18n.rules import RulesEngine
+
+
+@pytest.mark.parametrize('key, rule, value', [
+    ('24.00', 'number', '24,00'),
+    ('24,00', 'number', '24,00'),
+    ('-1.5', 'number', '-1,5'),
+    ('2025', 'number', '2025'),
+    ('15%', 'percent', '15%'),
+    ('12.5 %', 'percent', '12,5%'),
+    ('500 kr', 'currency', '500 kr.'),
+    ('500kr.', 'currency', '500 kr.'),
+    ('1290.50 ISK', 'currency', '1290,50 kr.'),
+    ('adminSettings.teya', 'brand', 'Teya'),
+    ('adminSettings.netgiro', 'brand', 'Netgíró'),
+    ('footer.ATVR', 'brand', 'ÁTVR'),
+    ('olfong', 'brand', 'Ölföng'),
+    ('.relative', 'untranslatable', '.relative'),
+    ('#main-content', 'untranslatable', '#main-content'),
+    ('-', 'untranslatable', '-'),
+    ('...', 'untranslatable', '...'),
+])
+def test_icelandic_rules(key, rule, value):
+    assert RulesEngine('is').resolve(key) == (rule, value)
+
+
+@pytest.mark.parametrize('key, rule, value', [
+    ('24,00', 'number', '24.00'),
+    ('12,5%', 'percent', '12.5%'),
+    ('500 kr.', 'currency', 'ISK 500'),
+    ('adminSettings.valitor', 'brand', 'Valitor'),
+])
+def test_english_rules(key, rule, value):
+    assert RulesEngine('en').resolve(key) == (rule, value)
+
+
+@pytest.mark.parametrize('key', [
+    'common.save',
+    'adminSettings.teyaLogo',
+    'prices.24.00',
+    '1.000.000',
+    '24.00 EUR',
+    'relative',
+    '.5rem',
+    'a b',
+    '',
+])
+def test_keys_no_rule_covers(key):
+    engine = RulesEngine('is')
+    assert engine.resolve(key) is None
+    assert key not in engine
+    assert engine.get(key, 'fallback') == 'fallback'
+
+
+def test_lookups_are_counted_per_rule():
+    engine = RulesEngine('is', brands={'Kenni': 'Kenni'})
+    for key in ('24.00', '5%', 'auth.kenni', 'auth.teya', '-', 'common.save'):
+        engine.get(key)
+    assert engine.summary() == {'untranslatable': 1, 'number': 1, 'percent': 1, 'brand': 1}
+    assert 'auth.kenni' in engine and engine.summary()['brand'] == 1  # membership tests don't count
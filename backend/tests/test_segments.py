@@ -0,0 +1,68 @@
+"""
+Sentence segmentation of Icelandic and English descriptions.
+
+Usage (from backend/):
+    python -m pytest -q tests/test_segments.py
+"""
+
+import pytest
+
+from olfong_i18n.segments import join_segments, segment, split_sentences
+
+TEXTS = [
+    'Fyrsta setning. Önnur setning, t.d. þessi.',
+    'Ljóst öl með keim af t.d. sítrus. Hentar vel með fiski.',
+    'Inniheldur u.þ.b. 5% alkóhól. Geymist á köldum stað.',
+    'Pairs well with e.g. Cheddar. Serve chilled.',
+    'Bruggað af J. R. R. Tolkien ehf. í Reykjavík. Selt í ÁTVR.',
+    'Ávextir, krydd o.s.frv. Þetta vín er þurrt.',
+    'Fyrsta lína\nÖnnur lína.\n\nNý málsgrein! Er það? „Já.“ 12 flöskur.',
+    '  Bil fremst. Og aftast.  \n',
+    'Approx. 750 ml. Imported from Spain… Enjoy!',
+    '',
+    '\n',
+]
+
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_segments_rebuild_the_exact_text(text):
+    segments = segment(text)
+    assert ''.join(sentence + separator for sentence, separator in segments) == text
+    if segments:
+        assert join_segments(*zip(*segments)) == text
+
+
+@pytest.mark.parametrize('text, sentences', [
+    ('Ljóst öl með keim af t.d. Sítrus. Hentar vel með fiski.',
+     ['Ljóst öl með keim af t.d. Sítrus.', 'Hentar vel með fiski.']),
+    ('Inniheldur u.þ.b. 5% alkóhól. Geymist kalt.', ['Inniheldur u.þ.b. 5% alkóhól.', 'Geymist kalt.']),
+    ('Pairs well with e.g. Cheddar. Serve chilled.', ['Pairs well with e.g. Cheddar.', 'Serve chilled.']),
+    ('Approx. 750 ml bottle. Serve chilled.', ['Approx. 750 ml bottle.', 'Serve chilled.']),
+])
+def test_abbreviations_do_not_end_a_sentence(text, sentences):
+    assert split_sentences(text) == sentences
+
+
+def test_initials_do_not_end_a_sentence():
+    assert split_sentences('Þýtt af J. R. R. Tolkien. Gefið út 1954.') == [
+        'Þýtt af J. R. R. Tolkien.', 'Gefið út 1954.']
+
+
+def test_osfrv_ends_a_sentence():
+    assert split_sentences('Ávextir, krydd o.s.frv. Þetta vín er þurrt.') == [
+        'Ávextir, krydd o.s.frv.', 'Þetta vín er þurrt.']
+    assert split_sentences('Fruit, spice etc. This wine is dry.') == ['Fruit, spice etc.', 'This wine is dry.']
+
+
+def test_line_breaks_end_a_sentence_and_stay_in_the_separator():
+    text = 'Fyrsta lína\nÖnnur lína.\n\nNý málsgrein'
+    assert segment(text) == [('Fyrsta lína', '\n'), ('Önnur lína.', '\n\n'), ('Ný málsgrein', '')]
+
+
+def test_terminal_punctuation_quotes_and_digits():
+    assert split_sentences('Er það? „Já.“ 12 flöskur! Búið… Næst.') == [
+        'Er það?', '„Já.“', '12 flöskur!', 'Búið…', 'Næst.']
+
+
+def test_lower_case_after_a_period_does_not_split():
+    assert split_sentences('Útgáfa 2. útgáfa er betri.') == ['Útgáfa 2. útgáfa er betri.']
@@ -0,0 +1,125 @@
+"""
+SnapshotStore: unchanged records, single-bucket diffs, head~N and rollback change sets.
+
+Usage (from backend/):
+    python -m pytest -q tests/test_snapshots.py
+"""
+
+import gzip
+import json
+
+import pytest
+
+from olfong_i18n.pipeline import Pipeline, RunResult
+from olfong_i18n.snapshots import SnapshotStore, changeset_rows, main
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(tmp_path / 'snapshots')
+
+
+@pytest.fixture
+def catalog():
+    return {f'ns{n % 7}.key{n}': f'Gildi {n}' for n in range(300)}
+
+
+def _objects(store):
+    return sorted(path.name for path in (store.root / 'objects').rglob('*.json'))
+
+
+def test_recording_an_unchanged_catalog_stores_no_objects(store, catalog):
+    first, _ = store.record(catalog)
+    objects = _objects(store)
+
+    second, stats = store.record(dict(catalog))
+    assert stats['unchanged']
+    assert (stats['objects'], stats['values']) == (0, 0)
+    assert _objects(store) == objects
+    assert second['root'] == first['root']
+    assert second['parent'] == first['id']
+
+
+def test_changing_one_string_touches_one_bucket(store, catalog):
+    store.record(catalog)
+    changed = dict(catalog, **{'ns3.key10': 'Nýtt gildi'})
+
+    _, stats = store.record(changed)
+    assert (stats['objects'], stats['values']) == (2, 1)  # the key's bucket, the root and the new value
+
+    changes = store.diff(store.resolve('head~1'), store.resolve('head'))
+    assert changes['buckets'] == 1
+    assert changes['changed'] == {'ns3.key10': ['Gildi 10', 'Nýtt gildi']}
+    assert changes['added'] == changes['removed'] == {}
+
+
+def test_resolve_head_n_and_id_prefixes(store, catalog):
+    entries = [store.record(dict(catalog, **{'ns0.key0': f'Útgáfa {n}'}))[0] for n in range(3)]
+
+    assert store.resolve('head') == entries[2]
+    assert store.resolve('head~0') == entries[2]
+    assert store.resolve('head~1') == entries[1]
+    assert store.resolve('head~2') == entries[0]
+    assert store.resolve(entries[1]['id'][:8]) == entries[1]
+    with pytest.raises(KeyError):
+        store.resolve('head~3')
+    with pytest.raises(KeyError):
+        store.resolve('head~1', locale='en')
+
+
+def test_rollback_re_emits_the_catalog_and_writes_the_changeset(store, catalog, tmp_path):
+    old, _ = store.record(catalog)
+    new_catalog = dict(catalog, **{'ns1.key1': 'Breytt', 'ns9.added': 'Bætt við'})
+    del new_catalog['ns2.key2']
+    store.record(new_catalog)
+    objects = _objects(store)
+
+    out = tmp_path / 'out'
+    changeset = tmp_path / 'rollback-changeset.json'
+    assert main(['--dir', str(store.root), 'rollback', 'head~1', '--out', str(out),
+                 '--changeset', str(changeset)]) == 0
+
+    emitted = json.loads((out / 'all-translations-is.json').read_text(encoding='utf-8'))
+    assert emitted == catalog
+    head = store.resolve('head')
+    assert head['root'] == old['root']
+    assert head['label'] == f"rollback to {old['id']}"
+    assert _objects(store) == objects  # the rolled-back root is reused, nothing new is stored
+
+    rows = json.loads(changeset.read_text(encoding='utf-8'))
+    assert sorted((row['key'], row['value']) for row in rows['upserts']) == [
+        ('ns1.key1', 'Gildi 1'), ('ns2.key2', 'Gildi 2')]
+    assert rows['deletes'] == [{'key': 'ns9.added', 'locale': 'is', 'reason': 'rollback'}]
+
+
+def test_changeset_rows_from_a_diff(store, catalog):
+    store.record(catalog)
+    store.record(dict(catalog, **{'ns4.key4': 'Annað'}))
+    upserts, deletes = changeset_rows(store.diff(store.resolve('head'), store.resolve('head~1')), 'is')
+    assert upserts == [{'key': 'ns4.key4', 'locale': 'is', 'value': 'Gildi 4'}]
+    assert deletes == []
+
+
+def test_rollback_recompresses_bundles_and_splits_areas_like_the_pipeline(store, tmp_path):
+    keys_file = tmp_path / 'extracted-keys.json'
+    usage = {'common.save': ['components/common/Button.jsx', 'pages/admin/Settings.jsx'],
+             'checkout.pay': ['pages/Checkout.jsx'], 'adminSettings.title': ['pages/admin/Settings.jsx']}
+    keys_file.write_text(json.dumps({'keys': [{'key': key, 'count': 1, 'files': files}
+                                              for key, files in usage.items()]}))
+    out = tmp_path / 'out'
+    runs = {}
+    for value in ('Vista', 'Geyma'):
+        pipeline = Pipeline(None, snapshots=store)
+        entries, _ = pipeline.load(keys_file, tmp_path / 'no-batches')
+        translations = {'common.save': value, 'checkout.pay': 'Greiða', 'adminSettings.title': 'Stillingar'}
+        pipeline.emit(RunResult(translations), out, usage={entry.key: entry for entry in entries})
+        pipeline.close()
+        runs[value] = (out / 'bundles' / 'areas.json').read_bytes()
+
+    store.rollback(store.resolve('head~1'), out, keys_file=keys_file)
+
+    bundles = out / 'bundles'
+    assert (bundles / 'areas.json').read_bytes() == runs['Vista']
+    for path in (bundles / 'is.json', bundles / 'common' / 'is.json'):
+        assert json.loads(path.read_bytes())['common']['save'] == 'Vista'
+        assert gzip.decompress(path.with_name('is.json.gz').read_bytes()) == path.read_bytes()
@@ -0,0 +1,72 @@
+"""
+Prompt templates: a shared static prefix, and a version bump invalidates cached translations.
+
+Usage (from backend/):
+    python -m pytest -q tests/test_templates.py
+"""
+
+import dataclasses
+import json
+
+from olfong_i18n.backends import FakeBackend
+from olfong_i18n.content import SourceCache, translate_content
+from olfong_i18n.pipeline import Pipeline
+from olfong_i18n.prompts import encode_compact
+from olfong_i18n.templates import COMPACT_TEMPLATE, TEMPLATES
+
+BUMPED = dataclasses.replace(COMPACT_TEMPLATE, version=COMPACT_TEMPLATE.version + 1)
+
+
+class CountingBackend(FakeBackend):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def complete(self, prompt):
+        self.calls += 1
+        return super().complete(prompt)
+
+
+def test_every_prompt_of_a_template_starts_with_its_prefix():
+    for template in TEMPLATES.values():
+        assert template.render('x').startswith(template.prefix)
+    first = encode_compact(['common.save'], {'common.save': 'Vista'}).text
+    second = encode_compact(['checkout.total', 'cart.empty']).text
+    assert first[:len(COMPACT_TEMPLATE.prefix)] == second[:len(COMPACT_TEMPLATE.prefix)] == COMPACT_TEMPLATE.prefix
+
+
+def test_a_version_bump_changes_the_tag_and_memory_keys_but_not_the_prefix():
+    assert BUMPED.prefix == COMPACT_TEMPLATE.prefix
+    assert BUMPED.tag == f'compact/v{COMPACT_TEMPLATE.version + 1}'
+    assert BUMPED.tm_key('Vista') != COMPACT_TEMPLATE.tm_key('Vista')
+    assert COMPACT_TEMPLATE.tm_key('Vista') == dataclasses.replace(COMPACT_TEMPLATE).tm_key('Vista')
+    reworded = dataclasses.replace(COMPACT_TEMPLATE, rules=COMPACT_TEMPLATE.rules[:-1])
+    assert reworded.fingerprint != COMPACT_TEMPLATE.fingerprint
+
+
+def test_cached_translations_are_not_reused_under_a_bumped_version(tmp_path):
+    path = tmp_path / 'content-cache-is.ndjson'
+    cache = SourceCache(path, {'content.products.1.descriptionIs.0': 'Ljóst öl.'})
+    cache.add('Ljóst öl.', 'Light ale.')
+    cache.save()
+
+    assert SourceCache(path, cache.sources).get('content.products.1.descriptionIs.0') == 'Light ale.'
+    assert SourceCache(path, cache.sources, BUMPED).get('content.products.1.descriptionIs.0') is None
+
+
+def test_content_runs_resend_cached_sentences_after_a_version_bump(tmp_path):
+    export = tmp_path / 'export.json'
+    export.write_text(json.dumps({'products': [{'id': 1, 'description': 'Ljóst öl. Hentar með fiski.'}]}))
+    fields = [{'entity': 'products', 'source': 'description', 'target': 'descriptionIs', 'locale': 'is'}]
+
+    def run(template):
+        backend = CountingBackend()
+        pipeline = Pipeline(backend, compress=False, template=template, retry_delay=0)
+        summary = translate_content(pipeline, export, fields, tmp_path / 'out')
+        pipeline.close()
+        return backend.calls, summary['segmentsCached']
+
+    assert run(COMPACT_TEMPLATE) == (1, 0)
+    assert run(COMPACT_TEMPLATE) == (0, 2)
+    assert run(BUMPED) == (1, 0)
+    assert run(BUMPED) == (0, 2)
@@ -0,0 +1,62 @@
+"""
+Tier assignment: short labels go to the fast model, long texts and past rejections to the strong one.
+
+Usage (from backend/):
+    python -m pytest -q tests/test_tiers.py
+"""
+
+import pytest
+
+from olfong_i18n.catalog import KeyUsage
+from olfong_i18n.pipeline import Pipeline
+from olfong_i18n.tiers import LONG_SOURCE_CHARS, TierPolicy, load_history, update_history
+
+
+@pytest.mark.parametrize('key, source, tier', [
+    ('common.save', '', 'fast'),
+    ('addresses.add', 'Bæta við heimilisfangi', 'fast'),
+    ('adminSettings.smtpHostHelp', '', 'strong'),
+    ('products.shortDescription', '', 'strong'),
+    ('checkout.errorMsg', '', 'strong'),
+    ('profile.Tooltip', '', 'strong'),
+    ('home.why.title', '', 'strong'),
+    ('home.features.fast', '', 'strong'),
+    ('home.whyUs', '', 'fast'),
+    ('common.descriptionLabel', '', 'fast'),
+    ('common.banner', 'x' * LONG_SOURCE_CHARS, 'fast'),
+    ('common.banner', 'x' * (LONG_SOURCE_CHARS + 1), 'strong'),
+])
+def test_tier_of(key, source, tier):
+    assert TierPolicy().tier_of(key, source) == tier
+
+
+def test_rejected_keys_go_to_the_strong_tier_until_accepted(tmp_path):
+    path = tmp_path / 'validation-history.json'
+    update_history(path, rejected=['common.save', 'cart.empty'], accepted=[])
+    assert TierPolicy(load_history(path)).tier_of('common.save') == 'strong'
+
+    update_history(path, rejected=[], accepted=['common.save'])
+    assert load_history(path) == {'cart.empty': 1}
+    assert TierPolicy(load_history(path)).tier_of('common.save') == 'fast'
+    assert TierPolicy(load_history(path), max_rejections=2).tier_of('cart.empty') == 'fast'
+
+
+def test_split_keeps_order_and_skips_empty_tiers():
+    entries = [KeyUsage(key) for key in ('common.save', 'products.description', 'cart.empty', 'home.why.title')]
+    split = TierPolicy().split(entries)
+    assert [(tier, [entry.key for entry in group]) for tier, group in split] == [
+        ('fast', ['common.save', 'cart.empty']),
+        ('strong', ['products.description', 'home.why.title']),
+    ]
+    assert [tier for tier, _ in TierPolicy().split(entries[:1])] == ['fast']
+
+
+def test_pipeline_plans_one_tier_per_batch():
+    keys = [f'cart.label{n}' for n in range(30)] + [f'cart.item{n}Description' for n in range(10)]
+    pipeline = Pipeline(None, policy=TierPolicy(), compress=False, max_keys=25)
+    batches = pipeline.plan([KeyUsage(key) for key in keys])
+    by_tier = {}
+    for batch in batches:
+        by_tier.setdefault(batch.tier, []).extend(batch.keys)
+    assert sorted(by_tier['fast']) == sorted(keys[:30])
+    assert sorted(by_tier['strong']) == sorted(keys[30:])
@@ -0,0 +1,121 @@
+"""
+WorkQueue leases, heartbeats, reclaiming and merging with short lease times.
+
+Usage (from backend/):
+    python -m pytest -q tests/test_workqueue.py
+"""
+
+import json
+import time
+
+import pytest
+
+from olfong_i18n.backends import FakeBackend
+from olfong_i18n.events import EventLog
+from olfong_i18n.snapshots import SnapshotStore
+from olfong_i18n.snapshots import main as snapshots_main
+from olfong_i18n.workqueue import Heartbeat, WorkQueue, decode_batch, merge_run, plan_run, work
+
+LEASE = 0.2
+RUN = 'test'
+
+
+@pytest.fixture
+def keys_file(tmp_path):
+    keys = [f'{namespace}.label{n}' for namespace in ('cart', 'checkout') for n in range(120)]
+    path = tmp_path / 'extracted-keys.json'
+    path.write_text(json.dumps({'keys': [{'key': key, 'count': 1, 'files': ['pages/Cart.jsx']} for key in keys]}))
+    return path
+
+
+@pytest.fixture
+def queue(tmp_path, keys_file):
+    queue = WorkQueue(tmp_path / 'queue.sqlite', lease=LEASE, max_attempts=3)
+    chunks, _ = plan_run(queue, RUN, keys_file=keys_file, batch_dir=tmp_path / 'no-batches')
+    assert chunks >= 2
+    yield queue
+    queue.close()
+
+
+def _answer(lease):
+    batch, _ = decode_batch(lease.payload)
+    return {key: f'IS {key}' for key in batch.keys}
+
+
+def test_expired_lease_is_claimed_again_and_the_old_holder_cannot_complete(queue):
+    first = queue.claim(RUN, 'w1')
+    other = queue.claim(RUN, 'w2')
+    assert other.chunk != first.chunk  # the leased chunk is skipped while its lease holds
+
+    time.sleep(LEASE * 1.5)
+    retry = queue.claim(RUN, 'w3')
+    assert (retry.chunk, retry.attempt) == (first.chunk, 2)
+    assert not queue.heartbeat(first)
+    assert not queue.complete(first, _answer(first))
+    assert queue.complete(retry, _answer(retry))
+
+
+def test_heartbeat_keeps_the_lease_past_its_deadline(queue):
+    lease = queue.claim(RUN, 'w1')
+    with Heartbeat(queue, lease) as beat:
+        time.sleep(LEASE * 3)
+        claimed = [queue.claim(RUN, 'w2') for _ in range(queue.open_chunks(RUN))]
+    assert not beat.lost
+    assert lease.chunk not in [other.chunk for other in claimed if other is not None]
+    assert queue.complete(lease, _answer(lease))
+
+
+def test_chunks_of_a_dead_worker_are_reclaimed(queue):
+    abandoned = queue.claim(RUN, 'dead')  # never heartbeats or completes
+    done = work(queue, RUN, FakeBackend(), worker='alive', poll=0.05, events=EventLog())
+
+    status = queue.status(RUN)['is']
+    assert status['done'] == done['chunks'] == sum(status.values())
+    answers, missing = queue.results(RUN, 'is')
+    assert missing == []
+    assert set(decode_batch(abandoned.payload)[0].keys) <= set(answers)
+
+
+def test_chunk_fails_after_max_attempts_of_expired_leases(queue):
+    chunk = None
+    for attempt in range(1, queue.max_attempts + 1):
+        lease = queue.claim(RUN, f'dead-{attempt}')
+        assert (lease.attempt, chunk or lease.chunk) == (attempt, lease.chunk)
+        chunk = lease.chunk
+        time.sleep(LEASE * 1.5)
+    next_lease = queue.claim(RUN, 'alive')
+    assert next_lease.chunk != chunk
+    assert queue.status(RUN)['is']['failed'] == 1
+
+
+def test_merge_defers_the_keys_of_unfinished_chunks(queue, keys_file, tmp_path):
+    lease = queue.claim(RUN, 'w1')
+    assert queue.complete(lease, _answer(lease))
+    leased = queue.claim(RUN, 'w2')  # still running when the merge happens
+
+    result, _ = merge_run(queue, RUN, out=tmp_path / 'out', keys_file=keys_file, batch_dir=tmp_path / 'no-batches')
+
+    finished = decode_batch(lease.payload)[0].keys
+    unfinished = set(decode_batch(leased.payload)[0].keys)
+    assert result.stop_reason == 'chunks not finished'
+    assert all(result.translations[key] == f'IS {key}' for key in finished)
+    assert unfinished <= set(result.deferred)
+    assert not unfinished & set(result.translations)
+    assert len(result.origins) == 240
+    emitted = json.loads((tmp_path / 'out' / 'all-translations-is.json').read_text(encoding='utf-8'))
+    assert set(emitted) == set(result.translations)
+
+
+def test_merged_run_is_recorded_as_a_snapshot(queue, keys_file, tmp_path, capsys):
+    work(queue, RUN, FakeBackend(), worker='w1', poll=0.05, events=EventLog())
+    store = SnapshotStore(tmp_path / 'snapshots')
+
+    result, _ = merge_run(queue, RUN, out=tmp_path / 'out', keys_file=keys_file, batch_dir=tmp_path / 'no-batches',
+                          snapshots=store)
+
+    head = store.heads()['is']
+    assert (head['run'], head['keys']) == (RUN, len(result.translations))
+    assert store.load(head) == result.translations
+    capsys.readouterr()
+    assert snapshots_main(['--dir', str(store.root), 'list']) == 0
+    assert head['id'] in capsys.readouterr().out
@@ -2,23 +2,30 @@
 
 import json
 import os
-import subprocess
-from pathlib import Path
+import sys
+import time
 from collections import defaultdict
 
-BATCH_DIR = Path('/home/olibuijr/Projects/olfong_stack/backend/translation-batches')
+from olfong_i18n.backends import backend_from_env
+from olfong_i18n.batching import batch_numbers
+from olfong_i18n.catalog import BACKEND_DIR
+from olfong_i18n.events import EventLog
+from olfong_i18n.rules import RulesEngine
+from olfong_i18n.templates import KEY_TEMPLATE, key_prompt
 
-# Comprehensive Icelandic translation dictionary
-TRANSLATIONS = {
-    # CSS and Generic
-    '.link-dropdown-container': 'Tengill-fellivalmöguleikar',
-    '.relative': 'Afstætt',
+BATCH_DIR = BACKEND_DIR / 'translation-batches'
+
+# NDJSON progress events; opened by main() so importing this file has no side effects
+events = EventLog()
+
+# gemini CLI per call, or OLFONG_LLM_BACKEND=http for a pooled keep-alive endpoint; set by main()
+backend = None
 
-    # Numbers and Formats
-    '24.00': '24,00',
-    '25.00': '25,00',
-    '27.50': '27,50',
+# Numbers and extractor noise are resolved by rule before the dictionary; set by main()
+rules = None
 
+# Comprehensive Icelandic translation dictionary
+TRANSLATIONS = {
     # Addresses
     'addresses.add': 'Bæta við heimilisfangi',
     'addresses.city': 'Borg',
@@ -306,37 +313,32 @@ TRANSLATIONS = {
 
 def translate_key(key):
     """Translate a key to Icelandic"""
+    value = rules.get(key)
+    if value is not None:
+        events.emit('cache.hit', key=key, layer='rules')
+        return value
     if key in TRANSLATIONS:
+        events.emit('cache.hit', key=key, layer='static')
         return TRANSLATIONS[key]
 
+    events.emit('cache.miss', key=key)
+    events.emit('key.started', key=key)
+    start = time.perf_counter()
+
     # Try using gemini for unknown keys
     try:
-        prompt = f'''Translate the following UI text key to professional Icelandic for an e-commerce wine and beer website called "Ölföng". Keep it concise and natural. Return ONLY the Icelandic translation, nothing else.
-
-Key: {key}
-
-Guidelines:
-- Use formal, professional Icelandic
-- If it's a button label, use active verbs
-- For field labels, use clear descriptive text
-- For category names (WINE, BEER, SPIRITS), use Icelandic equivalents
-- Keep payment provider names (Teya, Valitor) as-is
-- Numbers use comma as decimal separator in Icelandic (24,00 not 24.00)'''
-
-        result = subprocess.run(
-            ['gemini', '-p', prompt],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-
-        if result.returncode == 0:
-            translation = result.stdout.strip().split('\n')[0]
-            if translation:
-                return translation
+        prompt = key_prompt(key)  # static prefix first, so the backend can reuse it across keys
+
+        completion = backend.complete(prompt)
+        translation = completion.text.split('\n')[0]
+        if translation:
+            events.emit('key.finished', key=key, origin='llm', latency=round(time.perf_counter() - start, 6))
+            return translation
+        events.emit('error', errorClass='BackendError', key=key, message='empty response')
     except Exception as e:
-        print(f"Warning: Could not translate {key}: {str(e)}")
+        events.error(e, key=key)
 
+    events.emit('key.finished', key=key, origin='fallback', latency=round(time.perf_counter() - start, 6))
     return key
 
 def process_batch(batch_num):
@@ -346,7 +348,7 @@ def process_batch(batch_num):
     output_file = BATCH_DIR / f'batch-{batch_num_str}-translated.json'
 
     if not input_file.exists():
-        print(f"Error: File not found: {input_file}")
+        events.emit('error', errorClass='FileNotFoundError', batch=batch_num, file=str(input_file))
         return None
 
     try:
@@ -363,23 +365,28 @@ def process_batch(batch_num):
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(translations_dict, f, ensure_ascii=False, indent=2)
 
-        print(f"Batch {batch_num_str}: {len(keys)} keys translated and saved")
+        events.emit('batch.processed', batch=batch_num, keys=len(keys), file=str(output_file))
         return len(keys)
 
     except Exception as e:
-        print(f"Error processing batch {batch_num_str}: {str(e)}")
+        events.error(e, batch=batch_num)
         return None
 
 def main():
-    print("Starting batch translation process...")
-    print(f"Translation directory: {BATCH_DIR}")
-    print()
+    global events, backend, rules
+    # NDJSON progress events on stdout (or $OLFONG_I18N_EVENTS)
+    events = EventLog.from_env(default_stream=sys.stdout)
+    backend = backend_from_env('gemini', timeout=10)
+    rules = RulesEngine('is')
+    run_start = time.perf_counter()
+    events.emit('run.started', script='translate-all-batches.py', batchDir=str(BATCH_DIR),
+                template=KEY_TEMPLATE.tag)
 
     total_translated = 0
     completed_batches = 0
     failed_batches = []
 
-    for batch_num in range(1, 31):
+    for batch_num in batch_numbers(BATCH_DIR):
         result = process_batch(batch_num)
         if result is not None:
             total_translated += result
@@ -387,15 +394,9 @@ def main():
         else:
             failed_batches.append(batch_num)
 
-    print()
-    print("=" * 60)
-    print("TRANSLATION SUMMARY")
-    print("=" * 60)
-    print(f"Batches processed: {completed_batches}/30")
-    print(f"Total keys translated: {total_translated}")
-    if failed_batches:
-        print(f"Failed batches: {failed_batches}")
-    print("=" * 60)
+    events.emit('run.finished', batches=completed_batches, totalBatches=len(batch_numbers(BATCH_DIR)),
+                keys=total_translated, failedBatches=failed_batches,
+                seconds=round(time.perf_counter() - run_start, 6))
 
 if __name__ == '__main__':
     main()
@@ -21,13 +21,25 @@ async function translateBatch(batchNum) {
   try {
     const batch = JSON.parse(fs.readFileSync(inputFile, 'utf8'));
 
+    // Keys whose English is spelled out by the key name (python -m olfong_i18n.keynames --write)
+    const draftsFile = path.join(batchDir, `batch-${String(batchNum).padStart(3, '0')}-drafts.json`);
+    const drafts = fs.existsSync(draftsFile) ? JSON.parse(fs.readFileSync(draftsFile, 'utf8')) : {};
+    const pending = batch.filter(t => !(t.key in drafts));
+    const drafted = batch.length - pending.length;
+
+    if (pending.length === 0) {
+      fs.writeFileSync(outputFile, JSON.stringify(drafts, null, 2));
+      console.log(`✅ Batch ${batchNum}: all ${drafted} entries drafted from key names, no call needed`);
+      return 'drafted';
+    }
+
     // Create prompt
-    const entries = batch.map(t => `"${t.key}": "${t.value}"`).join('\n');
+    const entries = pending.map(t => `"${t.key}": "${t.value}"`).join('\n');
     const prompt = `You are a professional English translator. Translate these Icelandic UI text entries to English. Return ONLY valid JSON with each key mapped to its English translation. No markdown, no explanations, just pure JSON.
 
 ${entries}`;
 
-    console.log(`\n📝 Translating batch ${batchNum} (${batch.length} entries)...`);
+    console.log(`\n📝 Translating batch ${batchNum} (${pending.length} entries, ${drafted} drafted from key names)...`);
 
     // Use file-based approach for safety
     const promptFile = path.join(batchDir, `batch-${String(batchNum).padStart(3, '0')}-prompt.txt`);
@@ -40,8 +52,17 @@ ${entries}`;
       shell: '/bin/bash'
     });
 
-    // Save the output
-    fs.writeFileSync(outputFile, result);
+    // Save the output, merged with the drafts when the answer parses
+    let output = result;
+    if (drafted > 0) {
+      try {
+        const answers = JSON.parse(result.replace(/^```(?:json)?\s*|\s*```\s*$/g, ''));
+        output = JSON.stringify({ ...drafts, ...answers }, null, 2);
+      } catch (error) {
+        console.log(`⚠️  Batch ${batchNum}: answer is not plain JSON; drafts stay in ${draftsFile}`);
+      }
+    }
+    fs.writeFileSync(outputFile, output);
     console.log(`✅ Batch ${batchNum} translated and saved`);
 
     // Clean up prompt file
@@ -58,15 +79,20 @@ async function main() {
   console.log('🌐 Starting Icelandic to English translation...\n');
 
   let completed = 0;
+  let avoided = 0;
   for (let i = 1; i <= 15; i++) {
     const success = await translateBatch(i);
     if (success) completed++;
+    if (success === 'drafted') {
+      avoided++;
+      continue;
+    }
 
     // Add delay to avoid rate limiting
     await new Promise(resolve => setTimeout(resolve, 2000));
   }
 
-  console.log(`\n✅ Translation complete! ${completed}/15 batches processed`);
+  console.log(`\n✅ Translation complete! ${completed}/15 batches processed, ${avoided} calls avoided by key-name drafts`);
 }
 
 main().catch(console.error);
@@ -1,6 +1,22 @@
 #!/usr/bin/env python3
+"""
+Fill translation-batches-en/batch-NNN-en.json from the Icelandic batch
+files, using the known translations below and key-name drafts; whatever is
+left is for translate-batches-is-to-en.js.
+
+Usage:
+    python translate-batches-to-english.py [1 2 ...] [--dir translation-batches-en]
+"""
+import argparse
 import json
-import os
+import sys
+from pathlib import Path
+
+from olfong_i18n.catalog import BACKEND_DIR
+from olfong_i18n.events import EventLog
+from olfong_i18n.keynames import KeyNameDrafts
+
+BATCH_DIR = BACKEND_DIR / 'translation-batches-en'
 
 # Icelandic to English translations mapping
 translations = {
@@ -97,19 +113,27 @@ translations = {
     "Afsláttarprósenta": "Discount percentage"
 }
 
-def translate_value(icelandic_text):
+drafts = KeyNameDrafts()
+
+def translate_value(icelandic_text, key=None):
     """Translate Icelandic text to English"""
     # Direct mapping
     if icelandic_text in translations:
         return translations[icelandic_text]
-    
-    # If not found in mapping, return the original (this shouldn't happen if mapping is complete)
+
+    # Then a draft from the key name (addresses.postalCode -> "Postal code")
+    if key is not None:
+        draft = drafts.get(key)
+        if draft is not None:
+            return draft
+
+    # Otherwise return the original (left for translate-batches-is-to-en.js)
     return icelandic_text
 
-def process_batch(batch_number):
+def process_batch(batch_number, batch_dir=BATCH_DIR, events=None):
     """Process a single batch file"""
-    input_file = f'/home/olibuijr/Projects/olfong_stack/backend/translation-batches-en/batch-{batch_number:03d}-is.json'
-    output_file = f'/home/olibuijr/Projects/olfong_stack/backend/translation-batches-en/batch-{batch_number:03d}-en.json'
+    input_file = batch_dir / f'batch-{batch_number:03d}-is.json'
+    output_file = batch_dir / f'batch-{batch_number:03d}-en.json'
     
     # Read input file
     with open(input_file, 'r', encoding='utf-8') as f:
@@ -120,15 +144,27 @@ def process_batch(batch_number):
     for item in data:
         key = item['key']
         value = item['value']
-        result[key] = translate_value(value)
+        result[key] = translate_value(value, key)
     
     # Write output file
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(result, f, ensure_ascii=False, indent=2)
     
-    print(f"Processed batch {batch_number}: {len(result)} translations")
+    if events is not None:
+        events.emit('batch.processed', batch=batch_number, keys=len(result), file=str(output_file),
+                    drafted=drafts.drafted)
     return len(result)
 
-# Process first batch only as a test
-total = process_batch(1)
-print(f"Total translations: {total}")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fill English batch files from known translations and key names')
+    parser.add_argument('batches', nargs='*', type=int, default=[1], help='batch numbers (default: 1, as a test)')
+    parser.add_argument('--dir', default=str(BATCH_DIR), help='translation-batches-en directory')
+    args = parser.parse_args(argv)
+
+    # NDJSON progress events on stdout (or $OLFONG_I18N_EVENTS)
+    events = EventLog.from_env(default_stream=sys.stdout)
+    total = sum(process_batch(number, Path(args.dir), events) for number in args.batches)
+    events.emit('run.finished', script='translate-batches-to-english.py', keys=total)
+
+if __name__ == '__main__':
+    main()
@@ -4,19 +4,10 @@ const fs = require('fs');
 const path = require('path');
 const { execSync } = require('child_process');
 
-const BATCH_DIR = '/home/olibuijr/Projects/olfong_stack/backend/translation-batches';
+const BATCH_DIR = path.join(__dirname, 'translation-batches');
 
 // Comprehensive Icelandic translation dictionary
 const translations = {
-  // CSS selectors and generic
-  '.link-dropdown-container': 'Tengill-fellivalmöguleikar',
-  '.relative': 'Afstætt',
-
-  // Numbers and formats
-  '24.00': '24,00',
-  '25.00': '25,00',
-  '27.50': '27,50',
-
   // Addresses section
   'addresses.add': 'Bæta við heimilisfangi',
   'addresses.city': 'Borg',
@@ -71,8 +62,24 @@ const translations = {
   'admin.banners.titlePlaceholderIs': 'Sláðu inn titil á íslensku',
 };
 
+// Numbers and extractor noise resolved by `python -m olfong_i18n.rules`; loaded by main()
+let ruleTranslations = {};
+
+function loadRuleTranslations() {
+  try {
+    return JSON.parse(execSync('python3 -m olfong_i18n.rules --json', { cwd: __dirname, encoding: 'utf-8' }));
+  } catch (error) {
+    console.warn(`Warning: Could not load rule translations: ${error.message}`);
+    return {};
+  }
+}
+
 // Function to translate a key using gemini
 function translateKey(key) {
+  if (key in ruleTranslations) {
+    return ruleTranslations[key];
+  }
+
   // Check if we already have the translation
   if (translations[key]) {
     return translations[key];
@@ -150,6 +157,7 @@ function processBatch(batchNum) {
 // Main execution
 async function main() {
   console.log('Starting batch translation process...\n');
+  ruleTranslations = loadRuleTranslations();
 
   let totalTranslated = 0;
   let completedBatches = 0;
@@ -1,5 +1,6 @@
 const { PrismaClient } = require('@prisma/client');
 const fs = require('fs');
+const path = require('path');
 
 const prisma = new PrismaClient();
 
@@ -23,7 +24,7 @@ async function exportTranslations() {
     }, {});
 
     // Write to file
-    const filename = '/home/olibuijr/Projects/olfong_stack/translations-export.json';
+    const filename = path.join(__dirname, 'translations-export.json');
     fs.writeFileSync(filename, JSON.stringify(exportData, null, 2));
     console.log(`✓ Exported ${englishTranslations.length} translations to ${filename}`);
 
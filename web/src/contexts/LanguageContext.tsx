@@ -1,4 +1,6 @@
-import React, { createContext, useContext, useState, useEffect, useCallback, ReactNode } from 'react';
+import React, { createContext, useContext, useState, useEffect, useCallback, useRef, ReactNode } from 'react';
+import { useLocation } from 'react-router-dom';
+import translationService from '../services/translationService';
 
 interface LanguageContextType {
   currentLanguage: string;
@@ -23,6 +25,10 @@ export const LanguageProvider: React.FC<LanguageProviderProps> = ({ children })
   });
 
   const [translations, setTranslations] = useState<Record<string, string>>({});
+  // What `translations` holds for a language: the area manifest and the areas merged so far,
+  // or areas === null when the full bundle was loaded (the server has no area bundles)
+  const loaded = useRef<{ language: string; manifest: any; areas: Set<string> | null } | null>(null);
+  const location = useLocation();
   const [isLoading, setIsLoading] = useState(false);
   const availableLanguages = ['is', 'en'];
   const [storeDefaultLanguage, setStoreDefaultLanguage] = useState<string | null>(null);
@@ -47,26 +53,42 @@ export const LanguageProvider: React.FC<LanguageProviderProps> = ({ children })
     return translation;
   }, [translations]);
 
-  // Load translations from API based on current language
-  const loadTranslations = useCallback(async () => {
+  // Load the translation areas a route needs (see olfong_i18n.areas): storefront pages get
+  // common + storefront, and admin strings are only fetched once an admin route is opened.
+  // Areas already loaded for the language are kept; without area bundles the full bundle is loaded once.
+  const loadTranslations = useCallback(async (pathname: string, reload = false) => {
+    const previous = loaded.current;
+    const fresh = reload || !previous || previous.language !== currentLanguage;
+    if (!fresh && previous && (previous.areas === null || translationService
+      .areasForRoute(previous.manifest, pathname).every(area => previous.areas!.has(area)))) {
+      return;
+    }
+
     setIsLoading(true);
     try {
-      const API_BASE_URL = import.meta.env.VITE_API_URL || '/api';
-      const response = await fetch(`${API_BASE_URL}/translations?locale=${currentLanguage}`, {});
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
+      const manifest = fresh ? await translationService.getAreaManifest() : previous!.manifest;
+      if (manifest) {
+        const areas = new Set<string>(fresh ? [] : previous!.areas!);
+        const missing = translationService.areasForRoute(manifest, pathname).filter(area => !areas.has(area));
+        const bundles = await Promise.all(
+          missing.map(area => translationService.loadAreaBundle(currentLanguage, area, manifest))
+        );
+        if (bundles.every(Boolean)) {
+          const flat = bundles.reduce((acc, bundle) => Object.assign(acc, translationService.flattenBundle(bundle)), {});
+          missing.forEach(area => areas.add(area));
+          loaded.current = { language: currentLanguage, manifest, areas };
+          setTranslations(current => (fresh ? flat : { ...current, ...flat }));
+          return;
+        }
+        console.warn('Some translation area bundles are unavailable, loading the full bundle');
       }
-      const data = await response.json();
 
-      if (data.success && Array.isArray(data.data)) {
-        // Transform flat array of { key, value } into a key-value object
-        const transformedTranslations = data.data.reduce((acc: Record<string, string>, item: { key: string; value: string }) => {
-          acc[item.key] = item.value;
-          return acc;
-        }, {});
-        setTranslations(transformedTranslations);
+      const flat = translationService.flattenBundle(await translationService.loadTranslationsForI18next(currentLanguage));
+      if (Object.keys(flat).length) {
+        loaded.current = { language: currentLanguage, manifest: null, areas: null };
+        setTranslations(flat);
       } else {
-        console.error('Failed to load translations: Invalid response format', data);
+        console.error('Failed to load translations: no translations returned');
 
         // Load fallback translations if API fails
         loadFallbackTranslations();
@@ -260,10 +282,10 @@ export const LanguageProvider: React.FC<LanguageProviderProps> = ({ children })
     fetchStoreDefaultLanguage();
   }, []);
 
-  // Initialize translations on mount and when language changes
+  // Initialize translations on mount, when language changes and when a route needs more areas
   useEffect(() => {
-    loadTranslations();
-  }, [loadTranslations]);
+    loadTranslations(location.pathname);
+  }, [loadTranslations, location.pathname]);
 
   // Set language and persist to localStorage
   const setCurrentLanguage = useCallback((lang: string) => {
@@ -277,8 +299,9 @@ export const LanguageProvider: React.FC<LanguageProviderProps> = ({ children })
 
   // Refresh translations (useful after admin updates)
   const refreshTranslations = useCallback(async () => {
-    await loadTranslations();
-  }, [loadTranslations]);
+    translationService.clearCache(currentLanguage);
+    await loadTranslations(location.pathname, true);
+  }, [loadTranslations, location.pathname, currentLanguage]);
 
   const value = {
     currentLanguage,
@@ -15,9 +15,16 @@ declare class TranslationService {
   importTranslations(data: any, format?: string): Promise<any>;
   seedFromFiles(): Promise<any>;
   loadTranslationsForI18next(language: string): Promise<any>;
+  loadTranslationsForRoute(language: string, pathname?: string): Promise<any>;
+  areasForRoute(manifest: any, pathname: string): string[];
+  loadAreaBundle(language: string, area: string, manifest: any): Promise<any>;
+  getAreaManifest(): Promise<any>;
+  flattenBundle(nested: Record<string, any>, prefix?: string, flat?: Record<string, string>): Record<string, string>;
+  deepMerge(target: Record<string, any>, source: Record<string, any>): Record<string, any>;
   transformToNestedObject(translations: any[]): Record<string, any>;
   loadStaticTranslations(language: string): Promise<any>;
-  isCacheValid(language: string, maxAge?: number): boolean;
+  getBundleManifest(): Promise<any>;
+  isCacheValid(language: string, hash?: string | null, maxAge?: number): boolean;
   getCachedTranslations(language: string): any;
   clearCache(language?: string | null): void;
   refreshTranslations(language: string, i18nextInstance?: any): Promise<any>;
@@ -1,4 +1,8 @@
+import { parseBundle } from '../utils/translationBundle';
+
 const API_BASE_URL = '/api';
+// Leaf key holding the string of a key that is also a namespace (olfong_i18n.bundles.LEAF_KEY)
+const LEAF_KEY = '_';
 
 class TranslationService {
   /**
@@ -442,6 +446,33 @@ class TranslationService {
    * Load translations for i18next
    */
   async loadTranslationsForI18next(language) {
+    try {
+      // The manifest is tiny and revalidated every time; the bundle is only fetched when its hash changed
+      const manifest = await this.getBundleManifest();
+      const entry = manifest?.locales?.[language];
+      if (entry) {
+        if (this.isCacheValid(language, entry.hash)) {
+          const cached = this.getCachedTranslations(language);
+          if (cached) return cached;
+        }
+
+        // Pre-nested bundle built by the translation pipeline: one parse, no restructuring.
+        // Hashed URLs are immutable, so the browser HTTP cache serves repeats.
+        const format = entry.interned ? '?format=interned' : '';
+        const response = await fetch(`${API_BASE_URL}/translations/bundle/${language}/${entry.hash}${format}`);
+        if (response.ok) {
+          const bundle = await response.text();
+          localStorage.setItem(`translations_${language}`, bundle);
+          localStorage.setItem(`translations_${language}_hash`, entry.hash);
+          localStorage.setItem(`translations_${language}_timestamp`, Date.now().toString());
+          return parseBundle(bundle);
+        }
+        console.warn(`Translation bundle unavailable (status ${response.status}), falling back to flat list`);
+      }
+    } catch (error) {
+      console.warn('Failed to load translation bundle, falling back to flat list:', error);
+    }
+
     try {
       // Load from API
       const response = await this.getAllTranslations(language);
@@ -465,6 +496,110 @@ class TranslationService {
     }
   }
 
+  /**
+   * Load only the translation areas a route renders (see olfong_i18n.areas), merged into one
+   * nested object. Storefront pages get common + storefront; admin strings load lazily when an
+   * admin route is opened — pass the result to addResourceBundle(language, 'translation', t, true, true).
+   * Falls back to the full bundle when the server has no area bundles.
+   */
+  async loadTranslationsForRoute(language, pathname = window.location.pathname) {
+    try {
+      const manifest = await this.getAreaManifest();
+      if (manifest) {
+        const areas = this.areasForRoute(manifest, pathname);
+        const bundles = await Promise.all(areas.map(area => this.loadAreaBundle(language, area, manifest)));
+        if (bundles.every(Boolean)) {
+          return bundles.reduce((merged, bundle) => this.deepMerge(merged, bundle), {});
+        }
+        console.warn('Some translation area bundles are unavailable, loading the full bundle');
+      }
+    } catch (error) {
+      console.warn('Failed to load translation areas, loading the full bundle:', error);
+    }
+    return this.loadTranslationsForI18next(language);
+  }
+
+  /**
+   * Areas a route needs: longest matching prefix from the manifest's route table
+   */
+  areasForRoute(manifest, pathname) {
+    let best = { prefix: '', areas: Object.keys(manifest.areas || {}) };
+    (manifest.routes || []).forEach(route => {
+      const matches = pathname === route.prefix || pathname.startsWith(`${route.prefix.replace(/\/$/, '')}/`);
+      if (matches && route.prefix.length > best.prefix.length) {
+        best = route;
+      }
+    });
+    return best.areas;
+  }
+
+  /**
+   * One area bundle, from localStorage while its hash matches the manifest; null if unavailable
+   */
+  async loadAreaBundle(language, area, manifest) {
+    const entry = manifest.areas?.[area]?.[language];
+    if (!entry) return null;
+
+    const cacheKey = `translations_${language}_area_${area}`;
+    if (localStorage.getItem(`${cacheKey}_hash`) === entry.hash) {
+      const cached = localStorage.getItem(cacheKey);
+      if (cached) return parseBundle(cached);
+    }
+
+    const format = entry.interned ? '?format=interned' : '';
+    const response = await fetch(`${API_BASE_URL}/translations/areas/${area}/${language}/${entry.hash}${format}`);
+    if (!response.ok) return null;
+    const bundle = await response.text();
+    localStorage.setItem(cacheKey, bundle);
+    localStorage.setItem(`${cacheKey}_hash`, entry.hash);
+    return parseBundle(bundle);
+  }
+
+  /**
+   * Area manifest { version, areas: { [area]: { [language]: { hash, file, bytes } } }, routes },
+   * or null when the server has no area bundles
+   */
+  async getAreaManifest() {
+    try {
+      const response = await fetch(`${API_BASE_URL}/translations/areas`, { cache: 'no-cache' });
+      if (!response.ok) return null;
+      return await response.json();
+    } catch (error) {
+      console.warn('Failed to fetch translation area manifest:', error);
+      return null;
+    }
+  }
+
+  /**
+   * Nested translations -> { 'dotted.key': value }, the shape LanguageContext's t() looks up.
+   * A "_" leaf holds the string of a key that is also a namespace (olfong_i18n.bundles.nest)
+   */
+  flattenBundle(nested, prefix = '', flat = {}) {
+    Object.entries(nested || {}).forEach(([key, value]) => {
+      const path = key === LEAF_KEY && prefix ? prefix : prefix ? `${prefix}.${key}` : key;
+      if (value && typeof value === 'object') {
+        this.flattenBundle(value, path, flat);
+      } else {
+        flat[path] = value;
+      }
+    });
+    return flat;
+  }
+
+  /**
+   * Recursively merge nested translation objects (source wins on conflicts)
+   */
+  deepMerge(target, source) {
+    Object.entries(source).forEach(([key, value]) => {
+      if (value && typeof value === 'object' && target[key] && typeof target[key] === 'object') {
+        this.deepMerge(target[key], value);
+      } else {
+        target[key] = value;
+      }
+    });
+    return target;
+  }
+
   /**
     * Transform flat translations array to nested object
     */
@@ -475,26 +610,52 @@ class TranslationService {
        const keys = translation.key.split('.');
        let current = nested;
 
-       // Navigate/create the nested structure
+       // Navigate/create the nested structure; a string that is also a namespace moves to its "_" leaf
        for (let i = 0; i < keys.length - 1; i++) {
-         if (!current[keys[i]] || typeof current[keys[i]] !== 'object') {
+         if (current[keys[i]] === undefined || current[keys[i]] === null) {
            current[keys[i]] = {};
+         } else if (typeof current[keys[i]] !== 'object') {
+           current[keys[i]] = { [LEAF_KEY]: current[keys[i]] };
          }
          current = current[keys[i]];
        }
 
-       // Set the final value
-       current[keys[keys.length - 1]] = translation.value;
+       // Set the final value (under "_" when a longer key already made it a namespace)
+       const last = keys[keys.length - 1];
+       if (current[last] && typeof current[last] === 'object') {
+         current[last][LEAF_KEY] = translation.value;
+       } else {
+         current[last] = translation.value;
+       }
      });
 
      return nested;
    }
 
   /**
-   * Check if cached translations are still valid
+   * Bundle manifest { version, locales: { [language]: { hash, file, bytes } } }, or null if unavailable
+   */
+  async getBundleManifest() {
+    try {
+      const response = await fetch(`${API_BASE_URL}/translations/manifest`, { cache: 'no-cache' });
+      if (!response.ok) return null;
+      return await response.json();
+    } catch (error) {
+      console.warn('Failed to fetch translation manifest:', error);
+      return null;
+    }
+  }
+
+  /**
+   * Check if cached translations are still valid: same bundle hash as the manifest.
+   * Without a hash (manifest unreachable) fall back to the cache age.
    */
-  isCacheValid(language, maxAge = 24 * 60 * 60 * 1000) { // 24 hours default
+  isCacheValid(language, hash = null, maxAge = 24 * 60 * 60 * 1000) { // 24 hours default
     try {
+      if (hash) {
+        return localStorage.getItem(`translations_${language}_hash`) === hash;
+      }
+
       const timestamp = localStorage.getItem(`translations_${language}_timestamp`);
       if (!timestamp) return false;
       
@@ -511,7 +672,7 @@ class TranslationService {
   getCachedTranslations(language) {
     try {
       const cached = localStorage.getItem(`translations_${language}`);
-      return cached ? JSON.parse(cached) : null;
+      return cached ? parseBundle(cached) : null;
     } catch (error) {
       console.error('Error getting cached translations:', error);
       return null;
@@ -525,7 +686,13 @@ class TranslationService {
     try {
       if (language) {
         localStorage.removeItem(`translations_${language}`);
+        localStorage.removeItem(`translations_${language}_hash`);
         localStorage.removeItem(`translations_${language}_timestamp`);
+        Object.keys(localStorage).forEach(key => {
+          if (key.startsWith(`translations_${language}_area_`)) {
+            localStorage.removeItem(key);
+          }
+        });
       } else {
         // Clear all translation cache
         Object.keys(localStorage).forEach(key => {